@@ -0,0 +1,224 @@
+"""
+Benchmark: core operations on a synthetic large SpecMap project
+
+Builds a project with benchmarks/synthetic.py and times project status,
+RULEMAP scoring, specification analysis, task breakdown, checkpoints and
+daily backups. Operations with a persistent cache are timed cold (cache
+removed) and warm. Results are written as JSON so runs on different commits
+can be compared; --compare exits non-zero when an operation got slower than
+the threshold allows.
+
+Usage:
+    python benchmarks/bench_project.py [--features 50] [--spec-kb 32] [--sessions 20]
+        [--artifacts 200] [--repeat 3] [--output results.json]
+        [--compare baseline.json] [--threshold 0.25]
+"""
+
+import argparse
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "mcp-server" / "src"))
+
+from specmap.clarify import ClarificationProcessor
+from specmap.plan import PlanGenerator
+from specmap.sessions import SessionManager
+from specmap.tasks import TaskGenerator
+from specmap_mcp.context import drop_context, get_context
+
+from synthetic import active_session, build_project
+
+# Ignore differences below this many seconds when comparing runs
+NOISE_FLOOR = 0.005
+
+
+def measure(func, repeat: int, setup=None) -> dict:
+    """Best and all wall-clock times of func; setup runs untimed before each run"""
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return {'seconds': min(runs), 'runs': [round(run, 6) for run in runs]}
+
+
+def git_commit() -> str:
+    """Current commit of the working tree, or 'unknown' outside a git checkout"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=Path(__file__).parent,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def specmap_status(project_path: Path) -> dict:
+    """What the specmap_status MCP tool computes, without the MCP transport"""
+    context = get_context(project_path)
+    rows = context.index.feature_status()
+    return {
+        'project_name': context.config.get('project.name'),
+        'total_features': len(rows),
+        'planned': sum(1 for row in rows if row['has_plan'])
+    }
+
+
+def run_benchmarks(project_path: Path, repeat: int) -> dict:
+    """Time every operation against a built project"""
+    config_dir = project_path / ".specmap"
+    results = {}
+
+    def clear(path: Path):
+        return lambda: shutil.rmtree(path, ignore_errors=True)
+
+    def drop_index():
+        drop_context(project_path)
+        (config_dir / "index.sqlite").unlink(missing_ok=True)
+
+    # Project status: first call in a fresh server (index rebuilt) and later calls
+    results['specmap_status.cold'] = measure(
+        lambda: specmap_status(project_path), repeat, setup=drop_index)
+    results['specmap_status.warm'] = measure(lambda: specmap_status(project_path), repeat)
+
+    processor = ClarificationProcessor(project_path)
+    results['calculate_rulemap_score.cold'] = measure(
+        processor.score_all, repeat, setup=clear(config_dir / "scores"))
+    results['calculate_rulemap_score.warm'] = measure(processor.score_all, repeat)
+
+    plan_generator = PlanGenerator(project_path, clarify_processor=processor)
+    feature_ids = processor.index.features_with_specs()
+
+    def analyze_all():
+        for feature_id in feature_ids:
+            plan_generator.analyze_specification(feature_id)
+
+    results['analyze_specification.cold'] = measure(
+        analyze_all, repeat, setup=clear(config_dir / "cache" / "analysis"))
+    results['analyze_specification.warm'] = measure(analyze_all, repeat)
+
+    task_generator = TaskGenerator(project_path, plan_generator=plan_generator)
+
+    def breakdown_all():
+        for feature_id in feature_ids:
+            analysis = task_generator.analyze_implementation_plan(feature_id)
+            task_generator.generate_task_breakdown(feature_id, analysis)
+
+    results['generate_task_breakdown'] = measure(breakdown_all, repeat)
+
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        pass  # forecasting is optional
+    else:
+        results['forecast_completion'] = measure(
+            lambda: task_generator.forecast_completion(seed=0), repeat)
+
+    manager = SessionManager(project_path)
+    session_id = active_session(project_path)
+    snapshots_dir = manager.active_dir / session_id / "snapshots"
+    results['create_checkpoint.first'] = measure(
+        lambda: manager.create_checkpoint(session_id, "benchmark"), repeat,
+        setup=clear(snapshots_dir))
+    results['create_checkpoint.unchanged'] = measure(
+        lambda: manager.create_checkpoint(session_id, "benchmark"), repeat)
+
+    daily_dir = manager.backups_dir / "daily"
+    results['create_daily_backup.full'] = measure(
+        manager.create_daily_backup, repeat, setup=clear(daily_dir))
+    results['create_daily_backup.incremental'] = measure(manager.create_daily_backup, repeat)
+
+    return results
+
+
+def compare(results: dict, params: dict, baseline_path: Path, threshold: float) -> list:
+    """Print current vs. baseline times; returns the operations that regressed"""
+    baseline = json.loads(baseline_path.read_text(encoding='utf-8'))
+    base_results = baseline['results']
+    regressions = []
+
+    print(f"\nCompared with {baseline_path} (commit {baseline['meta'].get('commit', '?')}):")
+    if baseline['meta'].get('params') != params:
+        print(f"  Warning: baseline was run with different parameters: {baseline['meta'].get('params')}")
+    for name, result in results.items():
+        if name not in base_results:
+            print(f"  {name:<34} {result['seconds']:9.4f}s  (new)")
+            continue
+        before = base_results[name]['seconds']
+        after = result['seconds']
+        ratio = after / before if before else float('inf')
+        regressed = after - before > NOISE_FLOOR and ratio > 1 + threshold
+        if regressed:
+            regressions.append(name)
+        print(f"  {name:<34} {before:9.4f}s -> {after:9.4f}s  {ratio:5.2f}x"
+              f"{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--features', type=int, default=50)
+    parser.add_argument('--spec-kb', type=float, default=32)
+    parser.add_argument('--clarification-kb', type=float, default=16)
+    parser.add_argument('--plan-kb', type=float, default=16)
+    parser.add_argument('--sessions', type=int, default=20)
+    parser.add_argument('--artifacts', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', type=Path, help="Write results JSON here")
+    parser.add_argument('--compare', type=Path, help="Baseline results JSON to compare with")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Allowed slowdown before --compare fails (default: 0.25 = 25%%)")
+    args = parser.parse_args()
+
+    params = {
+        'features': args.features, 'spec_kb': args.spec_kb,
+        'clarification_kb': args.clarification_kb, 'plan_kb': args.plan_kb,
+        'sessions': args.sessions, 'artifacts': args.artifacts, 'repeat': args.repeat
+    }
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        start = time.perf_counter()
+        project_path = build_project(
+            Path(temp_dir), features=args.features, spec_kb=args.spec_kb,
+            clarification_kb=args.clarification_kb, plan_kb=args.plan_kb,
+            sessions=args.sessions, artifacts=args.artifacts
+        )
+        print(f"Built synthetic project in {time.perf_counter() - start:.1f}s")
+        results = run_benchmarks(project_path.resolve(), args.repeat)
+        drop_context(project_path.resolve())
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'params': params
+        },
+        'results': results
+    }
+
+    for name, result in results.items():
+        print(f"  {name:<34} {result['seconds']:9.4f}s")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        if compare(results, params, args.compare, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+"""
+Benchmark: shared section tree vs. re-scanning the spec per extractor
+
+Builds a synthetic ~5 MB specification and times PlanGenerator's extractors
+reading from one shared SectionTree, with a per-extractor breakdown, against
+the extractors of a baseline revision, where each one split and walked the
+whole document on its own. The baseline's package is read with `git show`
+and both sides are timed in subprocesses; it defaults to the revision before
+SectionTree was added.
+
+Usage: python benchmarks/bench_sections.py [size_mb] [--baseline REV]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, os.environ.get("SPECMAP_BENCH_SRC", str(REPO_ROOT / "src")))
+
+from specmap.plan import PlanGenerator
+
+try:
+    from specmap.sections import SectionTree
+except ImportError:
+    # Baseline revisions: extractors take the spec text
+    SectionTree = None
+
+
+SECTION_TEMPLATE = """## Feature Area {n}
+
+### Functional Requirements
+- **FR-{r:03d}**: System MUST handle case {n} within the agreed budget
+- **FR-{r2:03d}**: System SHOULD log case {n} for auditing
+
+### Technical Constraints
+- **Platform**: Linux containers
+- **Security**: OAuth 2.0 for area {n}
+
+### Technical Performance
+- Response time: <200ms for area {n}
+- Throughput: 1000 req/s
+- Uptime: 99.9%
+
+### Dependencies & Risks
+- External service {n}
+- Shared database cluster
+
+Strategic alignment: supports objective {n}
+"""
+
+# Alternating subprocess runs per side in the baseline comparison
+ROUNDS = 3
+
+EXTRACTORS = [
+    '_extract_functional_requirements',
+    '_extract_acceptance_criteria',
+    '_extract_technical_constraints',
+    '_extract_user_stories',
+    '_extract_performance_requirements',
+    '_extract_dependencies',
+    '_extract_business_context',
+    '_analyze_complexity',
+]
+
+
+def build_spec(size_mb: float) -> str:
+    """Generate a synthetic specification of roughly size_mb megabytes"""
+    parts = ["# Feature Specification: Benchmark\n"]
+    total = 0
+    n = 0
+    while total < size_mb * 1024 * 1024:
+        chunk = SECTION_TEMPLATE.format(n=n, r=(2 * n) % 1000, r2=(2 * n + 1) % 1000)
+        parts.append(chunk)
+        total += len(chunk)
+        n += 1
+    return '\n'.join(parts)
+
+
+def time_it(func, repeat: int = 3) -> float:
+    """Return the best wall-clock time of func over repeat runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_extractors(generator: PlanGenerator, content: str):
+    """Run every extractor once, parsing the section tree first where there is one"""
+    source = SectionTree(content) if SectionTree else content
+    for name in EXTRACTORS:
+        getattr(generator, name)(source)
+
+
+def git(*args: str) -> str:
+    return subprocess.run(["git", "-C", str(REPO_ROOT), *args],
+                          check=True, capture_output=True, text=True).stdout
+
+
+def time_source(src_dir: Path, spec_file: Path) -> float:
+    """Time run_extractors on the specmap package in src_dir, in a fresh subprocess"""
+    env = dict(os.environ, SPECMAP_BENCH_SRC=str(src_dir))
+    output = subprocess.run([sys.executable, __file__, "--time-file", str(spec_file)],
+                            env=env, check=True, capture_output=True, text=True).stdout
+    return float(output)
+
+
+def checkout(revision: str, dest: Path) -> Path:
+    """Write revision's specmap package under dest and return its src folder"""
+    for name in git("ls-tree", "-r", "--name-only", revision, "src/specmap").split():
+        path = dest / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(git("show", f"{revision}:{name}"))
+    return dest / "src"
+
+
+def default_baseline() -> str:
+    """The revision before SectionTree was added"""
+    added = git("log", "--diff-filter=A", "--format=%H", "--", "src/specmap/sections.py").split()
+    return git("rev-parse", "--short", f"{added[-1]}^").strip()
+
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ["--time-file"]:
+        content = Path(args[1]).read_text()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            generator = PlanGenerator(Path(temp_dir))
+            print(time_it(lambda: run_extractors(generator, content)))
+        return
+
+    revision = None
+    if "--baseline" in args:
+        position = args.index("--baseline")
+        revision = args[position + 1]
+        del args[position:position + 2]
+    size_mb = float(args[0]) if args else 5.0
+    content = build_spec(size_mb)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        generator = PlanGenerator(Path(temp_dir))
+
+        parse = time_it(lambda: SectionTree(content))
+        tree = SectionTree(content)
+        extractors = {name: time_it(lambda: getattr(generator, name)(tree)) for name in EXTRACTORS}
+
+        # Both sides run in fresh subprocesses, alternating, so neither inherits
+        # the other's heap and drift on a busy machine hits both alike
+        spec_file = Path(temp_dir) / "spec.md"
+        spec_file.write_text(content)
+        revision = revision or default_baseline()
+        baseline_src = checkout(revision, Path(temp_dir) / "baseline")
+        shared, baseline = float('inf'), float('inf')
+        for _ in range(ROUNDS):
+            shared = min(shared, time_source(REPO_ROOT / "src", spec_file))
+            baseline = min(baseline, time_source(baseline_src, spec_file))
+
+    print(f"Spec size:            {len(content) / (1024 * 1024):.1f} MB, {content.count(chr(10)) + 1} lines")
+    print(f"Parse section tree:   {parse * 1000:.0f} ms")
+    for name, seconds in extractors.items():
+        print(f"  {name:<36} {seconds * 1000:6.0f} ms")
+    print(f"Parse + extractors:   {shared * 1000:.0f} ms")
+    print(f"Baseline ({revision}):   {baseline * 1000:.0f} ms, per-extractor line scans")
+    print(f"Speedup:              {baseline / shared:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Synthetic SpecMap projects for benchmarks
+
+Builds an initialized project with N features (spec, clarifications and
+implementation plan each), an archive of past sessions and one active
+session full of artifacts. Content is generated deterministically from
+templates, so two projects built with the same parameters are identical.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from specmap.init import ProjectInitializer
+from specmap.sessions import SessionManager
+
+from bench_extractors import CLARIFY_SECTION_TEMPLATE, PLAN_SECTION_TEMPLATE, build_document
+from bench_sections import SECTION_TEMPLATE
+
+SPEC_HEADER = """# Feature Specification: {title}
+
+**Feature ID**: {feature_id}
+**Status**: Draft
+
+## R - Role & Authority
+Specification owner: product engineering. Technical authority: platform lead.
+
+## U - Understanding & Objectives
+Problem statement: users need {title} to work reliably under load.
+User scenarios and acceptance scenarios are listed below.
+
+## L - Logic & Structure
+Functional requirements follow; implementation sequence is API first.
+
+## E - Elements & Specifications
+Technical constraints: Linux containers. Acceptance criteria per requirement.
+- **Account**: owner of the feature data
+- **Session**: authenticated context
+
+## M - Mood & Experience
+User experience goals: fast and predictable. Emotional journey: confident.
+
+## A - Audience & Stakeholders
+Primary users: operators. Stakeholder matrix: product, support, security.
+
+## P - Performance & Metrics
+Business KPIs: adoption. Technical performance:
+- Response time: <200ms
+
+## Constitution Compliance
+- [x] Test-first
+"""
+
+
+def _sized(template: str, size_kb: float) -> str:
+    """Repeat a benchmark section template to roughly size_kb kilobytes"""
+    return build_document(template, size_kb / 1024)
+
+
+def build_project(
+    root: Path,
+    features: int = 50,
+    spec_kb: float = 32,
+    clarification_kb: float = 16,
+    plan_kb: float = 16,
+    sessions: int = 20,
+    artifacts: int = 200,
+    artifact_kb: float = 4
+) -> Path:
+    """
+    Create a synthetic project under root/bench-project
+
+    Args:
+        root: Parent folder for the project
+        features: Number of features (each gets spec.md, clarifications.md and plan.md)
+        spec_kb: Approximate size of each spec.md
+        clarification_kb: Approximate size of each clarifications.md (questions)
+        plan_kb: Approximate size of each plan.md
+        sessions: Number of completed sessions in the session archive
+        artifacts: Artifact files in the active session
+        artifact_kb: Size of each artifact
+
+    Returns:
+        The project path
+    """
+    project_path = Path(root) / "bench-project"
+    ProjectInitializer(project_path, "bench-project", "web-app", "claude").initialize()
+
+    spec_body = _sized(SECTION_TEMPLATE.replace('{r:03d}', '{f:03d}'), spec_kb)
+    questions = _sized(CLARIFY_SECTION_TEMPLATE, clarification_kb)
+    plan = _sized(PLAN_SECTION_TEMPLATE, plan_kb)
+
+    for n in range(1, features + 1):
+        feature_id = f"{n:03d}-feature-{n}"
+        spec_dir = project_path / "01-specifications" / "features" / feature_id
+        spec_dir.mkdir(parents=True)
+        header = SPEC_HEADER.format(title=f"Feature {n}", feature_id=feature_id)
+        (spec_dir / "spec.md").write_text(header + spec_body, encoding='utf-8')
+        (spec_dir / "clarifications.md").write_text(f"# Clarifications: {feature_id}\n\n" + questions,
+                                                   encoding='utf-8')
+
+        plan_dir = project_path / "02-planning" / "features" / feature_id
+        plan_dir.mkdir(parents=True)
+        (plan_dir / "plan.md").write_text(f"# Implementation Plan: {feature_id}\n\n" + plan,
+                                         encoding='utf-8')
+
+    manager = SessionManager(project_path)
+    for n in range(sessions):
+        session_id = manager.start_session(f"history {n}")['session_id']
+        manager.track_artifacts(session_id, [
+            (f"01-specifications/features/{(n % max(features, 1)) + 1:03d}/spec.md", "modified"),
+            (f"src/module_{n}.py", "created"),
+        ])
+        manager.end_session(session_id, rulemap_score=8.0, create_backup=False)
+
+    session_id = manager.start_session("benchmark")['session_id']
+    artifacts_dir = manager.active_dir / session_id / "artifacts"
+    payload = ("x" * 63 + "\n") * max(1, int(artifact_kb * 16))
+    for n in range(artifacts):
+        (artifacts_dir / f"artifact-{n:04d}.md").write_text(f"# Artifact {n}\n{payload}")
+
+    return project_path
+
+
+def active_session(project_path: Path) -> str:
+    """ID of the synthetic project's active benchmark session"""
+    return SessionManager(project_path).list_active_sessions()[0]['id']
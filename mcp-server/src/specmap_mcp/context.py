@@ -0,0 +1,245 @@
+"""
+SpecMap MCP Project Context
+===========================
+Long-lived, per-project state shared across MCP tool invocations.
+
+Each tool call used to rebuild the generators, and with them reload the
+config and workflow state from disk several times over. A ProjectContext
+loads them once per process and only re-reads a file when its mtime changes.
+While the project is watched (see specmap_mcp.watcher), those checks are
+answered from memory and the watcher invalidates what changed.
+"""
+
+import sys
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from specmap import filestat, metrics
+from specmap.config import SpecMapConfig, WorkflowState
+from specmap.index import FeatureIndex
+
+# The generator modules are imported when a generator is first built
+if TYPE_CHECKING:
+    from specmap.specify import SpecificationCreator
+    from specmap.clarify import ClarificationProcessor
+    from specmap.plan import PlanGenerator
+    from specmap.tasks import TaskGenerator
+    from specmap_mcp.watcher import ProjectWatcher
+
+
+class ProjectContext:
+    """Config, workflow state, generators and documents for one project
+
+    Generators are built lazily and all share the context's WorkflowState, so
+    a state change made by one tool is visible to the next without a reload.
+    Call refresh() at the start of a tool to pick up edits made by other
+    processes (the CLI, an editor, another server).
+    """
+
+    def __init__(self, project_path: Path):
+        self.project_path = Path(project_path)
+        self.lock = threading.RLock()
+
+        self.config = SpecMapConfig(self.project_path)
+        self.config.load()
+        self._config_mtime_ns = _mtime_ns(self.config.config_file)
+
+        self.workflow = WorkflowState(self.project_path)
+        self.workflow.load()
+
+        self.index = FeatureIndex(self.project_path)
+
+        self._spec_creator: Optional['SpecificationCreator'] = None
+        self._clarify_processor: Optional['ClarificationProcessor'] = None
+        self._plan_generator: Optional['PlanGenerator'] = None
+        self._task_generator: Optional['TaskGenerator'] = None
+
+        # path -> (mtime_ns, size, content)
+        self._documents: Dict[Path, Tuple[int, int, str]] = {}
+
+        self.watcher: Optional['ProjectWatcher'] = None
+
+    def is_project(self) -> bool:
+        """Check whether the path is (still) a SpecMap project"""
+        return self.config.config_dir.exists()
+
+    def refresh(self):
+        """Reload config and workflow state if they changed on disk"""
+        with self.lock:
+            mtime_ns = _mtime_ns(self.config.config_file)
+            if mtime_ns != self._config_mtime_ns:
+                self.config = SpecMapConfig(self.project_path)
+                self.config.load()
+                self._config_mtime_ns = mtime_ns
+
+            self.workflow.refresh()
+
+    @property
+    def spec_creator(self) -> 'SpecificationCreator':
+        """Shared SpecificationCreator"""
+        with self.lock:
+            if self._spec_creator is None:
+                from specmap.specify import SpecificationCreator
+                self._spec_creator = SpecificationCreator(self.project_path, self.workflow)
+            return self._spec_creator
+
+    @property
+    def clarify_processor(self) -> 'ClarificationProcessor':
+        """Shared ClarificationProcessor"""
+        with self.lock:
+            if self._clarify_processor is None:
+                from specmap.clarify import ClarificationProcessor
+                self._clarify_processor = ClarificationProcessor(self.project_path, self.workflow)
+            return self._clarify_processor
+
+    @property
+    def plan_generator(self) -> 'PlanGenerator':
+        """Shared PlanGenerator (reuses the shared ClarificationProcessor)"""
+        with self.lock:
+            if self._plan_generator is None:
+                from specmap.plan import PlanGenerator
+                self._plan_generator = PlanGenerator(
+                    self.project_path, self.workflow, self.clarify_processor
+                )
+            return self._plan_generator
+
+    @property
+    def task_generator(self) -> 'TaskGenerator':
+        """Shared TaskGenerator (reuses the shared PlanGenerator)"""
+        with self.lock:
+            if self._task_generator is None:
+                from specmap.tasks import TaskGenerator
+                self._task_generator = TaskGenerator(
+                    self.project_path, self.workflow, self.plan_generator
+                )
+            return self._task_generator
+
+    def read_document(self, path: Path) -> Optional[str]:
+        """Return a project file's text, re-reading only when it changed"""
+        path = Path(path)
+        try:
+            stat = filestat.stat(path)
+        except OSError:
+            self._documents.pop(path, None)
+            return None
+
+        cached = self._documents.get(path)
+        hit = cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size
+        metrics.record_cache("documents", hit)
+        if hit:
+            return cached[2]
+
+        content = path.read_text()
+        self._documents[path] = (stat.st_mtime_ns, stat.st_size, content)
+        return content
+
+    def invalidate(self, paths: List[Path], everything: bool = False) -> Dict[str, Optional[Dict]]:
+        """Drop cached state derived from changed files (called by the watcher)
+
+        Args:
+            paths: Changed files and folders
+            everything: Events were lost; drop all cached documents and rebuild the index
+
+        Returns:
+            dict: Index row of each affected feature (None after a full rebuild)
+        """
+        specs_dir, plans_dir = self.index.specs_dir, self.index.plans_dir
+        features = set()
+        with self.lock:
+            if everything:
+                self._documents.clear()
+            for path in paths:
+                self._documents.pop(path, None)
+                if path.parent in (specs_dir, plans_dir):
+                    features.add(path.name)
+                elif path.parent.parent in (specs_dir, plans_dir):
+                    features.add(path.parent.name)
+
+            if everything:
+                if self._clarify_processor is not None:
+                    self._clarify_processor.forget()
+                self.index.reconcile(force=True)
+                return {feature_id: None for feature_id in features}
+
+            rows = {}
+            for feature_id in sorted(features):
+                if self._clarify_processor is not None:
+                    self._clarify_processor.forget(feature_id)
+                rows[feature_id] = self.index.update_feature(feature_id)
+            return rows
+
+    def start_watcher(self, mode: str = "auto") -> Optional['ProjectWatcher']:
+        """(Re)start the file watcher with a backend from WATCH_MODES
+
+        Returns:
+            ProjectWatcher or None if mode is "off" or no backend is available
+        """
+        from specmap_mcp.watcher import ProjectWatcher, WATCH_MODES, inotify_available
+
+        if mode not in WATCH_MODES:
+            raise ValueError(f"Unknown watch mode: {mode} (expected one of {', '.join(WATCH_MODES)})")
+        backend = "inotify" if mode == "auto" and inotify_available() else mode
+        self.stop_watcher()
+        if backend not in ("inotify", "poll"):
+            return None
+
+        watcher = ProjectWatcher(self.project_path, backend, self.invalidate)
+        try:
+            watcher.start()
+        except OSError as e:
+            # e.g. the inotify instance limit; cached reads stat as before
+            print(f"specmap watcher: not watching {self.project_path}: {e}", file=sys.stderr)
+            watcher.stop()
+            return None
+        with self.lock:
+            previous, self.watcher = self.watcher, watcher
+        if previous is not None:
+            previous.stop()
+        return watcher
+
+    def stop_watcher(self):
+        """Stop the file watcher, if one runs"""
+        # Not joined under the lock: the watcher thread takes it in invalidate()
+        with self.lock:
+            watcher, self.watcher = self.watcher, None
+        if watcher is not None:
+            watcher.stop()
+
+
+def _mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return filestat.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+_contexts: Dict[Path, ProjectContext] = {}
+_contexts_lock = threading.Lock()
+
+
+def get_context(project_path) -> ProjectContext:
+    """Return the process-wide context for a project, refreshed from disk"""
+    project_path = Path(project_path).resolve()
+
+    with _contexts_lock:
+        context = _contexts.get(project_path)
+        if context is None:
+            context = ProjectContext(project_path)
+            _contexts[project_path] = context
+            if context.is_project():
+                from specmap_mcp.watcher import default_mode
+                context.start_watcher(default_mode())
+            return context
+
+    context.refresh()
+    return context
+
+
+def drop_context(project_path):
+    """Forget a project's context (e.g. after it was deleted or re-initialized)"""
+    with _contexts_lock:
+        context = _contexts.pop(Path(project_path).resolve(), None)
+    if context is not None:
+        context.stop_watcher()
+        context.index.close()
@@ -0,0 +1,60 @@
+"""
+SpecMap MCP Instrumentation
+===========================
+Per-call metrics for MCP tools.
+
+While metrics are enabled (SPECMAP_METRICS, or specmap_metrics with
+enable=True) every @instrumented tool call records its wall time, the time
+it waited for its lane, file reads and writes, extractor timings and cache
+hits; see specmap.metrics. Calls that return success=False count as errors.
+When a dump format is set, each finished call is also written to the
+project's .specmap/metrics/ folder.
+"""
+
+import functools
+import inspect
+from pathlib import Path
+from typing import Callable, Optional
+
+from specmap import metrics
+from specmap.config import get_config_dir
+
+
+def instrumented(fn: Callable) -> Callable:
+    """Record metrics for an async tool
+
+    Apply it below @server.tool() and above @blocking(...); like blocking,
+    the wrapper keeps the signature FastMCP builds the tool schema from.
+    """
+    signature = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        call = None
+        try:
+            with metrics.tool_call(fn.__name__) as call:
+                result = await fn(*args, **kwargs)
+                if call is not None and isinstance(result, dict) and result.get('success') is False:
+                    call.error = True
+                return result
+        finally:
+            if call is not None and metrics.dump_formats():
+                project_path = _project_path(signature, args, kwargs)
+                if project_path is not None:
+                    metrics.write_dumps(project_path, call)
+    return wrapper
+
+
+def _project_path(signature: inspect.Signature, args: tuple, kwargs: dict) -> Optional[Path]:
+    """The SpecMap project a tool call worked on, if it names one"""
+    try:
+        bound = signature.bind_partial(*args, **kwargs)
+    except TypeError:
+        return None
+    bound.apply_defaults()
+
+    value = bound.arguments.get('project_path')
+    if value is None:
+        return None
+    project_path = Path(value).resolve()
+    return project_path if get_config_dir(project_path).exists() else None
@@ -0,0 +1,243 @@
+"""
+SpecMap MCP Background Jobs
+===========================
+Long-running tool work that returns a job ID instead of holding the call open.
+
+A job runs on one of the offload lanes and keeps its state in
+.specmap/jobs/<job-id>.json: status, progress, and once finished the result
+the tool would have returned. Clients poll it with job_status and stop it
+with job_cancel. Because the state is on disk, finished results survive a
+server restart. Jobs that were still running when their server went away
+are reported as interrupted.
+"""
+
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from specmap import metrics
+from specmap.config import get_config_dir
+from specmap_mcp.offload import submit
+
+# Job states; the last four are final
+JOB_ACTIVE = ("queued", "running", "cancelling")
+JOB_FINAL = ("completed", "failed", "cancelled", "interrupted")
+
+# Finished job records older than this are removed when a new job starts
+JOB_RETENTION = timedelta(days=7)
+
+
+class JobCancelled(BaseException):
+    """Raised from a job's progress callback once the job was cancelled
+
+    Like asyncio.CancelledError it is not an Exception, so the tools'
+    catch-all error handlers let it through to the job runner.
+    """
+
+
+class _Job:
+    """In-memory handle of a job started by this process"""
+
+    def __init__(self, record: Dict[str, Any]):
+        self.record = record
+        self.cancel_event = threading.Event()
+        self.future: Optional[Future] = None
+
+
+class JobManager:
+    """Background jobs of one project, persisted under .specmap/jobs/"""
+
+    def __init__(self, project_path: Path):
+        self.project_path = Path(project_path)
+        self.jobs_dir = get_config_dir(self.project_path) / "jobs"
+        self._jobs: Dict[str, _Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, lane: str, fn: Callable, *args, **kwargs) -> Dict[str, Any]:
+        """
+        Start fn(*args, **kwargs, progress=callback) as a job on an offload lane
+
+        fn reports progress by calling callback(done, total, message); the
+        callback raises JobCancelled once the job is cancelled, so that is
+        also where a job stops early.
+
+        Args:
+            kind: Short job type shown to clients ("plan", "daily_backup", ...)
+            lane: Offload lane the job runs on
+            fn: Blocking function returning a JSON-serializable result
+            *args, **kwargs: Passed to fn; kwargs are recorded as the job's params
+
+        Returns:
+            The new job's record
+        """
+        self._prune()
+        now = datetime.now()
+        job_id = f"job-{now.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        job = _Job({
+            'id': job_id,
+            'kind': kind,
+            'status': 'queued',
+            'params': kwargs,
+            'progress': {'done': 0, 'total': None, 'message': None},
+            'created': now.isoformat(),
+            'started': None,
+            'finished': None,
+            'result': None,
+            'error': None,
+            'pid': os.getpid()
+        })
+
+        with self._lock:
+            self._jobs[job_id] = job
+            self._write(job.record)
+            job.future = submit(lane, self._run, job, fn, args, kwargs)
+            return dict(job.record)
+
+    def _run(self, job: _Job, fn: Callable, args: tuple, kwargs: Dict[str, Any]):
+        """Run a job on its lane thread and record how it ended"""
+        def progress(done: int, total: Optional[int] = None, message: Optional[str] = None):
+            if job.cancel_event.is_set():
+                raise JobCancelled()
+            self._update(job, progress={'done': done, 'total': total, 'message': message})
+
+        if job.cancel_event.is_set():
+            self._update(job, status='cancelled', finished=datetime.now().isoformat())
+            return
+        self._update(job, status='running', started=datetime.now().isoformat())
+
+        call = None
+        try:
+            with metrics.tool_call(f"job:{job.record['kind']}") as call:
+                result = fn(*args, progress=progress, **kwargs)
+                if call is not None and isinstance(result, dict) and result.get('success') is False:
+                    call.error = True
+        except JobCancelled:
+            self._update(job, status='cancelled', finished=datetime.now().isoformat())
+        except Exception as e:
+            self._update(job, status='failed', error=str(e), finished=datetime.now().isoformat())
+        else:
+            progress_state = job.record['progress']
+            if progress_state['total'] is not None:
+                progress_state = dict(progress_state, done=progress_state['total'], message=None)
+            self._update(job, status='completed', result=result, progress=progress_state,
+                         finished=datetime.now().isoformat())
+        finally:
+            if call is not None:
+                metrics.write_dumps(self.project_path, call)
+
+    def _update(self, job: _Job, **changes):
+        with self._lock:
+            job.record.update(changes)
+            self._write(job.record)
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Current record of a job, or None if unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return dict(job.record)
+
+            record = self._read(job_id)
+            if record is not None and record['status'] in JOB_ACTIVE and not _owner_alive(record):
+                # Started by a server that exited before the job finished
+                record['status'] = 'interrupted'
+                record['finished'] = datetime.now().isoformat()
+                self._write(record)
+            return record
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Cancel a job
+
+        A queued job is cancelled at once. A running job becomes 'cancelling'
+        and stops at its next progress report. Finished jobs are unchanged.
+
+        Returns:
+            The job's record after the request, or None if unknown
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.record['status'] in JOB_ACTIVE:
+                job.cancel_event.set()
+                if job.future is not None and job.future.cancel():
+                    job.record.update(status='cancelled', finished=datetime.now().isoformat())
+                else:
+                    job.record['status'] = 'cancelling'
+                self._write(job.record)
+        return self.status(job_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Records of all jobs on disk, newest first"""
+        if not self.jobs_dir.exists():
+            return []
+        job_ids = sorted((path.stem for path in self.jobs_dir.glob("job-*.json")), reverse=True)
+        return [record for record in map(self.status, job_ids) if record is not None]
+
+    def _path(self, job_id: str) -> Path:
+        return self.jobs_dir / f"{job_id}.json"
+
+    def _read(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if not job_id.startswith("job-") or Path(job_id).name != job_id:
+            return None
+        try:
+            with open(self._path(job_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, record: Dict[str, Any]):
+        """Write a job record atomically; must be called with the lock held"""
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(record['id'])
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(record, indent=2, default=str), encoding='utf-8')
+        os.replace(tmp_path, path)
+
+    def _prune(self):
+        """Remove finished job records past JOB_RETENTION"""
+        cutoff = (datetime.now() - JOB_RETENTION).isoformat()
+        for record in self.list():
+            if record['status'] in JOB_FINAL and (record['finished'] or '') < cutoff:
+                with self._lock:
+                    self._jobs.pop(record['id'], None)
+                    self._path(record['id']).unlink(missing_ok=True)
+
+
+def _owner_alive(record: Dict[str, Any]) -> bool:
+    """Whether the server process that started a job is still running"""
+    pid = record.get('pid')
+    if pid is None or pid == os.getpid():
+        # Not in this process's memory, so it was lost with an earlier manager
+        return False
+    if os.name == 'nt':
+        # os.kill(pid, 0) would terminate the process on Windows
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+_managers: Dict[Path, JobManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_job_manager(project_path) -> JobManager:
+    """Return the process-wide job manager for a project"""
+    project_path = Path(project_path).resolve()
+    with _managers_lock:
+        manager = _managers.get(project_path)
+        if manager is None:
+            manager = JobManager(project_path)
+            _managers[project_path] = manager
+        return manager
@@ -0,0 +1,88 @@
+"""
+SpecMap MCP Tool Offloading
+===========================
+Runs the blocking part of MCP tools off the asyncio event loop.
+
+Every tool does file I/O, YAML/JSON parsing or archive work. Run directly in
+an async tool, one slow backup would stall every other request from the
+client. Tools are instead assigned to a lane: a small thread pool whose size
+caps how many calls of that kind run at once. Calls beyond the cap wait in
+the lane's queue without blocking the event loop. Because each lane has its
+own threads, status and list calls keep answering while a backup or plan is
+running.
+"""
+
+import asyncio
+import contextvars
+import functools
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from specmap import metrics
+
+# Lane name -> maximum concurrent calls
+TOOL_LANES = {
+    # Read-only lookups: status, validation, listings
+    "query": 4,
+    # Tools that write specs, plans, tasks, skills and workflow state, and
+    # those that read the task generator and workflow state the writers share
+    "workflow": 1,
+    # Session tracking and checkpoints (SQLite serializes the writes)
+    "session": 2,
+    # Daily backups, backup verification and ending sessions
+    "backup": 1,
+}
+
+_executors: Dict[str, ThreadPoolExecutor] = {
+    lane: ThreadPoolExecutor(max_workers=limit, thread_name_prefix=f"specmap-{lane}")
+    for lane, limit in TOOL_LANES.items()
+}
+
+
+async def run_blocking(lane: str, fn: Callable, *args, **kwargs) -> Any:
+    """
+    Run fn(*args, **kwargs) on a lane's thread pool and await its result
+
+    Args:
+        lane: Lane name from TOOL_LANES
+        fn: Blocking callable
+        *args, **kwargs: Passed to fn
+
+    Returns:
+        fn's return value (exceptions are re-raised in the caller)
+    """
+    executor = _executors[lane]
+    loop = asyncio.get_running_loop()
+    # Like asyncio.to_thread, run with the caller's context variables
+    call = functools.partial(contextvars.copy_context().run, _timed_start, time.perf_counter(),
+                             fn, *args, **kwargs)
+    return await loop.run_in_executor(executor, call)
+
+
+def _timed_start(queued_at: float, fn: Callable, *args, **kwargs) -> Any:
+    """Record how long a call waited for its lane, then run it"""
+    metrics.record_wait(time.perf_counter() - queued_at)
+    return fn(*args, **kwargs)
+
+
+def submit(lane: str, fn: Callable, *args, **kwargs) -> Future:
+    """Start fn(*args, **kwargs) on a lane without waiting (used for background jobs)"""
+    return _executors[lane].submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def blocking(lane: str):
+    """Turn a blocking tool function into an async one that runs on a lane
+
+    Apply it below @server.tool(); the wrapper keeps the function's name,
+    docstring and signature, which FastMCP uses to build the tool schema.
+    """
+    if lane not in TOOL_LANES:
+        raise ValueError(f"Unknown tool lane: {lane}")
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            return await run_blocking(lane, fn, *args, **kwargs)
+        return wrapper
+    return decorator
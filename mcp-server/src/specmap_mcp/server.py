@@ -21,27 +21,24 @@ License: MIT
 
 import sys
 import json
+import asyncio
 import traceback
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
 # Import FastMCP
 try:
-    from fastmcp import FastMCP
+    from fastmcp import FastMCP, Context
 except ImportError:
     print("Error: fastmcp not installed. Run: pip install fastmcp", file=sys.stderr)
     sys.exit(1)
 
-# Import SpecMap modules
+# Import SpecMap modules (tool-specific modules are imported inside the tools)
 try:
-    from specmap.init import ProjectInitializer
-    from specmap.specify import SpecificationCreator
-    from specmap.clarify import ClarificationProcessor
-    from specmap.plan import PlanGenerator
-    from specmap.tasks import TaskGenerator
-    from specmap.config import ConfigManager
-    from specmap.skills import SkillManager
-    from specmap.sessions import SessionManager
+    from specmap_mcp.context import get_context, drop_context
+    from specmap_mcp.offload import blocking, run_blocking
+    from specmap_mcp.instrumentation import instrumented
+    from specmap_mcp.jobs import get_job_manager
 except ImportError as e:
     print(f"Error: SpecMap modules not found. Make sure specmap-cli is installed.", file=sys.stderr)
     print(f"Details: {e}", file=sys.stderr)
@@ -53,11 +50,13 @@ server = FastMCP("SpecMap",
 
 
 # ============================================================================
-# WORKFLOW TOOLS (6 tools)
+# WORKFLOW TOOLS (8 tools)
 # ============================================================================
 
 @server.tool()
-async def specmap_init(
+@instrumented
+@blocking("workflow")
+def specmap_init(
     project_name: str,
     project_type: str = "web-app",
     agent: str = "claude",
@@ -95,6 +94,7 @@ async def specmap_init(
         base_path = Path(path).resolve()
         project_path = base_path / project_name
 
+        from specmap.init import ProjectInitializer
         initializer = ProjectInitializer(
             project_path=project_path,
             project_name=project_name,
@@ -103,6 +103,7 @@ async def specmap_init(
         )
 
         result = initializer.initialize()
+        drop_context(project_path)
 
         files_created = []
         for doc_type, doc_path in result.get('documents_created', {}).items():
@@ -133,7 +134,9 @@ async def specmap_init(
 
 
 @server.tool()
-async def specmap_specify(
+@instrumented
+@blocking("workflow")
+def specmap_specify(
     project_path: str,
     feature_description: str,
     feature_id: Optional[str] = None
@@ -168,7 +171,7 @@ async def specmap_specify(
                 "message": "❌ Not a valid SpecMap project. Run specmap_init first."
             }
 
-        creator = SpecificationCreator(project_path)
+        creator = get_context(project_path).spec_creator
         result = creator.create_specification(feature_description, feature_id)
 
         tracking_summary = {}
@@ -203,7 +206,9 @@ async def specmap_specify(
 
 
 @server.tool()
-async def specmap_clarify(
+@instrumented
+@blocking("workflow")
+def specmap_clarify(
     project_path: str,
     feature_id: str,
     interactive: bool = False
@@ -233,7 +238,7 @@ async def specmap_clarify(
                 "message": f"❌ Feature '{feature_id}' does not exist"
             }
 
-        processor = ClarificationProcessor(project_path)
+        processor = get_context(project_path).clarify_processor
         result = processor.run_clarification_process(feature_id, interactive)
         score_result = processor.calculate_rulemap_score(feature_id)
 
@@ -280,9 +285,11 @@ async def specmap_clarify(
 
 
 @server.tool()
+@instrumented
 async def specmap_plan(
     project_path: str,
-    feature_id: str
+    feature_id: str,
+    background: bool = False
 ) -> dict:
     """
     Generate implementation plan for a feature.
@@ -299,10 +306,20 @@ async def specmap_plan(
     Args:
         project_path: Path to SpecMap project root
         feature_id: Feature ID to plan (e.g., "001-user-authentication")
+        background: Return a job ID at once and plan in the background;
+            poll it with job_status (default: False)
 
     Returns:
         dict: Implementation plan results with technical decisions and estimates
     """
+    params = {"feature_id": feature_id}
+    if background:
+        return await _start_job(project_path, "plan", "workflow", _plan_feature, **params)
+    return await run_blocking("workflow", _plan_feature, project_path, **params)
+
+
+def _plan_feature(project_path: str, feature_id: str, progress=None) -> dict:
+    """Generate a feature's implementation plan and build the specmap_plan result"""
     try:
         project_path = Path(project_path).resolve()
 
@@ -314,10 +331,10 @@ async def specmap_plan(
                 "message": f"❌ Feature '{feature_id}' does not exist"
             }
 
-        generator = PlanGenerator(project_path)
+        generator = get_context(project_path).plan_generator
 
         try:
-            result = generator.generate_implementation_plan(feature_id)
+            result = generator.generate_implementation_plan(feature_id, progress)
         except ValueError as e:
             if "does not meet RULEMAP threshold" in str(e):
                 return {
@@ -370,9 +387,11 @@ async def specmap_plan(
 
 
 @server.tool()
+@instrumented
 async def specmap_tasks(
     project_path: str,
-    feature_id: str
+    feature_id: str,
+    background: bool = False
 ) -> dict:
     """
     Generate TDD task breakdown for a feature.
@@ -390,10 +409,20 @@ async def specmap_tasks(
     Args:
         project_path: Path to SpecMap project root
         feature_id: Feature ID to break down (e.g., "001-user-authentication")
+        background: Return a job ID at once and generate tasks in the
+            background; poll it with job_status (default: False)
 
     Returns:
         dict: Task breakdown results with total tasks and phase breakdown
     """
+    params = {"feature_id": feature_id}
+    if background:
+        return await _start_job(project_path, "tasks", "workflow", _feature_tasks, **params)
+    return await run_blocking("workflow", _feature_tasks, project_path, **params)
+
+
+def _feature_tasks(project_path: str, feature_id: str, progress=None) -> dict:
+    """Generate a feature's task breakdown and build the specmap_tasks result"""
     try:
         project_path = Path(project_path).resolve()
 
@@ -408,8 +437,8 @@ async def specmap_tasks(
                 )
             }
 
-        generator = TaskGenerator(project_path)
-        result = generator.generate_tasks_for_feature(feature_id)
+        generator = get_context(project_path).task_generator
+        result = generator.generate_tasks_for_feature(feature_id, progress)
 
         phase_summary = []
         for phase, count in result['tasks_by_phase'].items():
@@ -423,11 +452,13 @@ async def specmap_tasks(
             "total_tasks": result['total_tasks'],
             "tasks_by_phase": result['tasks_by_phase'],
             "parallel_groups": result['parallel_groups'],
+            "critical_path": result['critical_path'],
             "estimated_duration": result['estimated_duration'],
             "message": (
                 f"✅ Task breakdown generated: {feature_id}\n"
                 f"📋 Total Tasks: {result['total_tasks']}\n"
                 f"🔄 Parallel Groups: {result['parallel_groups']}\n"
+                f"🎯 Critical Path: {len(result['critical_path'])} tasks\n"
                 f"⏱️  Estimated Duration: {result['estimated_duration']} days\n"
                 f"📊 Breakdown by phase:\n" + "\n".join(phase_summary) +
                 f"\n📍 Tasks: {result['tasks_file']}"
@@ -444,7 +475,144 @@ async def specmap_tasks(
 
 
 @server.tool()
-async def specmap_status(
+@instrumented
+@blocking("workflow")
+def specmap_schedule(
+    project_path: str,
+    feature_id: str,
+    workers: int = 2,
+    priority: str = "longest_path"
+) -> dict:
+    """
+    Simulate a feature's task breakdown on a team of developers or agents.
+
+    Runs the tasks specmap_tasks would generate on a fixed number of workers,
+    respecting their dependencies: whenever a worker is free it starts the
+    ready task ranked first by the priority rule. Use the makespan for
+    staffing; it lies between the critical path (unlimited workers) and the
+    total work (one worker).
+
+    Requires: Implementation plan exists for feature
+
+    Args:
+        project_path: Path to SpecMap project root
+        feature_id: Feature ID to schedule (e.g., "001-user-authentication")
+        workers: Number of developers or agents working at the same time
+        priority: "longest_path" (default; longest remaining chain first),
+            "least_slack", "shortest_first" or "task_order"
+
+    Returns:
+        dict: Makespan in hours and days, utilization and per-worker timelines
+    """
+    try:
+        generator = get_context(project_path).task_generator
+        schedule = generator.simulate_schedule(feature_id, workers, priority)
+
+        message_parts = [
+            f"📅 Schedule for {feature_id}: {workers} workers ({priority})",
+            f"⏱️  Makespan: {schedule['makespan']:g} hours (~{schedule['estimated_duration']} days)",
+            f"🎯 Critical Path: {schedule['critical_path_length']:g} hours | "
+            f"📋 Total Work: {schedule['total_work']:g} hours",
+            f"📊 Utilization: {schedule['utilization']:.0%}",
+            "",
+            "👥 Workers:"
+        ]
+        for worker, (timeline, utilization) in enumerate(
+                zip(schedule['timelines'], schedule['worker_utilization']), 1):
+            message_parts.append(f"   • Worker {worker}: {len(timeline)} tasks, {utilization:.0%} busy")
+
+        return {
+            "success": True,
+            **schedule,
+            "message": "\n".join(message_parts)
+        }
+
+    except ValueError as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"❌ {str(e)}"
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "traceback": traceback.format_exc(),
+            "message": f"❌ Failed to simulate schedule: {str(e)}"
+        }
+
+
+@server.tool()
+@instrumented
+@blocking("workflow")
+def specmap_forecast(
+    project_path: str,
+    feature_id: Optional[str] = None,
+    samples: int = 20000,
+    distribution: str = "pert",
+    seed: Optional[int] = None
+) -> dict:
+    """
+    Forecast when a feature's tasks (or every planned feature's) complete.
+
+    Draws each task's duration from its three-point estimate (optimistic,
+    likely, pessimistic) and runs the samples through the task dependency
+    graph. Reports P50/P80/P95 completion: commit to P80 or P95 rather than
+    the single-point estimated duration. Needs numpy, from the
+    specmap-cli[forecast] extra.
+
+    Args:
+        project_path: Path to SpecMap project root
+        feature_id: Feature to forecast; omit for every feature with a plan
+        samples: Number of Monte Carlo samples (default: 20000)
+        distribution: "pert" (default) or "triangular"
+        seed: Seed for a reproducible forecast
+
+    Returns:
+        dict: Completion percentiles in hours and days and sample statistics
+    """
+    try:
+        generator = get_context(project_path).task_generator
+        result = generator.forecast_completion(
+            [feature_id] if feature_id else None, samples, distribution, seed
+        )
+
+        scope = feature_id or f"{len(result['feature_ids'])} features"
+        message_parts = [
+            f"🎲 Completion forecast for {scope} ({result['total_tasks']} tasks, "
+            f"{result['samples']} {result['distribution']} samples)",
+            f"📐 With likely estimates: {result['likely_hours']:.1f} hours"
+        ]
+        for name, hours in result['percentiles'].items():
+            message_parts.append(
+                f"   • {name.upper()}: {hours:.1f} hours (~{result['percentile_days'][name]} days)"
+            )
+
+        return {
+            "success": True,
+            **result,
+            "message": "\n".join(message_parts)
+        }
+
+    except (ValueError, RuntimeError) as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"❌ {str(e)}"
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "traceback": traceback.format_exc(),
+            "message": f"❌ Failed to forecast completion: {str(e)}"
+        }
+
+
+@server.tool()
+@instrumented
+@blocking("query")
+def specmap_status(
     project_path: str,
     detailed: bool = False
 ) -> dict:
@@ -474,9 +642,9 @@ async def specmap_status(
                 "message": "❌ Not a valid SpecMap project"
             }
 
-        config = ConfigManager(project_path)
+        context = get_context(project_path)
+        config = context.config
 
-        specs_path = project_path / "01-specifications" / "features"
         features = []
         workflow_summary = {
             "specified": 0,
@@ -485,41 +653,36 @@ async def specmap_status(
             "in_progress": 0
         }
 
-        if specs_path.exists():
-            for feature_dir in sorted(specs_path.iterdir()):
-                if feature_dir.is_dir():
-                    feature_id = feature_dir.name
-                    spec_file = feature_dir / "spec.md"
-                    plan_path = project_path / "02-planning" / "features" / feature_id
-
-                    has_spec = spec_file.exists()
-                    has_plan = (plan_path / "plan.md").exists() if plan_path.exists() else False
-                    has_tasks = (plan_path / "tasks.md").exists() if plan_path.exists() else False
-
-                    if has_spec:
-                        workflow_summary["specified"] += 1
-                    if has_plan:
-                        workflow_summary["planned"] += 1
-                    if has_tasks:
-                        workflow_summary["tasks_created"] += 1
-
-                    feature_info = {
-                        "id": feature_id,
-                        "has_spec": has_spec,
-                        "has_plan": has_plan,
-                        "has_tasks": has_tasks,
-                        "status": (
-                            "tasks_ready" if has_tasks else
-                            "planned" if has_plan else
-                            "specified" if has_spec else
-                            "unknown"
-                        )
-                    }
-
-                    if detailed:
-                        features.append(feature_info)
-                    else:
-                        features.append(feature_id)
+        for row in context.index.feature_status():
+            feature_id = row['feature_id']
+            has_spec = row['has_spec']
+            has_plan = row['has_plan']
+            has_tasks = row['has_tasks']
+
+            if has_spec:
+                workflow_summary["specified"] += 1
+            if has_plan:
+                workflow_summary["planned"] += 1
+            if has_tasks:
+                workflow_summary["tasks_created"] += 1
+
+            feature_info = {
+                "id": feature_id,
+                "has_spec": has_spec,
+                "has_plan": has_plan,
+                "has_tasks": has_tasks,
+                "status": (
+                    "tasks_ready" if has_tasks else
+                    "planned" if has_plan else
+                    "specified" if has_spec else
+                    "unknown"
+                )
+            }
+
+            if detailed:
+                features.append(feature_info)
+            else:
+                features.append(feature_id)
 
         message_parts = [
             f"📊 Project Status: {config.get('project.name')}",
@@ -558,7 +721,9 @@ async def specmap_status(
 # ============================================================================
 
 @server.tool()
-async def specmap_validate(
+@instrumented
+@blocking("query")
+def specmap_validate(
     project_path: str,
     feature_id: str,
     validation_type: str = "both"
@@ -594,30 +759,12 @@ async def specmap_validate(
                 "message": f"❌ Feature '{feature_id}' does not exist"
             }
 
-        issues = []
-        recommendations = []
-
-        rulemap_score = 0.0
-        meets_threshold = False
-
-        if validation_type in ["rulemap", "both"]:
-            processor = ClarificationProcessor(project_path)
-            score_result = processor.calculate_rulemap_score(feature_id)
-            rulemap_score = score_result['score']
-            meets_threshold = score_result['meets_threshold']
-
-            if not meets_threshold:
-                issues.append(f"RULEMAP score {rulemap_score:.1f} below threshold (need ≥8.0)")
-                recommendations.append("Run specmap_clarify to identify and resolve open questions")
-
-        constitution_compliant = True
-        if validation_type in ["constitution", "both"]:
-            spec_file = feature_path / "spec.md"
-            if spec_file.exists():
-                content = spec_file.read_text()
-                if "Constitution Compliance" not in content:
-                    issues.append("Constitution compliance section missing")
-                    constitution_compliant = False
+        result = _validate_feature(get_context(project_path), feature_id, validation_type)
+        rulemap_score = result['rulemap_score']
+        meets_threshold = result['meets_threshold']
+        constitution_compliant = result['constitution_compliant']
+        issues = result['issues']
+        recommendations = result['recommendations']
 
         message_parts = [
             f"{'✅' if not issues else '⚠️'} Validation: {feature_id}"
@@ -661,12 +808,236 @@ async def specmap_validate(
         }
 
 
+def _validate_feature(context, feature_id: str, validation_type: str = "both") -> dict:
+    """Run the validation checks for one feature against a loaded project context"""
+    feature_path = context.project_path / "01-specifications" / "features" / feature_id
+
+    issues = []
+    recommendations = []
+
+    rulemap_score = 0.0
+    meets_threshold = False
+
+    if validation_type in ["rulemap", "both"]:
+        score_result = context.clarify_processor.calculate_rulemap_score(feature_id)
+        rulemap_score = score_result['score']
+        meets_threshold = score_result['meets_threshold']
+
+        if not meets_threshold:
+            issues.append(f"RULEMAP score {rulemap_score:.1f} below threshold (need ≥8.0)")
+            recommendations.append("Run specmap_clarify to identify and resolve open questions")
+
+    constitution_compliant = True
+    if validation_type in ["constitution", "both"]:
+        content = context.read_document(feature_path / "spec.md")
+        if content is not None:
+            if "Constitution Compliance" not in content:
+                issues.append("Constitution compliance section missing")
+                constitution_compliant = False
+
+    return {
+        "feature_id": feature_id,
+        "rulemap_score": rulemap_score,
+        "meets_threshold": meets_threshold,
+        "constitution_compliant": constitution_compliant,
+        "issues": issues,
+        "recommendations": recommendations
+    }
+
+
+def _clarify_feature(context, feature_id: str) -> dict:
+    """Collect open questions and the RULEMAP score for one feature (non-interactive)"""
+    processor = context.clarify_processor
+    questions = processor.find_open_questions(feature_id)
+    score_result = processor.calculate_rulemap_score(feature_id)
+
+    return {
+        "feature_id": feature_id,
+        "status": "questions_found" if questions else "no_questions_found",
+        "questions_count": len(questions),
+        "rulemap_score": score_result['score'],
+        "meets_threshold": score_result['meets_threshold'],
+        "questions": [
+            {"id": q['id'], "question": q['question'][:100], "line": q['line']}
+            for q in questions[:5]
+        ]
+    }
+
+
+# ============================================================================
+# BATCH TOOLS (2 tools)
+# ============================================================================
+
+async def _run_batch(context, feature_ids: List[str], check, ctx: Optional[Context] = None) -> tuple:
+    """Run check(context, feature_id) for every feature on the query lane
+
+    The lane's thread cap bounds how many checks run at once. Results come
+    back sorted by feature ID; failures are collected separately so one
+    broken spec does not hide the rest. When the client supplied a progress
+    token, a progress notification is sent as each feature finishes.
+    """
+    async def run_one(feature_id: str):
+        try:
+            return await run_blocking("query", check, context, feature_id)
+        except Exception as e:
+            return {"feature_id": feature_id, "error": str(e)}
+
+    results = []
+    errors = []
+    total = len(feature_ids)
+    for done, future in enumerate(asyncio.as_completed([run_one(f) for f in feature_ids]), 1):
+        result = await future
+        (errors if "error" in result else results).append(result)
+        if ctx is not None:
+            await ctx.report_progress(done, total)
+
+    results.sort(key=lambda r: r["feature_id"])
+    errors.sort(key=lambda r: r["feature_id"])
+    return results, errors
+
+
+@server.tool()
+@instrumented
+async def specmap_validate_all(
+    project_path: str,
+    validation_type: str = "both",
+    ctx: Optional[Context] = None
+) -> dict:
+    """
+    Validate every feature specification in the project in one call.
+
+    Runs the same checks as specmap_validate across all features concurrently,
+    reusing one loaded project context, and returns a single aggregated result.
+    Sends progress notifications as features complete when the client asks
+    for them.
+
+    Args:
+        project_path: Path to SpecMap project root
+        validation_type: "rulemap", "constitution" or "both" (default)
+
+    Returns:
+        dict: Per-feature validation results plus pass/fail totals
+    """
+    try:
+        project_path = Path(project_path).resolve()
+
+        if not (project_path / ".specmap").exists():
+            return {
+                "success": False,
+                "error": "Not a SpecMap project",
+                "message": "❌ Not a valid SpecMap project"
+            }
+
+        context = await run_blocking("query", get_context, project_path)
+        feature_ids = await run_blocking("query", context.index.features_with_specs)
+
+        def check(context, feature_id):
+            return _validate_feature(context, feature_id, validation_type)
+
+        results, errors = await _run_batch(context, feature_ids, check, ctx)
+        passed = [r["feature_id"] for r in results if not r["issues"]]
+        failed = [r["feature_id"] for r in results if r["issues"]]
+
+        message_parts = [
+            f"{'✅' if not failed and not errors else '⚠️'} Validated {len(feature_ids)} features",
+            f"   ✅ Passed: {len(passed)}",
+            f"   ⚠️  With issues: {len(failed)}"
+        ]
+        if errors:
+            message_parts.append(f"   ❌ Errors: {len(errors)}")
+        for feature_id in failed[:5]:
+            message_parts.append(f"   • {feature_id}")
+
+        return {
+            "success": True,
+            "total_features": len(feature_ids),
+            "passed": passed,
+            "failed": failed,
+            "results": results,
+            "errors": errors,
+            "message": "\n".join(message_parts)
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "traceback": traceback.format_exc(),
+            "message": f"❌ Failed to validate features: {str(e)}"
+        }
+
+
+@server.tool()
+@instrumented
+async def specmap_clarify_all(
+    project_path: str,
+    ctx: Optional[Context] = None
+) -> dict:
+    """
+    Find open questions and RULEMAP scores for every feature in one call.
+
+    Non-interactive counterpart of specmap_clarify that fans out across all
+    features concurrently using one loaded project context. Sends progress
+    notifications as features complete when the client asks for them.
+
+    Args:
+        project_path: Path to SpecMap project root
+
+    Returns:
+        dict: Per-feature question counts and scores plus project totals
+    """
+    try:
+        project_path = Path(project_path).resolve()
+
+        if not (project_path / ".specmap").exists():
+            return {
+                "success": False,
+                "error": "Not a SpecMap project",
+                "message": "❌ Not a valid SpecMap project"
+            }
+
+        context = await run_blocking("query", get_context, project_path)
+        feature_ids = await run_blocking("query", context.index.features_with_specs)
+
+        results, errors = await _run_batch(context, feature_ids, _clarify_feature, ctx)
+        total_questions = sum(r["questions_count"] for r in results)
+        ready = [r["feature_id"] for r in results if r["meets_threshold"] and not r["questions_count"]]
+
+        message_parts = [
+            f"{'✅' if not total_questions else '❓'} Clarification check: {len(feature_ids)} features",
+            f"   ❓ Open questions: {total_questions}",
+            f"   ✅ Ready for planning: {len(ready)}"
+        ]
+        if errors:
+            message_parts.append(f"   ❌ Errors: {len(errors)}")
+
+        return {
+            "success": True,
+            "total_features": len(feature_ids),
+            "total_questions": total_questions,
+            "ready_for_planning": ready,
+            "results": results,
+            "errors": errors,
+            "message": "\n".join(message_parts)
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "traceback": traceback.format_exc(),
+            "message": f"❌ Failed to check clarifications: {str(e)}"
+        }
+
+
 # ============================================================================
 # SKILL MANAGEMENT TOOLS (6 tools)
 # ============================================================================
 
 @server.tool()
-async def create_claude_skill(
+@instrumented
+@blocking("workflow")
+def create_claude_skill(
     project_path: str,
     name: str,
     description: str,
@@ -688,6 +1059,7 @@ async def create_claude_skill(
     """
     try:
         project_path = Path(project_path).resolve()
+        from specmap.skills import SkillManager
         skill_manager = SkillManager(project_path)
         result = skill_manager.create_skill(name, description, content, metadata)
 
@@ -707,7 +1079,9 @@ async def create_claude_skill(
 
 
 @server.tool()
-async def install_specmap_skill_template(
+@instrumented
+@blocking("workflow")
+def install_specmap_skill_template(
     project_path: str,
     template_name: str
 ) -> dict:
@@ -730,6 +1104,7 @@ async def install_specmap_skill_template(
     """
     try:
         project_path = Path(project_path).resolve()
+        from specmap.skills import SkillManager
         skill_manager = SkillManager(project_path)
         result = skill_manager.create_skill_from_template(template_name)
 
@@ -749,7 +1124,9 @@ async def install_specmap_skill_template(
 
 
 @server.tool()
-async def install_all_specmap_skills(
+@instrumented
+@blocking("workflow")
+def install_all_specmap_skills(
     project_path: str
 ) -> dict:
     """
@@ -770,6 +1147,7 @@ async def install_all_specmap_skills(
     """
     try:
         project_path = Path(project_path).resolve()
+        from specmap.skills import SkillManager
         skill_manager = SkillManager(project_path)
         result = skill_manager.install_all_templates()
 
@@ -791,7 +1169,9 @@ async def install_all_specmap_skills(
 
 
 @server.tool()
-async def list_claude_skills(
+@instrumented
+@blocking("query")
+def list_claude_skills(
     project_path: str
 ) -> dict:
     """
@@ -805,6 +1185,7 @@ async def list_claude_skills(
     """
     try:
         project_path = Path(project_path).resolve()
+        from specmap.skills import SkillManager
         skill_manager = SkillManager(project_path)
         skills = skill_manager.list_skills()
 
@@ -824,7 +1205,9 @@ async def list_claude_skills(
 
 
 @server.tool()
-async def get_skill_templates() -> dict:
+@instrumented
+@blocking("query")
+def get_skill_templates() -> dict:
     """
     Get list of available SpecMap skill templates.
 
@@ -832,6 +1215,7 @@ async def get_skill_templates() -> dict:
         dict: List of available templates with descriptions
     """
     try:
+        from specmap.skills import SkillManager
         skill_manager = SkillManager()
         templates = skill_manager.get_available_templates()
 
@@ -851,7 +1235,9 @@ async def get_skill_templates() -> dict:
 
 
 @server.tool()
-async def delete_claude_skill(
+@instrumented
+@blocking("workflow")
+def delete_claude_skill(
     project_path: str,
     skill_name: str
 ) -> dict:
@@ -867,6 +1253,7 @@ async def delete_claude_skill(
     """
     try:
         project_path = Path(project_path).resolve()
+        from specmap.skills import SkillManager
         skill_manager = SkillManager(project_path)
         result = skill_manager.delete_skill(skill_name)
 
@@ -896,7 +1283,9 @@ async def delete_claude_skill(
 # ============================================================================
 
 @server.tool()
-async def session_start(
+@instrumented
+@blocking("session")
+def session_start(
     project_path: str,
     focus: str,
     agent: str = "claude",
@@ -922,6 +1311,7 @@ async def session_start(
     """
     try:
         project_path = Path(project_path).resolve()
+        from specmap.sessions import SessionManager
         session_mgr = SessionManager(project_path)
 
         result = session_mgr.start_session(focus, agent, metadata)
@@ -958,7 +1348,9 @@ async def session_start(
 
 
 @server.tool()
-async def session_checkpoint(
+@instrumented
+@blocking("session")
+def session_checkpoint(
     project_path: str,
     session_id: str,
     description: str,
@@ -980,6 +1372,7 @@ async def session_checkpoint(
     """
     try:
         project_path = Path(project_path).resolve()
+        from specmap.sessions import SessionManager
         session_mgr = SessionManager(project_path)
 
         result = session_mgr.create_checkpoint(
@@ -1018,7 +1411,9 @@ async def session_checkpoint(
 
 
 @server.tool()
-async def session_track_artifact(
+@instrumented
+@blocking("session")
+def session_track_artifact(
     project_path: str,
     session_id: str,
     file_path: str,
@@ -1036,29 +1431,42 @@ async def session_track_artifact(
         action: "created" or "modified"
 
     Returns:
-        dict: Tracking confirmation
+        dict: Tracking confirmation with the item's status ("tracked",
+            "duplicate" or "invalid_action", as in session_track_artifacts)
     """
     try:
         project_path = Path(project_path).resolve()
+        from specmap.sessions import SessionManager
         session_mgr = SessionManager(project_path)
 
-        success = session_mgr.track_artifact(session_id, file_path, action)
+        # A batch of one, so both tools report an item the same way
+        status = session_mgr.track_artifacts(session_id, [(file_path, action)])[0]["status"]
 
-        if success:
+        if status == "invalid_action":
             return {
-                "success": True,
+                "success": False,
                 "session_id": session_id,
                 "file_path": file_path,
                 "action": action,
-                "message": f"✅ Tracked: {file_path} ({action})"
-            }
-        else:
-            return {
-                "success": False,
-                "error": "Session not found",
-                "message": f"❌ Session not found: {session_id}"
+                "status": status,
+                "error": f"Unknown artifact action: {action}",
+                "message": f"❌ Unknown artifact action: {action} (use 'created' or 'modified')"
             }
+        return {
+            "success": True,
+            "session_id": session_id,
+            "file_path": file_path,
+            "action": action,
+            "status": status,
+            "message": f"✅ Tracked: {file_path} ({action})"
+        }
 
+    except ValueError as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"❌ {str(e)}"
+        }
     except Exception as e:
         return {
             "success": False,
@@ -1069,34 +1477,117 @@ async def session_track_artifact(
 
 
 @server.tool()
+@instrumented
+@blocking("session")
+def session_track_artifacts(
+    project_path: str,
+    session_id: str,
+    artifacts: List[Dict[str, str]]
+) -> dict:
+    """
+    Track many file artifacts in session metadata with one call.
+
+    Use this instead of repeated session_track_artifact calls after touching
+    many files (e.g. a large refactor). The batch is applied in one transaction.
+
+    Args:
+        project_path: Path to SpecMap project root
+        session_id: Session ID
+        artifacts: List of {"file_path": ..., "action": "created" | "modified"};
+            action defaults to "created"
+
+    Returns:
+        dict: Per-item results and counts
+    """
+    try:
+        project_path = Path(project_path).resolve()
+        from specmap.sessions import SessionManager
+        session_mgr = SessionManager(project_path)
+
+        results = session_mgr.track_artifacts(
+            session_id,
+            [(item["file_path"], item.get("action", "created")) for item in artifacts]
+        )
+        tracked = sum(1 for result in results if result["status"] == "tracked")
+
+        return {
+            "success": True,
+            "session_id": session_id,
+            "results": results,
+            "tracked": tracked,
+            "skipped": len(results) - tracked,
+            "message": f"✅ Tracked {tracked} of {len(results)} artifacts"
+        }
+
+    except ValueError as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"❌ {str(e)}"
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "traceback": traceback.format_exc(),
+            "message": f"❌ Failed to track artifacts: {str(e)}"
+        }
+
+
+@server.tool()
+@instrumented
 async def session_end(
     project_path: str,
     session_id: str,
     rulemap_score: Optional[float] = None,
-    create_backup: bool = True
+    create_backup: bool = True,
+    backup_format: str = "zip",
+    background: bool = False
 ) -> dict:
     """
     End a session and archive it with backup.
 
-    Finalizes session, archives workspace, creates backup.
+    Finalizes session and archives workspace. The backup archive is written
+    in the background; check it with session_backup_status.
 
     Args:
         project_path: Path to SpecMap project root
         session_id: Session ID to end
         rulemap_score: Optional RULEMAP score (0-10) for session quality
         create_backup: Whether to create backup (default: True)
+        backup_format: "zip" (default) or "tar.zst" (needs zstandard)
+        background: Return a job ID at once and end the session, backup
+            included, in the background; poll it with job_status (default: False)
 
     Returns:
         dict: Archival details and session summary
     """
+    params = {"session_id": session_id, "rulemap_score": rulemap_score,
+              "create_backup": create_backup, "backup_format": backup_format}
+    if background:
+        return await _start_job(project_path, "session_end", "backup", _end_session, **params)
+    return await run_blocking("session", _end_session, project_path, **params)
+
+
+def _end_session(project_path: str, session_id: str, rulemap_score: Optional[float] = None,
+                 create_backup: bool = True, backup_format: str = "zip", progress=None) -> dict:
+    """End and archive a session and build the session_end result
+
+    Called directly, the backup archive is written on the session backup
+    thread. As a job, the job itself waits for the backup.
+    """
     try:
         project_path = Path(project_path).resolve()
+        from specmap.sessions import SessionManager
         session_mgr = SessionManager(project_path)
 
         result = session_mgr.end_session(
             session_id=session_id,
             rulemap_score=rulemap_score,
-            create_backup=create_backup
+            create_backup=create_backup,
+            backup_format=backup_format,
+            background=progress is None,
+            progress=progress
         )
 
         message_parts = [
@@ -1116,7 +1607,7 @@ async def session_end(
         ])
 
         if result['backup_path']:
-            message_parts.append(f"💾 Backup: {result['backup_path']}")
+            message_parts.append(f"💾 Backup ({result['backup_status']}): {result['backup_path']}")
 
         return {
             "success": True,
@@ -1127,6 +1618,7 @@ async def session_end(
             "checkpoints": result['checkpoints'],
             "archive_path": result['archive_path'],
             "backup_path": result['backup_path'],
+            "backup_status": result['backup_status'],
             "message": "\n".join(message_parts)
         }
 
@@ -1146,7 +1638,53 @@ async def session_end(
 
 
 @server.tool()
-async def session_list_active(
+@instrumented
+@blocking("query")
+def session_backup_status(
+    project_path: str,
+    session_id: str
+) -> dict:
+    """
+    Check the backup archive of an ended session.
+
+    session_end writes the backup in the background; this reports whether it
+    is still pending, completed (with its size) or failed.
+
+    Args:
+        project_path: Path to SpecMap project root
+        session_id: Session ID
+
+    Returns:
+        dict: Backup status and path
+    """
+    try:
+        project_path = Path(project_path).resolve()
+        from specmap.sessions import SessionManager
+        session_mgr = SessionManager(project_path)
+
+        result = session_mgr.backup_status(session_id)
+        icons = {"pending": "⏳", "completed": "✅", "failed": "❌", "missing": "❓"}
+
+        return {
+            "success": result['status'] != "failed",
+            "session_id": session_id,
+            **result,
+            "message": f"{icons[result['status']]} Backup {result['status']}: {result['backup_path'] or session_id}"
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "traceback": traceback.format_exc(),
+            "message": f"❌ Failed to check backup: {str(e)}"
+        }
+
+
+@server.tool()
+@instrumented
+@blocking("query")
+def session_list_active(
     project_path: str
 ) -> dict:
     """
@@ -1160,6 +1698,7 @@ async def session_list_active(
     """
     try:
         project_path = Path(project_path).resolve()
+        from specmap.sessions import SessionManager
         session_mgr = SessionManager(project_path)
 
         sessions = session_mgr.list_active_sessions()
@@ -1181,8 +1720,10 @@ async def session_list_active(
 
 
 @server.tool()
+@instrumented
 async def create_daily_backup(
-    project_path: str
+    project_path: str,
+    background: bool = False
 ) -> dict:
     """
     Create daily backup of entire project.
@@ -1197,27 +1738,44 @@ async def create_daily_backup(
 
     Args:
         project_path: Path to SpecMap project root
+        background: Return a job ID at once and back up in the background,
+            reporting progress per backed-up folder; poll it with job_status
+            (default: False)
 
     Returns:
         dict: Backup details with manifest
     """
+    if background:
+        return await _start_job(project_path, "daily_backup", "backup", _daily_backup)
+    return await run_blocking("backup", _daily_backup, project_path)
+
+
+def _daily_backup(project_path: str, progress=None) -> dict:
+    """Create the daily backup and build the create_daily_backup result"""
     try:
         project_path = Path(project_path).resolve()
+        from specmap.sessions import SessionManager
         session_mgr = SessionManager(project_path)
 
-        result = session_mgr.create_daily_backup()
+        result = session_mgr.create_daily_backup(progress=progress)
 
         return {
             "success": True,
             "backup_date": result['backup_date'],
             "backup_path": result['backup_path'],
             "items_backed_up": result['items_backed_up'],
+            "files_copied": result['files_copied'],
+            "files_linked": result['files_linked'],
+            "skipped_links": result['skipped_links'],
             "manifest": result['manifest'],
             "message": (
                 f"✅ Daily backup created: {result['backup_date']}\n"
                 f"📁 Location: {result['backup_path']}\n"
                 f"📦 Items: {result['items_backed_up']}\n"
-                f"📄 Manifest: {result['manifest']}\n\n"
+                f"📝 Files copied: {result['files_copied']} "
+                f"(unchanged, linked: {result['files_linked']})\n"
+                + (f"⚠️ Links skipped: {', '.join(result['skipped_links'])}\n" if result['skipped_links'] else "")
+                + f"📄 Manifest: {result['manifest']}\n\n"
                 f"Backed up:\n"
                 f"  - Governance documents\n"
                 f"  - All specifications\n"
@@ -1236,6 +1794,413 @@ async def create_daily_backup(
         }
 
 
+@server.tool()
+@instrumented
+@blocking("backup")
+def verify_daily_backup(
+    project_path: str,
+    backup_date: Optional[str] = None
+) -> dict:
+    """
+    Verify a daily backup against its manifest.
+
+    Re-hashes every file recorded in the backup's manifest.json and reports
+    files that are missing or whose content changed.
+
+    Args:
+        project_path: Path to SpecMap project root
+        backup_date: Backup date (YYYY-MM-DD); defaults to the latest backup
+
+    Returns:
+        dict: Verification result
+    """
+    try:
+        project_path = Path(project_path).resolve()
+        from specmap.sessions import SessionManager
+        session_mgr = SessionManager(project_path)
+
+        result = session_mgr.verify_daily_backup(backup_date)
+        status = "✅ Backup verified" if result['verified'] else "❌ Backup does not match its manifest"
+
+        return {
+            "success": True,
+            **result,
+            "message": (
+                f"{status}: {result['backup_date']}\n"
+                f"📄 Files checked: {result['files_checked']}\n"
+                f"Missing: {len(result['missing'])}, changed: {len(result['mismatched'])}, "
+                f"links skipped: {len(result['skipped_links'])}"
+            )
+        }
+
+    except ValueError as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"❌ {str(e)}"
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "traceback": traceback.format_exc(),
+            "message": f"❌ Failed to verify backup: {str(e)}"
+        }
+
+
+# ============================================================================
+# JOB TOOLS (2 tools)
+# ============================================================================
+
+JOB_ICONS = {
+    "queued": "⏳", "running": "🔄", "cancelling": "🛑", "completed": "✅",
+    "failed": "❌", "cancelled": "🚫", "interrupted": "⚠️"
+}
+
+
+async def _start_job(project_path: str, kind: str, lane: str, fn, **params) -> dict:
+    """Start fn(project_path, **params) as a background job and describe it to the client"""
+    project_path = Path(project_path).resolve()
+    manager = get_job_manager(project_path)
+    job = await run_blocking("query", manager.submit, kind, lane, fn, str(project_path), **params)
+    return {
+        "success": True,
+        "job_id": job['id'],
+        "status": job['status'],
+        "message": (
+            f"⏳ Started {kind} job: {job['id']}\n"
+            f"💡 Poll it with job_status, stop it with job_cancel"
+        )
+    }
+
+
+def _job_result(job: dict) -> dict:
+    """Build a job tool result from a job record"""
+    progress = job['progress']
+    message = f"{JOB_ICONS[job['status']]} Job {job['id']} ({job['kind']}): {job['status']}"
+    if job['status'] in ("queued", "running", "cancelling") and progress['total']:
+        message += f"\n📊 Progress: {progress['done']}/{progress['total']}"
+        if progress['message']:
+            message += f" - {progress['message']}"
+    if job['error']:
+        message += f"\n❌ {job['error']}"
+    elif job['result'] and job['result'].get('message'):
+        message += f"\n\n{job['result']['message']}"
+
+    return {
+        "success": (job['status'] not in ("failed", "interrupted")
+                    and (job['result'] or {}).get('success', True)),
+        "job_id": job['id'],
+        "kind": job['kind'],
+        "status": job['status'],
+        "progress": progress,
+        "params": job['params'],
+        "created": job['created'],
+        "started": job['started'],
+        "finished": job['finished'],
+        "result": job['result'],
+        "error": job['error'],
+        "message": message
+    }
+
+
+@server.tool()
+@instrumented
+async def job_status(
+    project_path: str,
+    job_id: str,
+    wait_seconds: float = 0,
+    ctx: Optional[Context] = None
+) -> dict:
+    """
+    Get the status, progress and result of a background job.
+
+    Jobs are started by specmap_plan, specmap_tasks, session_end and
+    create_daily_backup with background=True. Job records are kept in
+    .specmap/jobs/, so results of finished jobs are still available after
+    the server restarts.
+
+    Args:
+        project_path: Path to SpecMap project root
+        job_id: Job ID returned when the job started
+        wait_seconds: Wait up to this long for the job to finish, sending
+            progress notifications while waiting (default: 0, return at once)
+
+    Returns:
+        dict: Job status, progress and, once completed, the tool's result
+    """
+    try:
+        manager = get_job_manager(project_path)
+        job = await run_blocking("query", manager.status, job_id)
+        if job is None:
+            return {
+                "success": False,
+                "error": f"Job not found: {job_id}",
+                "message": f"❌ Job '{job_id}' does not exist"
+            }
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + min(wait_seconds, 300)
+        reported = None
+        while job['status'] in ("queued", "running", "cancelling") and loop.time() < deadline:
+            progress = job['progress']
+            if ctx is not None and progress['total'] and progress['done'] != reported:
+                reported = progress['done']
+                await ctx.report_progress(progress['done'], progress['total'])
+            await asyncio.sleep(0.25)
+            job = await run_blocking("query", manager.status, job_id)
+
+        return _job_result(job)
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "traceback": traceback.format_exc(),
+            "message": f"❌ Failed to get job status: {str(e)}"
+        }
+
+
+@server.tool()
+@instrumented
+@blocking("query")
+def job_cancel(
+    project_path: str,
+    job_id: str
+) -> dict:
+    """
+    Cancel a background job.
+
+    A queued job is cancelled immediately. A running job is marked
+    "cancelling" and stops at its next progress step; check it with
+    job_status. Finished jobs are left as they are.
+
+    Args:
+        project_path: Path to SpecMap project root
+        job_id: Job ID returned when the job started
+
+    Returns:
+        dict: Job status after the cancellation request
+    """
+    try:
+        job = get_job_manager(project_path).cancel(job_id)
+        if job is None:
+            return {
+                "success": False,
+                "error": f"Job not found: {job_id}",
+                "message": f"❌ Job '{job_id}' does not exist"
+            }
+        return _job_result(job)
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "traceback": traceback.format_exc(),
+            "message": f"❌ Failed to cancel job: {str(e)}"
+        }
+
+
+# ============================================================================
+# METRICS TOOLS (1 tool)
+# ============================================================================
+
+@server.tool()
+@blocking("query")
+def specmap_metrics(
+    project_path: str = ".",
+    source: str = "live",
+    enable: Optional[bool] = None,
+    dump: Optional[str] = None,
+    reset: bool = False
+) -> dict:
+    """
+    Show where time goes inside SpecMap tool calls.
+
+    Metrics are opt-in: start the server with SPECMAP_METRICS=1 (or
+    "jsonl", "prometheus", "jsonl,prometheus" to also write dumps), or turn
+    them on here with enable=True. Each tool call then records wall time,
+    time queued for its lane, file reads and writes, bytes read, time per
+    extractor and cache hits.
+
+    Args:
+        project_path: Path to SpecMap project root
+        source: "live" for this server's totals since start or reset,
+            "log" for every call in the project's .specmap/metrics/calls.jsonl
+        enable: Turn recording on (True) or off (False); omit to leave as is
+        dump: Dump formats written to .specmap/metrics/ after each call:
+            "jsonl", "prometheus", "jsonl,prometheus" or "none"
+        reset: Clear this server's totals after reading them
+
+    Returns:
+        dict: Per-tool, per-extractor and per-cache metrics
+    """
+    try:
+        from specmap import metrics
+
+        if source not in ("live", "log"):
+            return {
+                "success": False,
+                "error": f"Unknown source: {source}",
+                "message": f"❌ Unknown source '{source}' (use 'live' or 'log')"
+            }
+
+        formats = None
+        if dump is not None:
+            formats = [] if dump.strip().lower() == "none" else [
+                fmt.strip().lower() for fmt in dump.split(",") if fmt.strip()
+            ]
+        metrics.configure(enabled=enable, dump=formats)
+
+        if source == "log":
+            summary = metrics.summarize(metrics.load_calls(Path(project_path).resolve()))
+        else:
+            summary = metrics.snapshot()
+        if reset:
+            metrics.reset()
+
+        message_parts = [
+            f"📈 SpecMap Metrics ({'this server' if source == 'live' else 'call log'})",
+            f"⚙️ Recording: {'on' if metrics.enabled() else 'off'}"
+            f" | Dumps: {', '.join(metrics.dump_formats()) or 'none'}"
+        ]
+        if summary['tools']:
+            message_parts.append("")
+            message_parts.append("⏱️ Slowest tools (total time):")
+            for name, tool in list(summary['tools'].items())[:5]:
+                message_parts.append(
+                    f"   • {name}: {tool['calls']} calls, {tool['wall_ms']:.1f}ms total, "
+                    f"{tool['mean_wall_ms']:.1f}ms mean, {tool['max_wall_ms']:.1f}ms max, "
+                    f"{tool['reads']} reads ({tool['bytes_read'] / 1024:.0f} KB)"
+                )
+        if summary['extractors']:
+            message_parts.append("")
+            message_parts.append("🔍 Slowest extractors:")
+            for name, extractor in list(summary['extractors'].items())[:5]:
+                message_parts.append(
+                    f"   • {name}: {extractor['calls']} calls, {extractor['total_ms']:.1f}ms"
+                )
+        if summary['caches']:
+            message_parts.append("")
+            message_parts.append("💾 Cache hit rates:")
+            for name, cache in summary['caches'].items():
+                rate = "-" if cache['hit_rate'] is None else f"{cache['hit_rate']:.0%}"
+                message_parts.append(f"   • {name}: {rate} ({cache['hits']} hits, {cache['misses']} misses)")
+        if not summary['tools'] and not metrics.enabled():
+            message_parts.append("")
+            message_parts.append("💡 Enable recording with enable=True or SPECMAP_METRICS=1")
+
+        return {
+            "success": True,
+            "enabled": metrics.enabled(),
+            "dump": list(metrics.dump_formats()),
+            "source": source,
+            **summary,
+            "message": "\n".join(message_parts)
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "traceback": traceback.format_exc(),
+            "message": f"❌ Failed to read metrics: {str(e)}"
+        }
+
+
+# ============================================================================
+# WATCHER TOOLS (1 tool)
+# ============================================================================
+
+@server.tool()
+@instrumented
+async def specmap_watch(
+    project_path: str = ".",
+    mode: Optional[str] = None,
+    notify: bool = False,
+    ctx: Optional[Context] = None
+) -> dict:
+    """
+    Report features changed on disk and control the project's file watcher.
+
+    The server watches every project it opens for edits made outside it
+    (SPECMAP_WATCH: "auto" by default, i.e. inotify on Linux), so cached
+    documents, questions and scores are invalidated as files change instead
+    of being re-checked on every call.
+
+    Args:
+        project_path: Path to SpecMap project root
+        mode: Restart the watcher with "auto", "inotify" or "poll", or stop it
+            with "off"; omit to keep the current watcher
+        notify: Send this session a log notification (logger
+            "specmap.watcher") whenever a feature changes
+
+    Returns:
+        dict: Watcher backend, watched folders and the features changed since
+            the last call
+    """
+    try:
+        context = await run_blocking("query", get_context, project_path)
+        if not context.is_project():
+            return {
+                "success": False,
+                "error": "Not a SpecMap project",
+                "message": "❌ Not a SpecMap project. Run specmap_init first."
+            }
+
+        if mode is not None:
+            await run_blocking("query", context.start_watcher, mode.strip().lower())
+
+        watcher = context.watcher
+        if watcher is None:
+            return {
+                "success": True,
+                "backend": None,
+                "watched_folders": 0,
+                "changed_features": {},
+                "message": (
+                    "⏸️ Not watching: cached reads check files on every call\n"
+                    "💡 Start a watcher with mode='inotify' or mode='poll'"
+                )
+            }
+
+        session = getattr(ctx, "session", None)
+        if notify and session is not None:
+            watcher.subscribe(session, asyncio.get_running_loop())
+
+        from specmap_mcp.watcher import feature_state
+        changed = watcher.drain()
+        states = {feature_id: feature_state(row) for feature_id, row in sorted(changed.items())}
+
+        message_parts = [
+            f"👀 Watching {len(watcher.folders)} folders ({watcher.backend})",
+            f"🔔 Notifications: {'on' if notify and session is not None else 'unchanged'}"
+        ]
+        if states:
+            message_parts.append("")
+            message_parts.append(f"📝 Changed features ({len(states)}):")
+            for feature_id, state in states.items():
+                message_parts.append(f"   • {feature_id}: {state}")
+        else:
+            message_parts.append("✅ No changes since the last check")
+
+        return {
+            "success": True,
+            "backend": watcher.backend,
+            "watched_folders": len(watcher.folders),
+            "changed_features": states,
+            "message": "\n".join(message_parts)
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "traceback": traceback.format_exc(),
+            "message": f"❌ Failed to watch project: {str(e)}"
+        }
+
+
 # ============================================================================
 # SERVER ENTRY POINT
 # ============================================================================
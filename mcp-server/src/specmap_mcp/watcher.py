@@ -0,0 +1,380 @@
+"""
+SpecMap MCP File Watcher
+========================
+Keeps the server's caches in step with edits made outside the server.
+
+A ProjectWatcher observes a project's feature folders (spec.md,
+clarifications.md, plan.md, tasks.md) and its .specmap folder (config.yaml,
+workflow-state.json), with inotify on Linux or by polling the folders with
+scandir elsewhere. While a folder is watched, cached reads of its files skip
+their validating stat (see specmap.filestat); every change the watcher sees
+invalidates just the stat, document, questions and score of the changed file
+(see ProjectContext.invalidate). Changed features collect in a dirty set that
+specmap_watch reports, and subscribed MCP sessions get a notification per
+change.
+
+SPECMAP_WATCH picks the backend for projects the server opens: "auto"
+(default; inotify where available, otherwise none), "inotify", "poll" or
+"off". Polling notices external edits up to POLL_INTERVAL late.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from specmap import filestat
+from specmap.config import get_config_dir
+
+WATCH_MODES = ("auto", "inotify", "poll", "off")
+
+# Seconds between scans of the polling backend (and checks for folders that appear later)
+POLL_INTERVAL = 2.0
+
+# Events arriving within this many seconds are handled as one change
+DEBOUNCE = 0.05
+
+# inotify(7) event bits
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+
+_EVENT = struct.Struct('iIII')  # wd, mask, cookie, len; followed by len bytes of name
+
+_inotify_available: Optional[bool] = None
+
+
+def inotify_available() -> bool:
+    """Whether this platform's libc provides inotify"""
+    global _inotify_available
+    if _inotify_available is None:
+        try:
+            _inotify_available = (sys.platform.startswith('linux')
+                                  and hasattr(ctypes.CDLL(_libc_name()), 'inotify_init1'))
+        except OSError:
+            _inotify_available = False
+    return _inotify_available
+
+
+def _libc_name() -> str:
+    return ctypes.util.find_library('c') or 'libc.so.6'
+
+
+def default_mode() -> str:
+    """Watch mode from SPECMAP_WATCH (default: auto)"""
+    mode = os.environ.get('SPECMAP_WATCH', 'auto').strip().lower()
+    return mode if mode in WATCH_MODES else 'auto'
+
+
+class _Inotify:
+    """Minimal ctypes binding of inotify(7)"""
+
+    def __init__(self):
+        libc = ctypes.CDLL(_libc_name(), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._add_watch.restype = ctypes.c_int
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+
+    def add_watch(self, path: Path) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), str(path))
+        return wd
+
+    def rm_watch(self, wd: int):
+        self._rm_watch(self.fd, wd)
+
+    def read_events(self) -> List[Tuple[int, int, str]]:
+        """Drain pending events as (wd, mask, name)"""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                events.append((wd, mask, name))
+
+    def close(self):
+        os.close(self.fd)
+
+
+class ProjectWatcher:
+    """Watches one project's workflow documents and reports changed files
+
+    on_change(paths, everything) is called on the watcher thread after the
+    changed paths were invalidated in specmap.filestat. everything is True
+    when events were lost and all cached state should be dropped. It returns
+    the state of each affected feature ({feature_id: index row or None}).
+    """
+
+    def __init__(self, project_path: Path, backend: str,
+                 on_change: Callable[[List[Path], bool], Dict[str, Optional[Dict]]]):
+        if backend not in ("inotify", "poll"):
+            raise ValueError(f"Unknown watcher backend: {backend}")
+        self.project_path = Path(project_path)
+        self.backend = backend
+        self.on_change = on_change
+
+        self.specs_dir = self.project_path / "01-specifications" / "features"
+        self.plans_dir = self.project_path / "02-planning" / "features"
+        self.roots = (get_config_dir(self.project_path), self.specs_dir, self.plans_dir)
+
+        # Features changed since the last drain(): feature_id -> index row (None if removed)
+        self.dirty: Dict[str, Optional[Dict]] = {}
+        self.changes = 0
+
+        self._folders: Set[Path] = set()
+        self._wds: Dict[int, Path] = {}
+        self._inotify: Optional[_Inotify] = None
+        self._snapshots: Dict[Path, Dict[str, Tuple]] = {}
+        self._subscribers: Dict[int, Tuple[Any, asyncio.AbstractEventLoop]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake_r, self._wake_w = os.pipe()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def folders(self) -> List[Path]:
+        """Folders currently watched"""
+        return sorted(self._folders)
+
+    def start(self):
+        """Watch the project's folders and start the watcher thread"""
+        if self.backend == "inotify":
+            self._inotify = _Inotify()
+        self._add_missing_folders()
+
+        run = self._run_inotify if self.backend == "inotify" else self._run_poll
+        self._thread = threading.Thread(target=run, name=f"specmap-watch-{self.project_path.name}",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop watching; memoized stats of the folders are dropped"""
+        self._stop.set()
+        os.write(self._wake_w, b'x')
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        filestat.unwatch(self._folders)
+        self._folders.clear()
+        self._wds.clear()
+        if self._inotify is not None:
+            self._inotify.close()
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+    def subscribe(self, session, loop: asyncio.AbstractEventLoop):
+        """Send an MCP log notification to session whenever features change"""
+        with self._lock:
+            self._subscribers[id(session)] = (session, loop)
+
+    def drain(self) -> Dict[str, Optional[Dict]]:
+        """Return and clear the features changed since the last call"""
+        with self._lock:
+            dirty, self.dirty = self.dirty, {}
+        return dirty
+
+    # ------------------------------------------------------------------
+    # Folders
+    # ------------------------------------------------------------------
+
+    def _add_missing_folders(self) -> List[Path]:
+        """Watch roots and feature folders that are not watched yet; returns the new ones"""
+        candidates = [root for root in self.roots if root.is_dir()]
+        for features_dir in (self.specs_dir, self.plans_dir):
+            if features_dir.is_dir():
+                candidates.extend(item for item in features_dir.iterdir() if item.is_dir())
+
+        added = []
+        for folder in candidates:
+            if folder not in self._folders and self._add_folder(folder):
+                added.append(folder)
+        return added
+
+    def _add_folder(self, folder: Path) -> bool:
+        try:
+            if self._inotify is not None:
+                self._wds[self._inotify.add_watch(folder)] = folder
+            else:
+                self._snapshots[folder] = self._scan(folder)
+        except OSError as e:
+            # Out of watches or the folder vanished: its files are stat-ed as usual
+            print(f"specmap watcher: not watching {folder}: {e}", file=sys.stderr)
+            return False
+        self._folders.add(folder)
+        filestat.watch([folder])
+        return True
+
+    def _remove_folder(self, folder: Path):
+        if folder in self._folders:
+            self._folders.discard(folder)
+            filestat.unwatch([folder])
+        self._snapshots.pop(folder, None)
+        for wd in [wd for wd, path in self._wds.items() if path == folder]:
+            del self._wds[wd]
+
+    # ------------------------------------------------------------------
+    # Backends
+    # ------------------------------------------------------------------
+
+    def _run_inotify(self):
+        while not self._stop.is_set():
+            ready, _, _ = select.select([self._inotify.fd, self._wake_r], [], [], POLL_INTERVAL)
+            if self._stop.is_set():
+                return
+            if not ready:
+                self._dispatch(self._add_missing_folders(), False)
+                continue
+
+            # Let an editor's burst of events (write, rename, chmod) arrive first
+            self._stop.wait(DEBOUNCE)
+            changed, overflow = [], False
+            for wd, mask, name in self._inotify.read_events():
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                folder = self._wds.get(wd)
+                if folder is None:
+                    continue
+                if mask & IN_IGNORED:
+                    self._remove_folder(folder)
+                    continue
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    changed.append(folder)
+                    continue
+
+                path = folder / name
+                changed.append(path)
+                if (mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO)
+                        and folder in (self.specs_dir, self.plans_dir)):
+                    self._add_folder(path)
+
+            if overflow:
+                changed.extend(self._add_missing_folders())
+            self._dispatch(changed, overflow)
+
+    def _run_poll(self):
+        while not self._stop.wait(POLL_INTERVAL):
+            changed = self._add_missing_folders()
+            for folder in list(self._folders):
+                before = self._snapshots.get(folder, {})
+                try:
+                    after = self._scan(folder)
+                except OSError:
+                    changed.append(folder)
+                    self._remove_folder(folder)
+                    continue
+                self._snapshots[folder] = after
+
+                for name in before.keys() | after.keys():
+                    if before.get(name) != after.get(name):
+                        path = folder / name
+                        changed.append(path)
+                        if (name in after and after[name][2] and path not in self._folders
+                                and folder in (self.specs_dir, self.plans_dir)):
+                            self._add_folder(path)
+            self._dispatch(changed, False)
+
+    @staticmethod
+    def _scan(folder: Path) -> Dict[str, Tuple]:
+        """(mtime_ns, size, is_dir) of each entry in a folder"""
+        entries = {}
+        with os.scandir(folder) as scan:
+            for entry in scan:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries[entry.name] = (stat.st_mtime_ns, stat.st_size, entry.is_dir())
+        return entries
+
+    # ------------------------------------------------------------------
+    # Changes
+    # ------------------------------------------------------------------
+
+    def _dispatch(self, changed: List[Path], everything: bool):
+        if not changed and not everything:
+            return
+
+        if everything:
+            for folder in self._folders:
+                filestat.invalidate_tree(folder)
+        for path in changed:
+            filestat.invalidate(path)
+            filestat.invalidate_tree(path)
+
+        try:
+            features = self.on_change(sorted(set(changed)), everything)
+        except Exception as e:
+            print(f"specmap watcher: failed to apply changes: {e}", file=sys.stderr)
+            return
+
+        with self._lock:
+            self.changes += 1
+            self.dirty.update(features)
+            subscribers = list(self._subscribers.items())
+        if features and subscribers:
+            self._notify(features, subscribers)
+
+    def _notify(self, features: Dict[str, Optional[Dict]], subscribers: List):
+        data = {
+            'event': 'specmap.features_changed',
+            'project_path': str(self.project_path),
+            'features': {feature_id: feature_state(row) for feature_id, row in sorted(features.items())}
+        }
+        for key, (session, loop) in subscribers:
+            try:
+                future = asyncio.run_coroutine_threadsafe(
+                    session.send_log_message(level="info", data=data, logger="specmap.watcher"), loop)
+            except RuntimeError:
+                # The session's event loop is gone
+                self._unsubscribe(key)
+                continue
+            future.add_done_callback(
+                lambda done, key=key: done.cancelled() or done.exception() is None or self._unsubscribe(key))
+
+    def _unsubscribe(self, key: int):
+        with self._lock:
+            self._subscribers.pop(key, None)
+
+
+def feature_state(row: Optional[Dict]) -> str:
+    """Workflow state of a feature from its index row, as specmap_status reports it"""
+    if row is None or not (row['spec_dir'] or row['plan_dir']):
+        return "removed"
+    return ("tasks_ready" if row['has_tasks'] else
+            "planned" if row['has_plan'] else
+            "specified" if row['has_spec'] else
+            "unknown")
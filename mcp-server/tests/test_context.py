@@ -0,0 +1,79 @@
+"""
+Tests for the per-project context shared across MCP tool calls
+"""
+
+import os
+import pytest
+from pathlib import Path
+import tempfile
+import shutil
+
+from specmap.init import ProjectInitializer
+from specmap_mcp.context import get_context, drop_context
+
+
+@pytest.fixture
+def project():
+    """Create an initialized SpecMap project"""
+    temp_dir = tempfile.mkdtemp()
+    project_path = Path(temp_dir) / "proj"
+    project_path.mkdir()
+    ProjectInitializer(project_path, "proj", "web-app", "claude").initialize()
+    yield project_path.resolve()
+    drop_context(project_path)
+    shutil.rmtree(temp_dir)
+
+
+def bump_mtime(path: Path):
+    """Move a file's mtime forward so coarse filesystem clocks still see a change"""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+
+class TestProjectContext:
+    """Test ProjectContext registry"""
+
+    def test_context_is_reused(self, project):
+        """Test that one context serves every call for a project"""
+        context = get_context(project)
+        assert get_context(str(project)) is context
+        assert context.config.get('project.name') == "proj"
+
+    def test_generators_share_workflow(self, project):
+        """Test that generators share one loaded WorkflowState"""
+        context = get_context(project)
+        task_generator = context.task_generator
+
+        assert task_generator.plan_generator is context.plan_generator
+        assert context.plan_generator.clarify_processor is context.clarify_processor
+        assert context.spec_creator.workflow is context.workflow
+        assert context.clarify_processor.workflow is context.workflow
+
+    def test_refresh_picks_up_external_edits(self, project):
+        """Test that files changed by another process are reloaded"""
+        context = get_context(project)
+
+        state_file = context.workflow.state_file
+        state_file.write_text('{"current_phase": "planning", "features": {}, "milestones": []}')
+        bump_mtime(state_file)
+
+        config = context.config
+        config.config['project']['name'] = "renamed"
+        config.save()
+        bump_mtime(config.config_file)
+
+        context = get_context(project)
+        assert context.workflow.state['current_phase'] == "planning"
+        assert context.config.get('project.name') == "renamed"
+
+    def test_read_document_tracks_changes(self, project):
+        """Test the in-memory document cache"""
+        context = get_context(project)
+        doc = project / "notes.md"
+        doc.write_text("one")
+
+        assert context.read_document(doc) == "one"
+        doc.write_text("two!")
+        assert context.read_document(doc) == "two!"
+        doc.unlink()
+        assert context.read_document(doc) is None
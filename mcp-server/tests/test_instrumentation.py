@@ -0,0 +1,76 @@
+"""
+Tests for per-call metrics of MCP tools
+"""
+
+import asyncio
+import inspect
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from specmap import metrics
+from specmap_mcp.instrumentation import instrumented
+from specmap_mcp.offload import blocking
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory"""
+    temp_dir = tempfile.mkdtemp()
+    yield Path(temp_dir)
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture(autouse=True)
+def recording():
+    """Record metrics with JSONL dumps during a test"""
+    metrics.reset()
+    metrics.configure(enabled=True, dump=("jsonl",))
+    yield
+    metrics.configure(enabled=False, dump=())
+    metrics.reset()
+
+
+class TestInstrumented:
+    """Test the @instrumented tool decorator"""
+
+    def test_blocking_tool_is_recorded_and_dumped(self, temp_dir):
+        """Test that a lane tool's work, queue time and result land in the project's call log"""
+        (temp_dir / ".specmap").mkdir()
+        (temp_dir / "spec.md").write_text("x" * 4096)
+
+        @instrumented
+        @blocking("query")
+        def specmap_validate(project_path: str = ".", feature_id: str = "") -> dict:
+            time.sleep(0.01)
+            (Path(project_path) / "spec.md").read_text()
+            return {"success": feature_id != "", "message": "done"}
+
+        assert list(inspect.signature(specmap_validate).parameters) == ["project_path", "feature_id"]
+
+        asyncio.run(specmap_validate(str(temp_dir), feature_id="001-login"))
+        asyncio.run(specmap_validate(project_path=str(temp_dir)))
+
+        tool = metrics.snapshot()['tools']['specmap_validate']
+        assert tool['calls'] == 2
+        assert tool['errors'] == 1
+        assert tool['wall_ms'] >= 20
+        assert tool['reads'] >= 2
+        assert tool['bytes_read'] >= 2 * 4096
+
+        records = metrics.load_calls(temp_dir)
+        assert [record['error'] for record in records] == [False, True]
+
+    def test_no_dump_outside_a_project(self, temp_dir):
+        """Test that calls on a folder without .specmap are counted but not written there"""
+        @instrumented
+        async def specmap_init(project_name: str, path: str = ".") -> dict:
+            return {"success": True}
+
+        asyncio.run(specmap_init("demo", path=str(temp_dir)))
+
+        assert metrics.snapshot()['tools']['specmap_init']['calls'] == 1
+        assert not (temp_dir / ".specmap").exists()
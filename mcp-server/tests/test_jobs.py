@@ -0,0 +1,113 @@
+"""
+Tests for background jobs persisted under .specmap/jobs/
+"""
+
+import json
+import threading
+import time
+import pytest
+from pathlib import Path
+import tempfile
+import shutil
+
+from specmap_mcp.jobs import JobManager
+
+
+@pytest.fixture
+def project():
+    """Create a folder with an empty .specmap config directory"""
+    temp_dir = Path(tempfile.mkdtemp())
+    (temp_dir / ".specmap").mkdir()
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+def wait_for(manager, job_id, statuses=("completed", "failed", "cancelled")):
+    """Poll a job until it reaches one of the given statuses"""
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        job = manager.status(job_id)
+        if job['status'] in statuses:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job stuck in {job['status']}")
+
+
+class TestJobManager:
+    """Test JobManager class"""
+
+    def test_job_result_survives_restart(self, project):
+        """Test that progress and results are persisted and readable by a new manager"""
+        def work(name, progress):
+            progress(0, 2, "first")
+            progress(1, 2, "second")
+            return {"success": True, "name": name}
+
+        manager = JobManager(project)
+        job = manager.submit("demo", "workflow", work, name="specmap")
+        assert job['status'] == "queued"
+        assert job['params'] == {"name": "specmap"}
+
+        done = wait_for(manager, job['id'])
+        assert done['result'] == {"success": True, "name": "specmap"}
+        assert done['progress'] == {'done': 2, 'total': 2, 'message': None}
+
+        restarted = JobManager(project)
+        assert restarted.status(job['id']) == done
+        assert [j['id'] for j in restarted.list()] == [job['id']]
+        assert restarted.status("job-missing") is None
+        assert restarted.status("../../etc/passwd") is None
+
+    def test_cancel_running_and_queued_jobs(self, project):
+        """Test that a running job stops at its next progress call and a queued one never starts"""
+        started = threading.Event()
+        release = threading.Event()
+        ran = []
+
+        def slow(progress):
+            started.set()
+            release.wait(5)
+            progress(1, 2, "after release")
+            ran.append("slow")
+
+        def quick(progress):
+            ran.append("quick")
+
+        manager = JobManager(project)
+        running = manager.submit("slow", "backup", slow)
+        started.wait(5)
+        queued = manager.submit("quick", "backup", quick)
+
+        assert manager.cancel(queued['id'])['status'] == "cancelled"
+        assert manager.cancel(running['id'])['status'] == "cancelling"
+        release.set()
+
+        assert wait_for(manager, running['id'])['status'] == "cancelled"
+        assert ran == []
+        assert manager.cancel(running['id'])['status'] == "cancelled"
+
+    def test_failures_are_recorded(self, project):
+        """Test that an exception in a job marks it failed with the error"""
+        def broken(progress):
+            raise RuntimeError("disk full")
+
+        manager = JobManager(project)
+        job = wait_for(manager, manager.submit("broken", "query", broken)['id'])
+        assert job['status'] == "failed"
+        assert job['error'] == "disk full"
+
+    def test_orphaned_jobs_are_interrupted(self, project):
+        """Test that a running job left by a server that exited is reported as interrupted"""
+        jobs_dir = project / ".specmap" / "jobs"
+        jobs_dir.mkdir()
+        record = {
+            'id': "job-20250101-000000-deadbeef", 'kind': "plan", 'status': "running",
+            'params': {}, 'progress': {'done': 0, 'total': 1, 'message': None},
+            'created': "2025-01-01T00:00:00", 'started': None, 'finished': None,
+            'result': None, 'error': None, 'pid': None
+        }
+        (jobs_dir / f"{record['id']}.json").write_text(json.dumps(record))
+
+        job = JobManager(project).status(record['id'])
+        assert job['status'] == "interrupted"
+        assert json.loads((jobs_dir / f"{record['id']}.json").read_text())['status'] == "interrupted"
@@ -0,0 +1,95 @@
+"""
+Tests for running blocking tool work on per-lane thread pools
+"""
+
+import asyncio
+import contextvars
+import inspect
+import threading
+import time
+import pytest
+
+from specmap_mcp.offload import TOOL_LANES, blocking, run_blocking, submit
+
+
+class TestToolLanes:
+    """Test the lane executors behind the MCP tools"""
+
+    def test_queries_answer_while_backup_runs(self):
+        """Test that a busy backup lane neither blocks the loop nor other lanes"""
+        release = threading.Event()
+
+        async def scenario():
+            backup = asyncio.ensure_future(run_blocking("backup", release.wait, 5))
+            await asyncio.sleep(0.05)
+
+            started = time.monotonic()
+            status = await run_blocking("query", lambda: "ok")
+            elapsed = time.monotonic() - started
+            assert not backup.done()
+
+            release.set()
+            assert await backup
+            return status, elapsed
+
+        status, elapsed = asyncio.run(scenario())
+        assert status == "ok"
+        assert elapsed < 1
+
+    def test_lane_limits_concurrency(self):
+        """Test that a lane never runs more calls at once than its limit"""
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def work():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+
+        async def scenario(lane, calls):
+            await asyncio.gather(*(run_blocking(lane, work) for _ in range(calls)))
+
+        for lane in ("backup", "query"):
+            peak[0] = 0
+            asyncio.run(scenario(lane, TOOL_LANES[lane] * 2))
+            assert peak[0] == TOOL_LANES[lane]
+
+    def test_blocking_keeps_tool_signature(self):
+        """Test that decorated tools stay introspectable and raise normally"""
+        @blocking("query")
+        def tool(project_path: str, detailed: bool = False) -> dict:
+            """Tool docstring"""
+            if detailed:
+                raise ValueError("detailed")
+            return {"path": project_path}
+
+        assert inspect.iscoroutinefunction(tool)
+        assert tool.__name__ == "tool"
+        assert tool.__doc__ == "Tool docstring"
+        assert list(inspect.signature(tool).parameters) == ["project_path", "detailed"]
+        assert asyncio.run(tool("p")) == {"path": "p"}
+        with pytest.raises(ValueError):
+            asyncio.run(tool("p", detailed=True))
+        with pytest.raises(ValueError):
+            blocking("missing")
+
+    def test_calls_keep_context_variables(self):
+        """Test that lane calls and background jobs see the caller's context"""
+        current = contextvars.ContextVar("current", default=None)
+
+        async def scenario():
+            current.set("tool")
+            return await run_blocking("query", current.get)
+
+        assert asyncio.run(scenario()) == "tool"
+
+        token = current.set("job")
+        try:
+            future = submit("backup", current.get)
+        finally:
+            current.reset(token)
+        assert future.result(timeout=5) == "job"
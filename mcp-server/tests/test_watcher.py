@@ -0,0 +1,123 @@
+"""
+Tests for the file watcher that invalidates cached project state
+"""
+
+import subprocess
+import sys
+import time
+import pytest
+from pathlib import Path
+import tempfile
+import shutil
+
+from specmap import filestat
+from specmap.init import ProjectInitializer
+from specmap_mcp import watcher as watcher_module
+from specmap_mcp.context import get_context, drop_context
+
+
+@pytest.fixture
+def project():
+    """Create an initialized SpecMap project with one specified feature"""
+    temp_dir = tempfile.mkdtemp()
+    project_path = Path(temp_dir) / "proj"
+    project_path.mkdir()
+    ProjectInitializer(project_path, "proj", "web-app", "claude").initialize()
+    feature_dir = project_path / "01-specifications" / "features" / "001-login"
+    feature_dir.mkdir(parents=True)
+    (feature_dir / "spec.md").write_text("# Login\n\nFirst draft\n")
+    yield project_path.resolve()
+    drop_context(project_path)
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def fast_polling(monkeypatch):
+    """Poll every 50ms instead of every few seconds"""
+    monkeypatch.setattr(watcher_module, "POLL_INTERVAL", 0.05)
+
+
+def write_externally(path: Path, text: str):
+    """Write a file from another process, so only the watcher can notice"""
+    subprocess.run(
+        [sys.executable, "-c",
+         "import os, sys; os.makedirs(os.path.dirname(sys.argv[1]), exist_ok=True); "
+         "open(sys.argv[1], 'w').write(sys.argv[2])",
+         str(path), text],
+        check=True
+    )
+
+
+def wait_for(predicate, timeout: float = 5.0):
+    """Wait until predicate() holds"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "watcher did not report the change"
+        time.sleep(0.02)
+
+
+class TestProjectWatcher:
+    """Test watcher backends and cache invalidation"""
+
+    @pytest.mark.skipif(not watcher_module.inotify_available(), reason="inotify not available")
+    def test_inotify_invalidates_external_edit(self, project):
+        """Test that an edit from another process is seen through inotify"""
+        context = get_context(project)
+        watcher = context.start_watcher("inotify")
+        spec_file = project / "01-specifications" / "features" / "001-login" / "spec.md"
+
+        assert filestat.is_watched(spec_file.parent)
+        assert context.read_document(spec_file) == "# Login\n\nFirst draft\n"
+        # Unchanged files are answered from memory
+        assert filestat.stat(spec_file) is filestat.stat(spec_file)
+
+        write_externally(spec_file, "# Login\n\nSecond draft, longer\n")
+        wait_for(lambda: "001-login" in watcher.dirty)
+
+        assert context.read_document(spec_file) == "# Login\n\nSecond draft, longer\n"
+        assert watcher.drain()["001-login"]["has_spec"]
+        assert watcher.drain() == {}
+
+    def test_polling_indexes_new_feature(self, project, fast_polling):
+        """Test that a feature folder created by another process is watched and indexed"""
+        context = get_context(project)
+        watcher = context.start_watcher("poll")
+        assert watcher.backend == "poll"
+        assert context.index.get_feature("002-search") is None
+
+        spec_file = project / "01-specifications" / "features" / "002-search" / "spec.md"
+        write_externally(spec_file, "# Search\n")
+        wait_for(lambda: "002-search" in watcher.dirty)
+
+        assert context.index.get_feature("002-search")["has_spec"]
+        assert filestat.is_watched(spec_file.parent)
+        assert context.read_document(spec_file) == "# Search\n"
+
+    def test_own_writes_invalidate_at_once(self, project):
+        """Test that writes by this process are seen without waiting for the watcher"""
+        context = get_context(project)
+        context.start_watcher("poll")
+        spec_file = project / "01-specifications" / "features" / "001-login" / "spec.md"
+        assert context.read_document(spec_file) == "# Login\n\nFirst draft\n"
+
+        spec_file.write_text("# Login\n\nEdited in process\n")
+        assert context.read_document(spec_file) == "# Login\n\nEdited in process\n"
+
+        spec_file.unlink()
+        assert context.read_document(spec_file) is None
+
+    def test_stop_unwatches(self, project):
+        """Test that stopping the watcher stops trusting memoized stats"""
+        context = get_context(project)
+        context.start_watcher("poll")
+        folder = project / "01-specifications" / "features" / "001-login"
+        assert filestat.is_watched(folder)
+
+        context.start_watcher("off")
+        assert context.watcher is None
+        assert not filestat.is_watched(folder)
+
+    def test_unknown_mode(self, project):
+        """Test that watch modes are validated"""
+        with pytest.raises(ValueError):
+            get_context(project).start_watcher("fsevents")
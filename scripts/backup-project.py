@@ -2,6 +2,10 @@
 """
 Create a full project backup
 Backs up all critical project files and folders
+
+Usage:
+  python backup-project.py                 Create today's (incremental) backup
+  python backup-project.py --verify [date] Check a backup against its manifest
 """
 
 import sys
@@ -19,6 +23,10 @@ def main():
     # Get project root
     project_root = Path(__file__).parent.parent
 
+    if len(sys.argv) > 1 and sys.argv[1] == "--verify":
+        verify(SessionManager(project_root), sys.argv[2] if len(sys.argv) > 2 else None)
+        return
+
     print("Creating daily project backup...")
     print()
 
@@ -34,7 +42,10 @@ def main():
         print(f" Backup Date: {result['backup_date']}")
         print(f" Backup Location: {result['backup_path']}")
         print(f" Items Backed Up: {result['items_backed_up']}")
+        print(f" Files Copied: {result['files_copied']} (unchanged files linked: {result['files_linked']})")
         print(f" Manifest: {result['manifest']}")
+        for rel in result['skipped_links']:
+            print(f"  [SKIPPED LINK] {rel}")
         print()
         print("Backed up:")
         print("  - 00-governance/ (constitution, charter)")
@@ -55,5 +66,30 @@ def main():
         sys.exit(1)
 
 
+def verify(session_mgr: SessionManager, backup_date=None):
+    """Check a daily backup against its manifest"""
+    try:
+        result = session_mgr.verify_daily_backup(backup_date)
+    except Exception as e:
+        print(f"[ERROR] Error verifying backup: {e}")
+        sys.exit(1)
+
+    print(f"Verifying backup: {result['backup_path']}")
+    print(f" Files Checked: {result['files_checked']}")
+    for rel in result['missing']:
+        print(f"  [MISSING] {rel}")
+    for rel in result['mismatched']:
+        print(f"  [CHANGED] {rel}")
+    for rel in result['skipped_links']:
+        print(f"  [SKIPPED LINK] {rel} (not in the backup)")
+    print()
+
+    if result['verified']:
+        print("[OK] Backup matches its manifest")
+    else:
+        print("[ERROR] Backup does not match its manifest")
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     main()
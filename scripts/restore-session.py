@@ -13,6 +13,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from specmap.sessions import SessionManager
+from specmap.snapshots import SnapshotStore
 
 
 def list_session_backups(backups_dir: Path):
@@ -22,9 +23,10 @@ def list_session_backups(backups_dir: Path):
         return []
 
     backups = []
-    for backup_file in sorted(backup_path.glob("*.zip"), reverse=True):
+    backup_files = list(backup_path.glob("*-backup.zip")) + list(backup_path.glob("*-backup.tar.zst"))
+    for backup_file in sorted(backup_files, reverse=True):
         backups.append({
-            'name': backup_file.stem.replace('-backup', ''),
+            'name': backup_file.name.split('-backup.')[0],
             'path': str(backup_file),
             'size': backup_file.stat().st_size
         })
@@ -47,13 +49,19 @@ def list_checkpoints(session_mgr: SessionManager, session_id: str):
         return []
 
     checkpoints = []
-    for checkpoint_dir in sorted(snapshots_dir.iterdir()):
-        if checkpoint_dir.is_dir():
+    # Folder checkpoints come from versions that copied every file
+    for checkpoint_dir in snapshots_dir.iterdir():
+        if checkpoint_dir.is_dir() and not checkpoint_dir.name.startswith('.'):
             checkpoints.append({
                 'id': checkpoint_dir.name,
                 'path': str(checkpoint_dir)
             })
-    return checkpoints
+    for checkpoint_id in SnapshotStore(snapshots_dir).checkpoint_ids():
+        checkpoints.append({
+            'id': checkpoint_id,
+            'path': str(snapshots_dir / f"{checkpoint_id}.json")
+        })
+    return sorted(checkpoints, key=lambda checkpoint: checkpoint['id'])
 
 
 def restore_from_backup(backup_path: str, restore_to: Path):
@@ -64,15 +72,30 @@ def restore_from_backup(backup_path: str, restore_to: Path):
 
     # Extract backup
     restore_to.mkdir(parents=True, exist_ok=True)
-    with zipfile.ZipFile(backup_file, 'r') as zip_ref:
-        zip_ref.extractall(restore_to)
+    if backup_file.name.endswith('.tar.zst'):
+        import tarfile
+        import zstandard
+        with open(backup_file, 'rb') as f:
+            with zstandard.ZstdDecompressor().stream_reader(f) as reader:
+                with tarfile.open(fileobj=reader, mode='r|') as tar_ref:
+                    if hasattr(tarfile, 'data_filter'):
+                        tar_ref.extractall(restore_to, filter='data')
+                    else:
+                        tar_ref.extractall(restore_to)
+    else:
+        with zipfile.ZipFile(backup_file, 'r') as zip_ref:
+            zip_ref.extractall(restore_to)
 
     return restore_to
 
 
 def restore_from_checkpoint(checkpoint_path: str, restore_to: Path):
-    """Restore files from checkpoint"""
+    """Restore files from checkpoint (manifest or legacy folder)"""
     checkpoint_dir = Path(checkpoint_path)
+    if checkpoint_dir.suffix == '.json':
+        SnapshotStore(checkpoint_dir.parent).restore(checkpoint_dir.stem, restore_to)
+        return restore_to
+
     if not checkpoint_dir.exists():
         raise FileNotFoundError(f"Checkpoint not found: {checkpoint_path}")
 
@@ -139,6 +162,8 @@ def main():
 
             session_id = sys.argv[2]
             backup_path = session_mgr.backups_dir / "sessions" / f"{session_id}-backup.zip"
+            if not backup_path.exists():
+                backup_path = backup_path.with_name(f"{session_id}-backup.tar.zst")
 
             if not backup_path.exists():
                 print(f"[ERROR] Backup not found: {backup_path}")
@@ -193,6 +218,8 @@ def main():
                 session_path = session_mgr.archive_dir / session_id
 
             checkpoint_path = session_path / "snapshots" / checkpoint_id
+            if not checkpoint_path.exists():
+                checkpoint_path = session_path / "snapshots" / f"{checkpoint_id}.json"
 
             if not checkpoint_path.exists():
                 print(f"[ERROR] Checkpoint not found: {checkpoint_path}")
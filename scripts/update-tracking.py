@@ -9,6 +9,15 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from specmap.patterns import (
+    CHECKED_ITEM_PATTERN, SUMMARY_COMPLETION_PATTERN, SUMMARY_FOCUS_PATTERN,
+    SUMMARY_LINES_PATTERN, SUMMARY_RULEMAP_SCORE_PATTERN, SUMMARY_STATUS_PATTERN,
+    SUMMARY_TESTS_PATTERN, UPDATE_LOG_PATTERN, summary_section_pattern
+)
+
 
 def parse_session_summary(session_path: Path) -> dict:
     """Parse a session summary and extract key information"""
@@ -21,34 +30,34 @@ def parse_session_summary(session_path: Path) -> dict:
     # Extract key information using regex
     info = {
         'date': session_path.stem,
-        'focus': extract_value(content, r'\*\*Focus\*\*:\s*(.+)'),
-        'status': extract_value(content, r'\*\*Status\*\*:\s*(.+)'),
-        'rulemap_score': extract_value(content, r'Overall RULEMAP Score:\s*\*\*\s*(\d+\.?\d*)/10'),
-        'completion': extract_value(content, r'\*\*Completion\*\*:\s*(\d+)%'),
+        'focus': extract_value(content, SUMMARY_FOCUS_PATTERN),
+        'status': extract_value(content, SUMMARY_STATUS_PATTERN),
+        'rulemap_score': extract_value(content, SUMMARY_RULEMAP_SCORE_PATTERN),
+        'completion': extract_value(content, SUMMARY_COMPLETION_PATTERN),
         'features_delivered': count_checked_items(content, 'Major Features Delivered'),
-        'tests_written': extract_value(content, r'Tests Written:\s*(\d+)'),
-        'lines_of_code': extract_value(content, r'Lines of Code:\s*(\d+\+?)'),
+        'tests_written': extract_value(content, SUMMARY_TESTS_PATTERN),
+        'lines_of_code': extract_value(content, SUMMARY_LINES_PATTERN),
     }
 
     return info
 
 
-def extract_value(content: str, pattern: str) -> str:
-    """Extract a value using regex pattern"""
-    match = re.search(pattern, content)
+def extract_value(content: str, pattern: re.Pattern) -> str:
+    """Extract a value using a precompiled pattern from specmap.patterns"""
+    match = pattern.search(content)
     return match.group(1) if match else 'N/A'
 
 
 def count_checked_items(content: str, section: str) -> int:
     """Count checked items in a section"""
     # Find section
-    section_match = re.search(f'### {section}.*?(?=###|\\Z)', content, re.DOTALL)
+    section_match = summary_section_pattern(section).search(content)
     if not section_match:
         return 0
 
     section_content = section_match.group(0)
     # Count [x] or [X] items
-    return len(re.findall(r'- \[x\]', section_content, re.IGNORECASE))
+    return len(CHECKED_ITEM_PATTERN.findall(section_content))
 
 
 def get_latest_session(project_root: Path) -> Path:
@@ -76,8 +85,7 @@ def update_tracking_file(project_root: Path, session_info: dict):
     content = tracking_path.read_text(encoding='utf-8')
 
     # Find the Update Log section
-    update_log_pattern = r'(## Update Log.*?)(\n## |\\Z)'
-    match = re.search(update_log_pattern, content, re.DOTALL)
+    match = UPDATE_LOG_PATTERN.search(content)
 
     if not match:
         print("WARNING: Update Log section not found in TRACKING.md")
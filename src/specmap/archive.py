@@ -0,0 +1,265 @@
+"""
+Session archives for SpecMap
+Writes zip (or zstd-compressed tar) archives of a folder, compressing members in parallel
+"""
+
+import importlib.util
+import os
+import stat
+import struct
+import time
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+# Formats accepted by SessionManager.end_session(backup_format=...)
+ARCHIVE_SUFFIXES = {
+    'zip': '.zip',
+    'tar.zst': '.tar.zst',
+}
+
+# Already-compressed content is stored as-is instead of being deflated again
+STORED_SUFFIXES = frozenset({
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.zst', '.7z', '.rar', '.jar', '.whl',
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.mp3', '.mp4', '.mov', '.webm',
+    '.docx', '.xlsx', '.pptx', '.odt',
+})
+
+# Same level zipfile (and so shutil.make_archive) uses
+DEFLATE_LEVEL = zlib.Z_DEFAULT_COMPRESSION
+
+# Files larger than this are streamed in chunks of STREAM_CHUNK_SIZE by the
+# writing thread instead of being read whole and compressed on the pool
+STREAM_MEMBER_SIZE = 4 << 20
+STREAM_CHUNK_SIZE = 1 << 20
+
+# Marks a streamed member in write_zip's queue
+STREAMED = object()
+
+# Beyond these the archive needs zip64 records, which write_zip leaves to zipfile
+_ZIP32_LIMIT = 0xFFFFFFFF - (64 << 20)
+_ZIP32_MAX_ENTRIES = 0xFFFF
+
+
+def _walk(source_dir: Path) -> Iterator[Tuple[Path, str]]:
+    """Yield (path, archive name) for every folder and file, parents first, sorted"""
+    for root, dirnames, filenames in os.walk(source_dir):
+        dirnames.sort()
+        root_path = Path(root)
+        for dirname in dirnames:
+            path = root_path / dirname
+            yield path, path.relative_to(source_dir).as_posix() + '/'
+        for filename in sorted(filenames):
+            path = root_path / filename
+            yield path, path.relative_to(source_dir).as_posix()
+
+
+def member_count(source_dir: Path) -> int:
+    """Number of members (folders and files) an archive of source_dir holds"""
+    return sum(1 for _ in _walk(Path(source_dir)))
+
+
+def _compress_member(path: Path) -> Tuple[int, int, int, bytes]:
+    """Read one file and return (crc, size, method, data); runs in a worker thread
+
+    zlib releases the GIL while compressing and checksumming, so threads
+    compress in parallel without pickling file contents to other processes.
+    """
+    raw = path.read_bytes()
+    crc = zlib.crc32(raw)
+    if path.suffix.lower() not in STORED_SUFFIXES:
+        compressor = zlib.compressobj(DEFLATE_LEVEL, zlib.DEFLATED, -15)
+        data = compressor.compress(raw) + compressor.flush()
+        if len(data) < len(raw):
+            return crc, len(raw), zipfile.ZIP_DEFLATED, data
+    return crc, len(raw), zipfile.ZIP_STORED, raw
+
+
+def _dos_datetime(mtime: float) -> Tuple[int, int]:
+    year, month, day, hour, minute, second = time.localtime(mtime)[:6]
+    if year < 1980:
+        year, month, day, hour, minute, second = 1980, 1, 1, 0, 0, 0
+    return (hour << 11 | minute << 5 | second // 2,
+            (year - 1980) << 9 | month << 5 | day)
+
+
+def write_zip(source_dir: Path, dest: Path, workers: Optional[int] = None,
+              progress: Optional[Callable[[int, int, str], None]] = None) -> Path:
+    """
+    Write source_dir's contents to a zip archive at dest
+
+    Files up to STREAM_MEMBER_SIZE are read whole and compressed on a thread
+    pool while the archive is written in order; at most 2 * workers of them
+    are in flight, each held raw and compressed, so they take at most
+    4 * workers * STREAM_MEMBER_SIZE of memory. Larger files are streamed
+    into the archive in STREAM_CHUNK_SIZE chunks by the writing thread.
+    Archives that would need zip64 records fall back to zipfile.
+    progress(done, total, name) is called before each member is queued.
+    """
+    source_dir = Path(source_dir)
+    members = list(_walk(source_dir))
+    sizes = [0 if name.endswith('/') else path.stat().st_size for path, name in members]
+    if sum(sizes) > _ZIP32_LIMIT or len(members) >= _ZIP32_MAX_ENTRIES:
+        return _write_zip64(source_dir, members, dest, progress)
+
+    workers = workers or os.cpu_count() or 1
+    central: List[bytes] = []
+
+    with open(dest, 'wb') as out, ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+
+        def write_header(name: bytes, info: os.stat_result, method: int, crc: int,
+                         compressed: int, size: int) -> Tuple[int, int, int]:
+            dostime, dosdate = _dos_datetime(info.st_mtime)
+            offset = out.tell()
+            # Flag 0x800: names are UTF-8
+            out.write(struct.pack('<IHHHHHIIIHH', 0x04034b50, 20, 0x800, method,
+                                  dostime, dosdate, crc, compressed, size, len(name), 0))
+            out.write(name)
+            return offset, dostime, dosdate
+
+        def add_central(name: bytes, info: os.stat_result, method: int, crc: int, compressed: int,
+                        size: int, offset: int, dostime: int, dosdate: int, is_dir: bool):
+            if is_dir:
+                external = (stat.S_IFDIR | 0o755) << 16 | 0x10
+            else:
+                external = (stat.S_IFMT(info.st_mode) | stat.S_IMODE(info.st_mode)) << 16
+            central.append(struct.pack('<IHHHHHHIIIHHHHHII', 0x02014b50, 3 << 8 | 20, 20,
+                                       0x800, method, dostime, dosdate, crc, compressed, size,
+                                       len(name), 0, 0, 0, 0, external, offset) + name)
+
+        def write_member(path: Path, name: str, result):
+            info = path.stat()
+            encoded = name.encode('utf-8')
+            if result is None:
+                crc, size, method, data = 0, 0, zipfile.ZIP_STORED, b''
+            else:
+                crc, size, method, data = result
+            offset, dostime, dosdate = write_header(encoded, info, method, crc, len(data), size)
+            out.write(data)
+            add_central(encoded, info, method, crc, len(data), size, offset, dostime, dosdate,
+                        is_dir=result is None)
+
+        def stream_member(path: Path, name: str):
+            """Copy a large file in chunks, then fill in its header's CRC and sizes"""
+            info = path.stat()
+            encoded = name.encode('utf-8')
+            stored = path.suffix.lower() in STORED_SUFFIXES
+            method = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+            compressor = None if stored else zlib.compressobj(DEFLATE_LEVEL, zlib.DEFLATED, -15)
+            offset, dostime, dosdate = write_header(encoded, info, method, 0, 0, 0)
+
+            crc = size = compressed = 0
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(STREAM_CHUNK_SIZE), b''):
+                    crc = zlib.crc32(chunk, crc)
+                    size += len(chunk)
+                    data = compressor.compress(chunk) if compressor else chunk
+                    out.write(data)
+                    compressed += len(data)
+            if compressor:
+                data = compressor.flush()
+                out.write(data)
+                compressed += len(data)
+
+            end = out.tell()
+            out.seek(offset + 14)
+            out.write(struct.pack('<III', crc, compressed, size))
+            out.seek(end)
+            add_central(encoded, info, method, crc, compressed, size, offset, dostime, dosdate,
+                        is_dir=False)
+
+        def write_next():
+            member_path, member_name, future = pending.popleft()
+            if future is STREAMED:
+                stream_member(member_path, member_name)
+            else:
+                write_member(member_path, member_name, future.result() if future else None)
+
+        for done, ((path, name), size) in enumerate(zip(members, sizes)):
+            if progress:
+                progress(done, len(members), name)
+            if name.endswith('/'):
+                pending.append((path, name, None))
+            elif size > STREAM_MEMBER_SIZE:
+                pending.append((path, name, STREAMED))
+            else:
+                pending.append((path, name, pool.submit(_compress_member, path)))
+            while len(pending) > workers * 2:
+                write_next()
+        while pending:
+            write_next()
+
+        directory_offset = out.tell()
+        for record in central:
+            out.write(record)
+        out.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, len(central), len(central),
+                              out.tell() - directory_offset, directory_offset, 0))
+    return dest
+
+
+def _write_zip64(source_dir: Path, members: List[Tuple[Path, str]], dest: Path,
+                 progress: Optional[Callable[[int, int, str], None]] = None) -> Path:
+    with zipfile.ZipFile(dest, 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+        for done, (path, name) in enumerate(members):
+            if progress:
+                progress(done, len(members), name)
+            compress_type = (zipfile.ZIP_STORED if path.suffix.lower() in STORED_SUFFIXES
+                             else zipfile.ZIP_DEFLATED)
+            archive.write(path, name, compress_type=compress_type)
+    return dest
+
+
+def write_tar_zst(source_dir: Path, dest: Path, workers: Optional[int] = None,
+                  progress: Optional[Callable[[int, int, str], None]] = None) -> Path:
+    """Write source_dir's contents to a zstd-compressed tar stream (needs `zstandard`)"""
+    import tarfile
+    import zstandard
+
+    # zstd splits the stream into jobs and compresses them on its own threads
+    compressor = zstandard.ZstdCompressor(level=3, threads=workers or -1)
+    members = list(_walk(Path(source_dir)))
+    with open(dest, 'wb') as out:
+        with compressor.stream_writer(out, closefd=False) as writer:
+            with tarfile.open(fileobj=writer, mode='w|') as archive:
+                for done, (path, name) in enumerate(members):
+                    if progress:
+                        progress(done, len(members), name)
+                    archive.add(path, arcname=name.rstrip('/'), recursive=False)
+    return dest
+
+
+def check_format(archive_format: str):
+    """Raise before any work is done if an archive format cannot be written"""
+    if archive_format not in ARCHIVE_SUFFIXES:
+        raise ValueError(f"Unknown archive format: {archive_format}")
+    if archive_format == 'tar.zst' and importlib.util.find_spec('zstandard') is None:
+        raise RuntimeError("tar.zst archives need the zstandard package: pip install zstandard")
+
+
+def create_archive(source_dir: Path, base_path: Path, archive_format: str = 'zip',
+                   workers: Optional[int] = None,
+                   progress: Optional[Callable[[int, int, str], None]] = None) -> Path:
+    """
+    Archive source_dir to base_path plus the format's suffix
+
+    The archive is written under a .partial name and renamed when complete,
+    so its final path only ever holds a finished archive. progress, if
+    given, is called as progress(done, total, name) before each member; an
+    exception it raises aborts the archive and removes the partial file.
+    """
+    check_format(archive_format)
+
+    dest = Path(f"{base_path}{ARCHIVE_SUFFIXES[archive_format]}")
+    partial = dest.with_name(dest.name + '.partial')
+    writer = write_zip if archive_format == 'zip' else write_tar_zst
+    try:
+        writer(source_dir, partial, workers, progress)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    os.replace(partial, dest)
+    return dest
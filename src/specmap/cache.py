@@ -0,0 +1,127 @@
+"""
+On-disk caches for SpecMap
+Stores derived data (parsed specifications, scores) keyed by source file content
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from . import filestat, metrics
+from .config import get_config_dir
+
+
+def content_digest(data: bytes) -> str:
+    """Return the content hash used to key cache entries"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class FileCache:
+    """JSON cache of values derived from a single source file
+
+    Entries are keyed by the SHA-256 of the source content plus a version
+    string, so they are invalidated automatically when either the file or the
+    code producing the value changes. The file's mtime and size are stored as
+    well so that unchanged files are validated with a single stat call.
+    """
+
+    def __init__(self, cache_dir: Path, version: str):
+        self.cache_dir = Path(cache_dir)
+        self.version = str(version)
+
+    @classmethod
+    def for_project(cls, project_path: Path, name: str, version: str) -> 'FileCache':
+        """Create a cache stored under .specmap/cache/<name>"""
+        return cls(get_config_dir(project_path) / "cache" / name, version)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _read_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get('version') != self.version:
+            return None
+        return entry
+
+    def _write_entry(self, key: str, entry: Dict[str, Any]):
+        entry_path = self._entry_path(key)
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = entry_path.with_name(
+                f"{entry_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            )
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, entry_path)
+        except OSError:
+            # The cache is an optimisation only; a read-only project still works
+            pass
+
+    def get(self, key: str, source: Path) -> Optional[Any]:
+        """Return the cached value for source, or None if missing or stale"""
+        value = self._lookup(key, source)
+        metrics.record_cache(self.cache_dir.name, value is not None)
+        return value
+
+    def _lookup(self, key: str, source: Path) -> Optional[Any]:
+        entry = self._read_entry(key)
+        if entry is None:
+            return None
+
+        try:
+            stat = filestat.stat(source)
+        except OSError:
+            return None
+
+        if entry.get('mtime_ns') == stat.st_mtime_ns and entry.get('size') == stat.st_size:
+            return entry['value']
+
+        # Timestamp changed (touch, checkout, copy) - fall back to the content hash
+        try:
+            content = Path(source).read_text()
+        except (OSError, ValueError):
+            return None
+
+        if content_digest(content.encode('utf-8')) != entry.get('digest'):
+            return None
+
+        entry['mtime_ns'] = stat.st_mtime_ns
+        entry['size'] = stat.st_size
+        self._write_entry(key, entry)
+        return entry['value']
+
+    def put(self, key: str, source: Path, content: str, value: Any, stat: Optional[os.stat_result] = None):
+        """Store value derived from content, the text read from source
+
+        Pass the stat taken before reading source so that a concurrent edit
+        can never be recorded against the older content.
+        """
+        if stat is None:
+            try:
+                stat = Path(source).stat()
+            except OSError:
+                return
+
+        self._write_entry(key, {
+            'version': self.version,
+            'digest': content_digest(content.encode('utf-8')),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'value': value
+        })
+
+    def invalidate(self, key: str):
+        """Drop the cached entry for key"""
+        try:
+            self._entry_path(key).unlink()
+        except OSError:
+            pass
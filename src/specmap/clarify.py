@@ -3,123 +3,240 @@ SpecMap Clarify Command Implementation
 Interactive clarification process for resolving open questions
 """
 
-import re
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 
+from . import filestat, metrics
 from .config import WorkflowState
+from .index import FeatureIndex
+from .cache import FileCache
+from .patterns import (
+    CHECKBOX_QUESTION_PATTERN, CLARIFICATION_PATTERN, PLACEHOLDER_PATTERN, QUESTION_MARKERS
+)
+
+# Bump whenever the scoring rules change so persisted scores are recomputed
+SCORE_VERSION = "1"
+
+# Below one question marker per this many lines, _candidate_lines seeks from
+# marker to marker instead of splitting every line
+SPARSE_MARKER_LINES = 8
 
 
 class ClarificationProcessor:
     """Handles interactive clarification of feature specifications"""
 
-    def __init__(self, project_path: Path):
+    def __init__(self, project_path: Path, workflow: Optional[WorkflowState] = None):
         self.project_path = Path(project_path)
-        self.workflow = WorkflowState(project_path)
-        self.workflow.load()
 
-    def get_available_features(self) -> List[str]:
-        """Get list of available features for clarification"""
-        features_dir = self.project_path / "01-specifications" / "features"
-        if not features_dir.exists():
-            return []
+        # Callers holding a loaded WorkflowState (e.g. the MCP server) can share it
+        if workflow is None:
+            workflow = WorkflowState(project_path)
+            workflow.load()
+        self.workflow = workflow
+        self.index = FeatureIndex(self.project_path)
 
-        features = []
-        for item in features_dir.iterdir():
-            if item.is_dir() and re.match(r'^\d{3}-', item.name):
-                spec_file = item / "spec.md"
-                if spec_file.exists():
-                    features.append(item.name)
+        # One score (with its per-section breakdown) per spec revision, in .specmap/cache/scores
+        self.score_cache = FileCache.for_project(self.project_path, "scores", SCORE_VERSION)
 
-        return sorted(features)
+        # path -> (mtime_ns, size, questions) for find_open_questions
+        self._question_cache: Dict[Path, Tuple[int, int, List[Dict]]] = {}
+
+        # feature_id -> (mtime_ns, size, meets_threshold) of each spec's last score
+        self._approvals: Dict[str, Tuple[int, int, bool]] = {}
+
+    def get_available_features(self) -> List[str]:
+        """Get list of available features for clarification"""
+        return self.index.features_with_specs()
+
+    def meets_threshold(self, feature_id: str) -> bool:
+        """Check whether one feature's specification meets the RULEMAP threshold
+
+        Costs a stat while the spec is unchanged and at most one (usually
+        persisted) score otherwise, however many other features exist.
+        """
+        spec_file = self.project_path / "01-specifications" / "features" / feature_id / "spec.md"
+        try:
+            stat = filestat.stat(spec_file)
+        except OSError:
+            self._approvals.pop(feature_id, None)
+            return False
+
+        cached = self._approvals.get(feature_id)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+        meets = bool(self.calculate_rulemap_score(feature_id).get('meets_threshold', False))
+        self._approvals[feature_id] = (stat.st_mtime_ns, stat.st_size, meets)
+        return meets
+
+    def approved_features(self) -> List[str]:
+        """Numbered features whose specification meets the RULEMAP threshold
+
+        Built lazily from meets_threshold, so only specs edited since the
+        last call are scored again.
+        """
+        return [feature_id for feature_id in self.index.features_with_specs()
+                if self.meets_threshold(feature_id)]
+
+    def forget(self, feature_id: Optional[str] = None):
+        """Drop the in-memory questions and approval of a feature (or of all features)"""
+        if feature_id is None:
+            self._approvals.clear()
+            self._question_cache.clear()
+            return
+        self._approvals.pop(feature_id, None)
+        feature_path = self.project_path / "01-specifications" / "features" / feature_id
+        for source_file in ("spec.md", "clarifications.md"):
+            self._question_cache.pop(feature_path / source_file, None)
 
     def find_open_questions(self, feature_id: str) -> List[Dict[str, str]]:
         """Extract open questions from specification and clarifications files"""
 
         feature_path = self.project_path / "01-specifications" / "features" / feature_id
 
-        # Question patterns to search for
-        question_patterns = [
-            r'\[NEEDS CLARIFICATION:\s*([^\]]+)\]',  # [NEEDS CLARIFICATION: ...]
-            r'-\s*\[\s*\]\s*\*\*(\d{3}-Q-\d{3})\*\*:\s*([^\n]+)',  # Checkbox questions
-            r'-\s*(\d{3}-Q-\d{3}):\s*([^\n]+)',  # Simple question IDs
-            r'\?\s*$',  # Lines ending with ?
-        ]
-
         questions = []
+        for source_file in ("spec.md", "clarifications.md"):
+            questions.extend(self._questions_in_file(feature_path / source_file, source_file))
 
-        # Check specification file
-        spec_file = feature_path / "spec.md"
-        if spec_file.exists():
-            content = spec_file.read_text()
-            questions.extend(self._extract_questions_from_content(content, "spec.md", question_patterns))
+        return questions
 
-        # Check clarifications file
-        clarifications_file = feature_path / "clarifications.md"
-        if clarifications_file.exists():
-            content = clarifications_file.read_text()
-            questions.extend(self._extract_questions_from_content(content, "clarifications.md", question_patterns))
+    def _questions_in_file(self, path: Path, source_file: str) -> List[Dict[str, str]]:
+        """Scan one file for questions, reusing the last result while the file is unchanged"""
+        try:
+            stat = filestat.stat(path)
+        except OSError:
+            self._question_cache.pop(path, None)
+            return []
 
-        return questions
+        cached = self._question_cache.get(path)
+        hit = cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size
+        metrics.record_cache("questions", hit)
+        if not hit:
+            content = path.read_text()
+            with metrics.timer("ClarificationProcessor.iter_questions"):
+                questions = list(self.iter_questions(content, source_file))
+            cached = (stat.st_mtime_ns, stat.st_size, questions)
+            self._question_cache[path] = cached
 
-    def _extract_questions_from_content(self, content: str, source_file: str, patterns: List[str]) -> List[Dict[str, str]]:
+        return [dict(question) for question in cached[2]]
+
+    def _extract_questions_from_content(self, content: str, source_file: str) -> List[Dict[str, str]]:
         """Extract questions from content using various patterns"""
-        questions = []
-        lines = content.split('\n')
-
-        for i, line in enumerate(lines):
-            # Check for NEEDS CLARIFICATION markers
-            if 'NEEDS CLARIFICATION' in line:
-                match = re.search(r'\[NEEDS CLARIFICATION:\s*([^\]]+)\]', line)
-                if match:
-                    questions.append({
-                        'id': f"auto-{len(questions)+1:03d}",
-                        'question': match.group(1).strip(),
-                        'source': source_file,
-                        'line': i + 1,
-                        'context': line.strip(),
-                        'type': 'clarification_needed'
-                    })
-
-            # Check for checkbox questions (unchecked)
-            if '- [ ]' in line and any(marker in line for marker in ['Q-', 'question', '?']):
-                # Extract question ID and text
-                question_match = re.search(r'\*\*(\d{3}-Q-\d{3})\*\*:\s*([^\n]+)', line)
-                if question_match:
-                    questions.append({
-                        'id': question_match.group(1),
-                        'question': question_match.group(2).strip(),
-                        'source': source_file,
-                        'line': i + 1,
-                        'context': line.strip(),
-                        'type': 'outstanding_question'
-                    })
-                else:
-                    # Generic unchecked question
-                    question_text = line.replace('- [ ]', '').strip()
-                    if question_text:
-                        questions.append({
-                            'id': f"auto-{len(questions)+1:03d}",
-                            'question': question_text,
-                            'source': source_file,
-                            'line': i + 1,
-                            'context': line.strip(),
-                            'type': 'unchecked_item'
-                        })
-
-            # Check for lines ending with question marks
-            if line.strip().endswith('?') and len(line.strip()) > 5:
-                questions.append({
-                    'id': f"auto-{len(questions)+1:03d}",
-                    'question': line.strip(),
+        return list(self.iter_questions(content, source_file))
+
+    def iter_questions(self, content: str, source_file: str) -> Iterator[Dict]:
+        """Stream questions from content in one pass over the buffer
+
+        Only candidate lines, those holding a marker substring, are
+        classified; see _candidate_lines for how they are found. Each
+        question carries its 1-based line number and the UTF-8 byte offset
+        of that line.
+        """
+        is_ascii = content.isascii()
+        count = 0
+        byte_offset = 0
+        counted = 0  # characters already converted to byte_offset
+
+        for line_number, line_start, line in self._candidate_lines(content):
+            if is_ascii:
+                byte_offset = line_start
+            else:
+                byte_offset += len(content[counted:line_start].encode('utf-8'))
+                counted = line_start
+
+            for question_id, text, question_type in self._classify_line(line, count):
+                count += 1
+                yield {
+                    'id': question_id,
+                    'question': text,
                     'source': source_file,
-                    'line': i + 1,
+                    'line': line_number,
                     'context': line.strip(),
-                    'type': 'question_line'
-                })
+                    'type': question_type,
+                    'offset': byte_offset
+                }
 
-        return questions
+    def _candidate_lines(self, content: str) -> Iterator[Tuple[int, int, str]]:
+        """(line number, character offset, line) of each line holding a question marker
+
+        Markers are counted first (one C-level pass each). Where they are
+        sparse, str.find jumps from marker to marker and only the lines
+        around them are sliced out, so the text between is never split or
+        copied. Where they are dense, splitting every line and testing each
+        with substring checks is cheaper than a seek per marker.
+        """
+        markers = sum(content.count(marker) for marker in QUESTION_MARKERS)
+        if markers * SPARSE_MARKER_LINES >= content.count('\n') + 1:
+            line_start = 0
+            for line_number, line in enumerate(content.split('\n'), 1):
+                if 'NEEDS CLARIFICATION' in line or '- [ ]' in line or '?' in line:
+                    yield line_number, line_start, line
+                line_start += len(line) + 1
+            return
+
+        find = content.find
+        end_of_text = len(content)
+
+        def next_marker(marker: str, position: int) -> int:
+            found = find(marker, position)
+            return end_of_text if found < 0 else found
+
+        clarification, checkbox, question_mark = (next_marker(marker, 0) for marker in QUESTION_MARKERS)
+        line_number = 1
+        line_start = 0
+
+        while True:
+            hit = min(clarification, checkbox, question_mark)
+            if hit >= end_of_text:
+                return
+            start = content.rfind('\n', line_start, hit) + 1 or line_start
+            line_number += content.count('\n', line_start, start)
+            line_start = start
+            end = find('\n', hit)
+            if end < 0:
+                end = end_of_text
+            yield line_number, start, content[start:end]
+
+            position = end + 1
+            if clarification < position:
+                clarification = next_marker(QUESTION_MARKERS[0], position)
+            if checkbox < position:
+                checkbox = next_marker(QUESTION_MARKERS[1], position)
+            if question_mark < position:
+                question_mark = next_marker(QUESTION_MARKERS[2], position)
+
+    def _classify_line(self, line: str, count: int) -> List[Tuple[str, str, str]]:
+        """(id, question, type) for each question on a candidate line
+
+        count is the number of questions found before this line.
+        """
+        found = []
+
+        # Check for NEEDS CLARIFICATION markers
+        if 'NEEDS CLARIFICATION' in line:
+            match = CLARIFICATION_PATTERN.search(line)
+            if match:
+                found.append((f"auto-{count + 1:03d}", match.group(1).strip(), 'clarification_needed'))
+
+        # Check for checkbox questions (unchecked)
+        if '- [ ]' in line and ('Q-' in line or 'question' in line or '?' in line):
+            # Extract question ID and text
+            question_match = CHECKBOX_QUESTION_PATTERN.search(line)
+            if question_match:
+                found.append((question_match.group(1), question_match.group(2).strip(), 'outstanding_question'))
+            else:
+                # Generic unchecked question
+                question_text = line.replace('- [ ]', '').strip()
+                if question_text:
+                    found.append((f"auto-{count + len(found) + 1:03d}", question_text, 'unchecked_item'))
+
+        # Check for lines ending with question marks
+        stripped = line.strip()
+        if stripped.endswith('?') and len(stripped) > 5:
+            found.append((f"auto-{count + len(found) + 1:03d}", stripped, 'question_line'))
+
+        return found
 
     def get_feature_status(self, feature_id: str) -> Dict:
         """Get current status of a feature"""
@@ -243,7 +360,7 @@ class ClarificationProcessor:
                     if any(placeholder in line.lower() for placeholder in ['to be determined', 'to be clarified']):
                         old_line = line
                         # Replace the placeholder with the answer
-                        new_line = re.sub(r'\[.*?(to be determined|to be clarified).*?\]', answer, line, flags=re.IGNORECASE)
+                        new_line = PLACEHOLDER_PATTERN.sub(answer, line)
                         if new_line != old_line:
                             content = content.replace(old_line, new_line)
                             updates_made.append(f"Updated: {old_line.strip()}")
@@ -252,10 +369,11 @@ class ClarificationProcessor:
         spec_file.write_text(content, encoding='utf-8')
 
         # Update workflow status
-        feature_data = self.workflow.get_feature(feature_id) or {}
-        feature_data['last_clarification'] = datetime.now().isoformat()
-        feature_data['clarifications_count'] = feature_data.get('clarifications_count', 0) + len(clarifications)
-        self.workflow.add_feature(feature_id, feature_data)
+        def record_clarifications(feature_data: Dict):
+            feature_data['last_clarification'] = datetime.now().isoformat()
+            feature_data['clarifications_count'] = feature_data.get('clarifications_count', 0) + len(clarifications)
+
+        self.workflow.modify_feature(feature_id, record_clarifications)
 
         return {
             'updates_made': updates_made,
@@ -269,10 +387,31 @@ class ClarificationProcessor:
         feature_path = self.project_path / "01-specifications" / "features" / feature_id
         spec_file = feature_path / "spec.md"
 
-        if not spec_file.exists():
+        if not filestat.exists(spec_file):
             return {'score': 0.0, 'error': 'Specification file not found'}
 
-        content = spec_file.read_text().lower()
+        cached = self.score_cache.get(feature_id, spec_file)
+        if cached is not None:
+            return cached
+
+        spec_stat = spec_file.stat()
+        spec_content = spec_file.read_text()
+        score_result = self._score_specification(spec_content)
+        self.score_cache.put(feature_id, spec_file, spec_content, score_result, stat=spec_stat)
+
+        return score_result
+
+    def score_all(self) -> Dict[str, Dict]:
+        """Score every specification, recomputing only those changed since the last run"""
+        return {
+            feature_id: self.calculate_rulemap_score(feature_id)
+            for feature_id in self.index.features_with_specs()
+        }
+
+    @metrics.timed
+    def _score_specification(self, spec_content: str) -> Dict:
+        """Score specification text against the RULEMAP sections"""
+        content = spec_content.lower()
 
         # Check for RULEMAP section completeness
         rulemap_sections = {
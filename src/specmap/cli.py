@@ -4,21 +4,28 @@ Unified Spec-Kit + RULEMAP-PRD system
 """
 
 import click
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
 from pathlib import Path
 from datetime import datetime
 import sys
 import os
 
-from .config import SpecMapConfig, WorkflowState
-from .structure import ProjectStructure, sanitize_name
-from .init import ProjectInitializer
-from .agents import AgentManager
-from .skills import SkillManager
+# rich, yaml and the workflow modules are imported inside the commands that
+# use them, so `--help`, `--version` and shell completion start fast.
 
-console = Console()
+
+class _LazyConsole:
+    """Creates the rich Console on first use"""
+
+    _console = None
+
+    def __getattr__(self, name):
+        if self._console is None:
+            from rich.console import Console
+            type(self)._console = Console()
+        return getattr(self._console, name)
+
+
+console = _LazyConsole()
 
 # Supported AI agents
 SUPPORTED_AGENTS = [
@@ -56,6 +63,10 @@ def main():
 def init(project_name, project_type, agent, path, here, force):
     """Initialize a new SpecMap project with unified structure."""
 
+    from rich.panel import Panel
+    from .structure import sanitize_name
+    from .init import ProjectInitializer
+
     console.print(Panel.fit(
         "[bold cyan]SpecMap Initialization[/bold cyan]\n"
         "Creating unified Spec-Kit + RULEMAP-PRD project",
@@ -162,6 +173,7 @@ def charter(complete):
 def specify(description, feature_id):
     """Create RULEMAP-enhanced specification."""
 
+    from rich.panel import Panel
     from .specify import SpecificationCreator
 
     console.print(Panel.fit(
@@ -221,6 +233,8 @@ def specify(description, feature_id):
 def clarify(feature_id, interactive, auto):
     """Run systematic clarification process (Spec-Kit methodology)."""
 
+    from rich.panel import Panel
+
     # Auto flag overrides interactive
     if auto:
         interactive = False
@@ -378,6 +392,7 @@ def clarify(feature_id, interactive, auto):
 def plan(feature_id, force):
     """Generate agent-driven implementation plan."""
 
+    from rich.panel import Panel
     from .plan import PlanGenerator
 
     console.print(Panel.fit(
@@ -488,9 +503,15 @@ def plan(feature_id, force):
 @click.argument('feature_id', required=False)
 @click.option('--force', is_flag=True, help='Force task generation even if already exists')
 @click.option('--detailed', is_flag=True, help='Show detailed task breakdown')
-def tasks(feature_id, force, detailed):
+@click.option('--workers', type=click.IntRange(min=1), help='Simulate the tasks on this many developers or agents')
+# Same names as taskgraph.PRIORITY_RULES, which is not imported at startup
+@click.option('--priority', default='longest_path', show_default=True,
+              type=click.Choice(['longest_path', 'least_slack', 'shortest_first', 'task_order']),
+              help='Which ready task a free worker starts next (with --workers)')
+def tasks(feature_id, force, detailed, workers, priority):
     """Generate RULEMAP agent task breakdown."""
 
+    from rich.panel import Panel
     from .tasks import TaskGenerator
 
     console.print(Panel.fit(
@@ -526,6 +547,11 @@ def tasks(feature_id, force, detailed):
         feature_path = generator.structure.get_feature_path(feature_id)['plan']
         tasks_file = feature_path / "tasks.md"
 
+        if tasks_file.exists() and not force and workers:
+            # Simulating does not rewrite tasks.md
+            _print_schedule(generator.simulate_schedule(feature_id, workers, priority))
+            return
+
         if tasks_file.exists() and not force:
             console.print(f"[yellow]Tasks already exist for [cyan]{feature_id}[/cyan][/yellow]")
             console.print(f"[dim]Use --force flag to regenerate[/dim]")
@@ -566,7 +592,12 @@ def tasks(feature_id, force, detailed):
         # Display parallel execution info
         console.print(f"\n[bold]Execution Info:[/bold]")
         console.print(f"|| [cyan]Parallel Groups:[/cyan] {result['parallel_groups']}")
-        console.print(f">> [cyan]Max Parallelism:[/cyan] Up to {min(result['parallel_groups'], 4)} tasks simultaneously")
+        console.print(f">> [cyan]Max Parallelism:[/cyan] Up to {result['max_parallelism']} tasks simultaneously")
+        console.print(f"-> [cyan]Critical Path:[/cyan] {len(result['critical_path'])} tasks ({' -> '.join(result['critical_path'])})")
+
+        if workers:
+            console.print()
+            _print_schedule(generator.simulate_schedule(feature_id, workers, priority))
 
         # Display detailed breakdown if requested
         if detailed:
@@ -611,6 +642,64 @@ def tasks(feature_id, force, detailed):
         sys.exit(1)
 
 
+def _print_schedule(schedule: dict):
+    """Print a simulated schedule: makespan, utilization and worker timelines"""
+    from rich.table import Table
+
+    console.print(f"[bold]Schedule with {schedule['workers']} workers[/bold] [dim]({schedule['priority']})[/dim]")
+    console.print(f"@ [cyan]Makespan:[/cyan] {schedule['makespan']:g} hours "
+                  f"(~{schedule['estimated_duration']} days)")
+    console.print(f"-> [cyan]Critical Path:[/cyan] {schedule['critical_path_length']:g} hours "
+                  f"| [cyan]Total Work:[/cyan] {schedule['total_work']:g} hours")
+    console.print(f"% [cyan]Utilization:[/cyan] {schedule['utilization']:.0%}\n")
+
+    table = Table(title="Worker Timelines (hours)")
+    for column in ("Worker", "Busy", "Tasks"):
+        table.add_column(column, justify="left" if column == "Tasks" else "right")
+    for worker, (timeline, utilization) in enumerate(zip(schedule['timelines'], schedule['worker_utilization']), 1):
+        tasks_text = ", ".join(f"{item['id']} ({item['start']:g}-{item['finish']:g})" for item in timeline)
+        table.add_row(str(worker), f"{utilization:.0%}", tasks_text or "-")
+    console.print(table)
+
+
+@main.command()
+@click.argument('feature_id', required=False)
+@click.option('--samples', type=click.IntRange(min=100), default=20_000, show_default=True,
+              help='Number of Monte Carlo samples')
+# Same names as forecast.DISTRIBUTIONS, which is not imported at startup
+@click.option('--distribution', type=click.Choice(['pert', 'triangular']), default='pert', show_default=True,
+              help='Distribution drawn from each task\'s three-point estimate')
+@click.option('--seed', type=int, help='Seed for a reproducible forecast')
+@click.option('--json', 'as_json', is_flag=True, help='Print the forecast as JSON')
+def forecast(feature_id, samples, distribution, seed, as_json):
+    """Forecast completion percentiles of a feature's tasks (default: all features)."""
+
+    import json
+    from .tasks import TaskGenerator
+
+    try:
+        generator = TaskGenerator(Path.cwd())
+        result = generator.forecast_completion(
+            [feature_id] if feature_id else None, samples, distribution, seed
+        )
+    except (ValueError, RuntimeError) as e:
+        console.print(f"[red]Error:[/red] {str(e)}", style="bold")
+        sys.exit(1)
+
+    if as_json:
+        click.echo(json.dumps(result, indent=2))
+        return
+
+    scope = feature_id or f"{len(result['feature_ids'])} features"
+    console.print(f"[bold cyan]Completion Forecast[/bold cyan] [dim]({scope}, {result['total_tasks']} tasks, "
+                  f"{result['samples']:,} {result['distribution']} samples)[/dim]\n")
+    console.print(f"@ [cyan]Likely Estimates:[/cyan] {result['likely_hours']:.1f} hours")
+    for name, hours in result['percentiles'].items():
+        console.print(f"  [cyan]{name.upper()}:[/cyan] {hours:.1f} hours (~{result['percentile_days'][name]} days)")
+    console.print(f"\n[dim]Mean {result['mean']:.1f}h, range {result['min']:.1f}-{result['max']:.1f}h; "
+                  f"features run side by side with unlimited workers[/dim]")
+
+
 @main.command()
 def implement():
     """Begin agent-guided implementation."""
@@ -633,6 +722,8 @@ def agent():
 def agent_activate(agent_type):
     """Activate a RULEMAP specialized agent."""
 
+    from .agents import AgentManager
+
     project_path = Path.cwd()
     manager = AgentManager(project_path)
 
@@ -648,6 +739,9 @@ def agent_activate(agent_type):
 def agent_status():
     """View all agent assignments and status."""
 
+    from rich.table import Table
+    from .agents import AgentManager
+
     project_path = Path.cwd()
     manager = AgentManager(project_path)
 
@@ -698,6 +792,9 @@ def score(score_type):
 def status(detailed):
     """Show project progress overview."""
 
+    from rich.panel import Panel
+    from .config import SpecMapConfig, WorkflowState
+
     project_path = Path.cwd()
 
     try:
@@ -729,6 +826,75 @@ def status(detailed):
         console.print(f"[red]Error:[/red] {str(e)}")
 
 
+@main.command()
+@click.option('--tool', help='Only calls of this tool')
+@click.option('--last', type=int, help='Only the last N calls')
+@click.option('--json', 'as_json', is_flag=True, help='Print the summary as JSON')
+@click.option('--clear', is_flag=True, help='Delete the recorded calls')
+def stats(tool, last, as_json, clear):
+    """Show MCP tool timings recorded in .specmap/metrics/."""
+
+    import json
+    from rich.table import Table
+    from . import metrics
+
+    project_path = Path.cwd()
+    folder = metrics.metrics_dir(project_path)
+
+    if clear:
+        for name in ("calls.jsonl", "calls.jsonl.1", "metrics.prom"):
+            (folder / name).unlink(missing_ok=True)
+        console.print("[green]Metrics cleared[/green]")
+        return
+
+    records = metrics.load_calls(project_path)
+    if tool:
+        records = [record for record in records if record['tool'] == tool]
+    if last:
+        records = records[-last:]
+
+    if not records:
+        console.print("[yellow]No tool calls recorded.[/yellow]")
+        console.print("[dim]Start the MCP server with SPECMAP_METRICS=jsonl to record them.[/dim]")
+        return
+
+    summary = metrics.summarize(records)
+    if as_json:
+        click.echo(json.dumps(summary, indent=2))
+        return
+
+    console.print(f"[bold cyan]SpecMap Tool Metrics[/bold cyan] "
+                  f"[dim]({len(records)} calls since {records[0]['time']})[/dim]\n")
+
+    table = Table(title="Tools (times in ms)")
+    for column in ("Tool", "Calls", "Err", "Total", "Mean", "Max", "Queued", "Reads", "KB read", "Writes"):
+        table.add_column(column, justify="left" if column == "Tool" else "right")
+    for name, row in summary['tools'].items():
+        table.add_row(
+            name, str(row['calls']), str(row['errors']), f"{row['wall_ms']:.1f}",
+            f"{row['mean_wall_ms']:.1f}", f"{row['max_wall_ms']:.1f}", f"{row['queued_ms']:.1f}",
+            str(row['reads']), f"{row['bytes_read'] / 1024:.0f}", str(row['writes'])
+        )
+    console.print(table)
+
+    if summary['extractors']:
+        table = Table(title="Extractors")
+        for column in ("Extractor", "Calls", "Total ms", "Mean ms"):
+            table.add_column(column, justify="left" if column == "Extractor" else "right")
+        for name, row in summary['extractors'].items():
+            table.add_row(name, str(row['calls']), f"{row['total_ms']:.1f}", f"{row['mean_ms']:.2f}")
+        console.print(table)
+
+    if summary['caches']:
+        table = Table(title="Caches")
+        for column in ("Cache", "Hits", "Misses", "Hit rate"):
+            table.add_column(column, justify="left" if column == "Cache" else "right")
+        for name, row in summary['caches'].items():
+            rate = "-" if row['hit_rate'] is None else f"{row['hit_rate']:.0%}"
+            table.add_row(name, str(row['hits']), str(row['misses']), rate)
+        console.print(table)
+
+
 @main.command()
 def sync():
     """Update all agent contexts and configurations."""
@@ -789,6 +955,10 @@ def skill():
 @skill.command('list')
 def skill_list():
     """List all installed Claude Code skills."""
+
+    from rich.panel import Panel
+    from .skills import SkillManager
+
     project_path = Path.cwd()
     manager = SkillManager(project_path)
 
@@ -820,6 +990,10 @@ def skill_list():
 @skill.command('templates')
 def skill_templates():
     """Show available skill templates."""
+
+    from rich.panel import Panel
+    from .skills import SkillManager
+
     manager = SkillManager()
 
     try:
@@ -846,6 +1020,9 @@ def skill_templates():
 @click.argument('template_name')
 def skill_install(template_name):
     """Install a specific skill template."""
+
+    from .skills import SkillManager
+
     project_path = Path.cwd()
     manager = SkillManager(project_path)
 
@@ -869,6 +1046,9 @@ def skill_install(template_name):
 @skill.command('install-all')
 def skill_install_all():
     """Install all SpecMap skill templates."""
+
+    from .skills import SkillManager
+
     project_path = Path.cwd()
     manager = SkillManager(project_path)
 
@@ -903,6 +1083,9 @@ def skill_install_all():
 @click.option('--content', '-c', help='Skill content (or use stdin)')
 def skill_create(name, description, content):
     """Create a custom Claude Code skill."""
+
+    from .skills import SkillManager
+
     project_path = Path.cwd()
     manager = SkillManager(project_path)
 
@@ -939,6 +1122,9 @@ def skill_create(name, description, content):
 @click.option('--force', '-f', is_flag=True, help='Skip confirmation')
 def skill_delete(skill_name, force):
     """Delete a Claude Code skill."""
+
+    from .skills import SkillManager
+
     project_path = Path.cwd()
     manager = SkillManager(project_path)
 
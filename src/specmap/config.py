@@ -3,11 +3,32 @@ Configuration management for SpecMap
 AI-powered specification-driven development system
 """
 
-import yaml
+import copy
+import json
+import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
 from datetime import datetime
 
+from . import filestat
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def get_config_dir(project_path: Path) -> Path:
+    """Resolve the project configuration folder (new or legacy name)"""
+    new_config_dir = Path(project_path) / ".specmap"
+    legacy_config_dir = Path(project_path) / ".speckit-rulemap"
+
+    if not new_config_dir.exists() and legacy_config_dir.exists():
+        return legacy_config_dir
+    return new_config_dir
+
 
 class SpecMapConfig:
     """Manages unified configuration for SpecMap projects"""
@@ -78,6 +99,8 @@ class SpecMapConfig:
     def load(self) -> Dict[str, Any]:
         """Load configuration from file"""
         if self.config_file.exists():
+            import yaml  # deferred: most commands only need WorkflowState
+
             with open(self.config_file, 'r') as f:
                 loaded_config = yaml.safe_load(f)
                 # Migrate old config format to new if needed
@@ -107,6 +130,7 @@ class SpecMapConfig:
 
     def save(self):
         """Save configuration to file"""
+        import yaml
         self.config_file.parent.mkdir(parents=True, exist_ok=True)
         with open(self.config_file, 'w') as f:
             yaml.dump(self.config, f, default_flow_style=False, indent=2)
@@ -149,8 +173,50 @@ class SpecMapConfig:
         self.save()
 
 
+# Journal value meaning "remove this path"
+DELETED = object()
+
+
+class WorkflowConflict(Exception):
+    """Another writer changed the same feature fields since they were read"""
+
+    def __init__(self, feature_id: str, keys: List[str], read_revision: int, revision: int):
+        self.feature_id = feature_id
+        self.keys = keys
+        self.read_revision = read_revision
+        self.revision = revision
+        super().__init__(
+            f"Feature {feature_id} changed since revision {read_revision} "
+            f"(now {revision}): {', '.join(keys)}"
+        )
+
+
 class WorkflowState:
-    """Manages workflow state tracking"""
+    """Manages workflow state tracking
+
+    State lives in a snapshot (workflow-state.json) plus an append-only journal
+    of deltas (workflow-state.journal.jsonl), so a mutation costs one small
+    appended line instead of re-serializing every feature. The journal's first
+    line names the snapshot revision it extends; entries carry increasing
+    revisions and are replayed on load. save() compacts the journal into a new
+    snapshot using atomic renames.
+
+    Several processes may share one project. Writers hold an exclusive lock on
+    workflow-state.lock only while appending: each first merges entries other
+    processes committed since its last read, then appends its own delta with
+    the next revision. Readers take a shared lock, so they never observe a
+    half-finished compaction.
+
+    Feature updates are journaled per field (['features', id, key]).
+    modify_feature() does its read-modify-write under the lock, so writers
+    changing different fields of one feature merge. add_feature() replaces
+    the whole record; after a get_feature() it is a compare-and-swap against
+    the record read and raises WorkflowConflict, writing nothing, when
+    another writer changed it in between.
+    """
+
+    # Fold the journal into the snapshot once it holds this many entries
+    JOURNAL_COMPACT_ENTRIES = 256
 
     def __init__(self, project_path: Path):
         self.project_path = project_path
@@ -166,6 +232,14 @@ class WorkflowState:
             config_dir = new_config_dir  # Default to new
 
         self.state_file = config_dir / "workflow-state.json"
+        self.journal_file = config_dir / "workflow-state.journal.jsonl"
+        self.lock_file = config_dir / "workflow-state.lock"
+        self.revision = 0
+        self._journal_base: Optional[int] = None  # snapshot revision the on-disk journal extends
+        self._journal_entries = 0
+        self._journal_offset = 0  # bytes of the journal already applied
+        self._stamp: Optional[Tuple] = None
+        self._reads: Dict[str, Tuple[int, Dict]] = {}  # feature_id -> (revision, values read)
         self.state = {
             'current_phase': 'initialization',
             'active_agent': None,
@@ -175,36 +249,314 @@ class WorkflowState:
         }
 
     def load(self):
-        """Load workflow state"""
+        """Load workflow state (snapshot plus journal replay)"""
         if self.state_file.exists():
-            import json
+            with self._locked(exclusive=False):
+                self._load()
+        return self.state
+
+    def _load(self):
+        try:
             with open(self.state_file, 'r') as f:
                 self.state = json.load(f)
-        return self.state
+        except FileNotFoundError:
+            return
+        self.revision = self.state.pop('_revision', 0)
+        self._replay_journal()
+        self._stamp = self._stat_stamp()
+
+    def _replay_journal(self):
+        """Apply journal entries written on top of the loaded snapshot"""
+        self._journal_base = None
+        self._journal_entries = 0
+        self._journal_offset = 0
+        try:
+            with open(self.journal_file, 'rb') as f:
+                header_line = f.readline()
+                try:
+                    header = json.loads(header_line)
+                except ValueError:
+                    return
+                if header.get('base') != self.revision:
+                    # Left over from before the last compaction
+                    return
+
+                self._journal_base = self.revision
+                self._journal_offset = len(header_line)
+                self._replay_from(f)
+        except OSError:
+            return
+
+    def _replay_from(self, f):
+        """Apply complete journal lines from the current position of f"""
+        for line in f:
+            if not line.endswith(b'\n'):
+                # Torn final line from an interrupted append
+                break
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            self._apply(entry)
+            self._journal_entries += 1
+            self._journal_offset += len(line)
+
+    def _apply(self, entry: Dict):
+        """Apply one journal entry to the in-memory state"""
+        target = self.state
+        path = entry['path']
+        for key in path[:-1]:
+            target = target.setdefault(key, {})
+        if entry.get('deleted'):
+            target.pop(path[-1], None)
+        else:
+            target[path[-1]] = entry['value']
+        self.state['last_updated'] = entry['at']
+        self.revision = entry['rev']
+
+    def _sync(self):
+        """Merge in changes other processes committed since our last read
+
+        Must be called with the lock held. When only the journal grew, just the
+        new entries are replayed; a replaced snapshot or journal means another
+        process compacted, and the state is reloaded.
+        """
+        stamp = self._stat_stamp()
+        if stamp == self._stamp:
+            return
+        if (self._stamp is None or self._journal_base is None
+                or stamp[:3] != self._stamp[:3] or stamp[3] != self._stamp[3]):
+            self._load()
+            return
+
+        try:
+            with open(self.journal_file, 'rb') as f:
+                header = json.loads(f.readline())
+                if header.get('base') != self._journal_base:
+                    raise ValueError('journal was replaced')
+                f.seek(self._journal_offset)
+                self._replay_from(f)
+        except (OSError, ValueError):
+            self._load()
+            return
+        self._stamp = stamp
+
+    def _record(self, path: List[str], value: Any):
+        """Apply a delta in memory and append it to the journal"""
+        with self._locked(exclusive=True):
+            self._sync()
+            self._append([(path, value)])
+
+    def _append(self, changes: List[Tuple[List[str], Any]]):
+        """Apply deltas in memory and append them to the journal in one write
+
+        Must be called with the exclusive lock held and the state synced, so
+        entries are numbered after every revision on disk: concurrent writers
+        never reuse a revision and never drop each other's deltas. Deltas
+        replace (or, for DELETED, remove) a single path, so merging is plain
+        replay. Pass DELETED as the value to remove a path.
+        """
+        at = datetime.now().isoformat()
+        entries = []
+        for path, value in changes:
+            entry = {'rev': self.revision + 1, 'path': path, 'at': at}
+            if value is DELETED:
+                entry['deleted'] = True
+            else:
+                entry['value'] = value
+            self._apply(entry)
+            entries.append(entry)
+
+        torn = self._stamp is not None and self._stamp[5] not in (None, self._journal_offset)
+        if (self._journal_base is None or torn
+                or self._journal_entries + len(entries) > self.JOURNAL_COMPACT_ENTRIES):
+            # Never append behind a torn line: replay would stop before our entries
+            self._save()
+            return
+
+        data = b''.join((json.dumps(entry) + '\n').encode('utf-8') for entry in entries)
+        with open(self.journal_file, 'ab') as f:
+            f.write(data)
+        self._journal_entries += len(entries)
+        self._journal_offset += len(data)
+        self._stamp = self._stat_stamp()
+
+    def refresh(self) -> bool:
+        """Pick up changes made on disk since the last load/save; returns True if any"""
+        stamp = self._stat_stamp()
+        if stamp[0] is None or stamp == self._stamp:
+            return False
+        with self._locked(exclusive=False):
+            self._sync()
+        return True
+
+    def _stat_stamp(self) -> Tuple:
+        """(inode, mtime, size) of the snapshot followed by the same for the journal"""
+        stamp = []
+        for path in (self.state_file, self.journal_file):
+            try:
+                stat = filestat.stat(path)
+                stamp.extend([stat.st_ino, stat.st_mtime_ns, stat.st_size])
+            except OSError:
+                stamp.extend([None, None, None])
+        return tuple(stamp)
+
+    @contextmanager
+    def _locked(self, exclusive: bool):
+        """Hold the cross-process workflow lock for the duration of the block"""
+        self.lock_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_file, 'a+b') as f:
+            _lock_file(f, exclusive)
+            try:
+                yield
+            finally:
+                _unlock_file(f)
 
     def save(self):
-        """Save workflow state"""
-        import json
+        """Save workflow state as a new snapshot and start an empty journal"""
+        with self._locked(exclusive=True):
+            # Keep deltas other processes appended since our last read
+            self._sync()
+            self._save()
+
+    def _save(self):
         self.state['last_updated'] = datetime.now().isoformat()
+        self.revision += 1
         self.state_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.state_file, 'w') as f:
-            json.dump(self.state, f, indent=2)
+
+        snapshot = dict(self.state)
+        snapshot['_revision'] = self.revision
+        _write_atomic(self.state_file, json.dumps(snapshot, indent=2))
+
+        # A crash before this rename leaves a journal for an older base, which load() ignores
+        header_line = json.dumps({'base': self.revision}) + '\n'
+        _write_atomic(self.journal_file, header_line)
+        self._journal_base = self.revision
+        self._journal_entries = 0
+        self._journal_offset = len(header_line.encode('utf-8'))
+        self._stamp = self._stat_stamp()
 
     def update_phase(self, phase: str):
         """Update current workflow phase"""
-        self.state['current_phase'] = phase
-        self.save()
+        self._record(['current_phase'], phase)
 
     def activate_agent(self, agent_type: str):
         """Activate an agent"""
-        self.state['active_agent'] = agent_type
-        self.save()
+        self._record(['active_agent'], agent_type)
 
-    def add_feature(self, feature_id: str, feature_data: Dict):
-        """Add or update feature tracking"""
-        self.state['features'][feature_id] = feature_data
-        self.save()
+    def add_feature(self, feature_id: str, feature_data: Dict) -> List[str]:
+        """Add or replace feature tracking
+
+        The feature's record becomes feature_data: fields it lacks are
+        removed. Only the fields that differ are journaled. After a
+        get_feature() of the same feature this is a compare-and-swap: if
+        another writer changed the record since, nothing is written. Use
+        modify_feature() to change single fields and keep everything else.
+
+        Returns:
+            List of fields written or removed
+
+        Raises:
+            WorkflowConflict: the record changed since get_feature(); the
+                state is re-read, so get_feature() returns the new record
+        """
+        read = self._reads.pop(feature_id, None)
+        with self._locked(exclusive=True):
+            self._sync()
+            current = self.state['features'].get(feature_id)
+
+            if read is not None and current != read[1]:
+                read_revision, base = read
+                base, now = base or {}, current or {}
+                conflicts = [key for key in dict.fromkeys([*base, *now])
+                             if base.get(key, DELETED) != now.get(key, DELETED)]
+                raise WorkflowConflict(feature_id, conflicts, read_revision, self.revision)
+
+            if current is None:
+                self._append([(['features', feature_id], copy.deepcopy(feature_data))])
+                return list(feature_data)
+
+            changed = [key for key, value in feature_data.items()
+                       if key not in current or current[key] != value]
+            removed = [key for key in current if key not in feature_data]
+            changes = [(['features', feature_id, key], copy.deepcopy(feature_data[key])) for key in changed]
+            changes += [(['features', feature_id, key], DELETED) for key in removed]
+            if changes:
+                self._append(changes)
+            return changed + removed
+
+    def modify_feature(self, feature_id: str, update: Union[Dict, Callable[[Dict], None]]) -> Dict:
+        """Read, change and write one feature atomically under the workflow lock
+
+        Use this for updates that depend on the current values (counters,
+        appends): no other writer can commit in between, so nothing is lost.
+
+        Args:
+            feature_id: Feature to update (created if missing)
+            update: Fields to set, or a function that edits the feature's dict
+
+        Returns:
+            The feature's fields after the update
+        """
+        with self._locked(exclusive=True):
+            self._sync()
+            base = self.state['features'].get(feature_id)
+            feature_data = copy.deepcopy(base) if base is not None else {}
+            if callable(update):
+                update(feature_data)
+            else:
+                feature_data.update(update)
+
+            if base is None:
+                changes = [(['features', feature_id], feature_data)]
+            else:
+                changes = [(['features', feature_id, key], value) for key, value in feature_data.items()
+                           if key not in base or base[key] != value]
+                changes += [(['features', feature_id, key], DELETED) for key in base if key not in feature_data]
+            if changes:
+                self._append(copy.deepcopy(changes))
+            return copy.deepcopy(feature_data)
 
     def get_feature(self, feature_id: str) -> Optional[Dict]:
-        """Get feature tracking data"""
-        return self.state['features'].get(feature_id)
\ No newline at end of file
+        """Get a copy of a feature's tracking data
+
+        Editing the returned dict does not change the state (unlike before
+        the journal, when the live record was returned); write it back with
+        add_feature(), or use modify_feature(). The record read is
+        remembered, so that add_feature() detects writes by other processes
+        in between, including a feature created after a None result.
+        """
+        feature_data = self.state['features'].get(feature_id)
+        self._reads[feature_id] = (self.revision, copy.deepcopy(feature_data))
+        return copy.deepcopy(feature_data)
+
+
+def _lock_file(f, exclusive: bool):
+    """Block until an advisory lock on the open file f is acquired"""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        return
+    # msvcrt has no shared locks; lock the first byte exclusively, retrying past its timeout
+    f.seek(0)
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue
+
+
+def _unlock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _write_atomic(path: Path, content: str):
+    """Write a file via a temporary sibling and rename it into place"""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
@@ -0,0 +1,150 @@
+"""
+Stat cache for SpecMap
+Memoized file stats for folders whose changes a watcher reports
+
+Readers validate their caches by a file's mtime and size, which costs a stat
+per call. While a watcher (the MCP server's specmap_mcp.watcher) observes a
+folder, stat() answers for files directly inside it from memory: the watcher
+calls invalidate() for every change it sees, and files this process writes,
+renames or deletes are invalidated at once through an audit hook. Files in
+any other folder are stat-ed as usual.
+"""
+
+import errno
+import os
+import sys
+import threading
+from typing import Dict, Iterable, Optional
+
+_lock = threading.Lock()
+# Folder -> number of watchers observing it
+_watched: Dict[str, int] = {}
+# Path -> last stat result (None if it did not exist)
+_stats: Dict[str, Optional[os.stat_result]] = {}
+# Bumped by every invalidation, so a stat racing with one is not memoized
+_generation = 0
+_hook_installed = False
+
+# Audit events that change a path; values are the argument positions of paths
+_MUTATING_EVENTS = {
+    'os.rename': (0, 1),
+    'os.remove': (0,),
+    'os.rmdir': (0,),
+    'os.mkdir': (0,),
+    'os.truncate': (0,),
+    'os.utime': (0,),
+    'os.chmod': (0,),
+    'shutil.rmtree': (0,),
+    'shutil.move': (0, 1),
+}
+
+
+def stat(path) -> os.stat_result:
+    """os.stat(path), answered from memory for files in watched folders"""
+    key = os.fspath(path)
+    if not _watched or os.path.dirname(key) not in _watched:
+        return os.stat(key)
+
+    if key in _stats:
+        result = _stats[key]
+        if result is None:
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), key)
+        return result
+
+    generation = _generation
+    try:
+        result = os.stat(key)
+    except FileNotFoundError:
+        result = None
+    with _lock:
+        if generation == _generation and os.path.dirname(key) in _watched:
+            _stats[key] = result
+    if result is None:
+        raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), key)
+    return result
+
+
+def exists(path) -> bool:
+    """Path.exists() through the stat cache"""
+    try:
+        stat(path)
+    except OSError:
+        return False
+    return True
+
+
+def watch(folders: Iterable):
+    """Start trusting the memoized stats of files in folders (called by watchers)"""
+    global _hook_installed
+    with _lock:
+        for folder in folders:
+            key = os.fspath(folder)
+            _watched[key] = _watched.get(key, 0) + 1
+        if not _hook_installed:
+            # Audit hooks cannot be removed, so it is installed on first use only
+            sys.addaudithook(_audit)
+            _hook_installed = True
+
+
+def unwatch(folders: Iterable):
+    """Stop trusting memoized stats for folders and drop them"""
+    global _generation
+    with _lock:
+        _generation += 1
+        for folder in folders:
+            key = os.fspath(folder)
+            count = _watched.get(key, 0) - 1
+            if count > 0:
+                _watched[key] = count
+                continue
+            _watched.pop(key, None)
+            for path in [path for path in _stats if os.path.dirname(path) == key]:
+                del _stats[path]
+
+
+def invalidate(path):
+    """Forget the memoized stat of one path"""
+    global _generation
+    with _lock:
+        _generation += 1
+        _stats.pop(os.fspath(path), None)
+
+
+def invalidate_tree(folder):
+    """Forget the memoized stats of every path under folder"""
+    global _generation
+    prefix = os.path.join(os.fspath(folder), '')
+    with _lock:
+        _generation += 1
+        for path in [path for path in _stats if path.startswith(prefix)]:
+            del _stats[path]
+
+
+def is_watched(folder) -> bool:
+    """Whether stats of files in folder are being memoized"""
+    return os.fspath(folder) in _watched
+
+
+def _audit(event: str, args: tuple):
+    if not _watched:
+        return
+    if event == 'open':
+        path, mode, flags = args
+        if mode is not None:
+            if not any(char in mode for char in 'wax+'):
+                return
+        elif not flags & (os.O_WRONLY | os.O_RDWR | os.O_CREAT | os.O_TRUNC):
+            return
+        paths = (path,)
+    elif event in _MUTATING_EVENTS:
+        paths = [args[index] for index in _MUTATING_EVENTS[event]]
+    else:
+        return
+
+    for path in paths:
+        if isinstance(path, (str, bytes, os.PathLike)):
+            path = os.path.abspath(os.fsdecode(path))
+            if path in _watched:
+                invalidate_tree(path)
+            else:
+                invalidate(path)
@@ -0,0 +1,246 @@
+"""
+Feature index for SpecMap
+Keeps the list of features and their workflow documents in .specmap/index.sqlite
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .config import get_config_dir
+from .patterns import FEATURE_ID_PATTERN
+
+INDEX_SCHEMA_VERSION = "2"
+
+# Folders modified this recently may change again within the filesystem's
+# mtime granularity, so their stamps are not trusted (as in git's racy-clean check)
+RACY_WINDOW_NS = 2_000_000_000
+RACY = 'racy'
+
+
+class FeatureIndex:
+    """SQLite index of features and which of spec.md, plan.md, tasks.md they have
+
+    The writers (specify, plan, tasks) update a feature's row directly. Changes
+    made outside SpecMap are picked up lazily before each query: when the mtime
+    of either features directory differs from the one recorded at the last
+    scan, the index is rebuilt; otherwise each feature folder's own mtime is
+    compared, so documents added or removed inside an existing folder refresh
+    just that feature's row. Each index keeps one SQLite connection.
+    """
+
+    def __init__(self, project_path: Path):
+        self.project_path = Path(project_path)
+        self.specs_dir = self.project_path / "01-specifications" / "features"
+        self.plans_dir = self.project_path / "02-planning" / "features"
+        self.db_path = get_config_dir(self.project_path) / "index.sqlite"
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """The index's connection, opened and migrated on first use"""
+        if self._conn is not None:
+            return self._conn
+
+        # Never creates the config folder: outside a project, callers fall back to a scan
+        conn = sqlite3.connect(str(self.db_path), timeout=10, check_same_thread=False)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            schema = conn.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+            with conn:
+                if schema is None or schema[0] != INDEX_SCHEMA_VERSION:
+                    # Older layouts lack the folder stamps; the next reconcile rebuilds
+                    conn.execute("DROP TABLE IF EXISTS features")
+                    conn.execute("DELETE FROM meta")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS features ("
+                    "feature_id TEXT PRIMARY KEY, numbered INTEGER, spec_dir INTEGER, "
+                    "has_spec INTEGER, plan_dir INTEGER, has_plan INTEGER, has_tasks INTEGER, "
+                    "spec_mtime TEXT, plan_mtime TEXT)"
+                )
+        except sqlite3.Error:
+            conn.close()
+            raise
+        self._conn = conn
+        return conn
+
+    def close(self):
+        """Close the index's connection; the next query reopens it"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _stamp(self, path: Path, now_ns: int) -> str:
+        """A folder's mtime as stored in the index: '' if missing, RACY if too recent"""
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except OSError:
+            return ''
+        return RACY if mtime_ns >= now_ns - RACY_WINDOW_NS else str(mtime_ns)
+
+    def _changed(self, path: Path, recorded: str) -> bool:
+        """Check whether a folder's mtime differs from its recorded stamp"""
+        try:
+            return str(path.stat().st_mtime_ns) != recorded
+        except OSError:
+            return recorded != ''
+
+    def _feature_row(self, feature_id: str) -> Dict:
+        """Stat one feature's folders and documents"""
+        spec_path = self.specs_dir / feature_id
+        plan_path = self.plans_dir / feature_id
+        # Stamps are taken before the documents, so a concurrent change shows as stale
+        now_ns = time.time_ns()
+        spec_mtime = self._stamp(spec_path, now_ns)
+        plan_mtime = self._stamp(plan_path, now_ns)
+        return {
+            'feature_id': feature_id,
+            'numbered': bool(FEATURE_ID_PATTERN.match(feature_id)),
+            'spec_dir': spec_path.is_dir(),
+            'has_spec': (spec_path / "spec.md").exists(),
+            'plan_dir': plan_path.is_dir(),
+            'has_plan': (plan_path / "plan.md").exists(),
+            'has_tasks': (plan_path / "tasks.md").exists(),
+            'spec_mtime': spec_mtime,
+            'plan_mtime': plan_mtime
+        }
+
+    def _scan(self) -> List[Dict]:
+        """Walk both features directories (the slow path the index avoids)"""
+        feature_ids = set()
+        for features_dir in (self.specs_dir, self.plans_dir):
+            if features_dir.exists():
+                feature_ids.update(item.name for item in features_dir.iterdir() if item.is_dir())
+        return [self._feature_row(feature_id) for feature_id in sorted(feature_ids)]
+
+    def _write_rows(self, conn: sqlite3.Connection, rows: List[Dict]):
+        conn.executemany(
+            "INSERT OR REPLACE INTO features VALUES "
+            "(:feature_id, :numbered, :spec_dir, :has_spec, :plan_dir, :has_plan, :has_tasks, "
+            ":spec_mtime, :plan_mtime)",
+            [row for row in rows if row['spec_dir'] or row['plan_dir']]
+        )
+        conn.executemany(
+            "DELETE FROM features WHERE feature_id = ?",
+            [(row['feature_id'],) for row in rows if not (row['spec_dir'] or row['plan_dir'])]
+        )
+
+    def reconcile(self, force: bool = False) -> bool:
+        """Bring the index up to date with the features directories
+
+        Rebuilds everything when either features directory changed (or when
+        forced), and otherwise re-stats only the features whose folders changed.
+
+        Returns:
+            bool: True if any row was rebuilt
+        """
+        with self._lock:
+            conn = self._connection()
+            meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+            if (force
+                    or meta.get('schema') != INDEX_SCHEMA_VERSION
+                    or self._changed(self.specs_dir, meta.get('specs_mtime', RACY))
+                    or self._changed(self.plans_dir, meta.get('plans_mtime', RACY))):
+                # Stamps are taken before the scan, so a concurrent change triggers another rebuild
+                now_ns = time.time_ns()
+                specs_stamp = self._stamp(self.specs_dir, now_ns)
+                plans_stamp = self._stamp(self.plans_dir, now_ns)
+                rows = self._scan()
+                with conn:
+                    conn.execute("DELETE FROM features")
+                    self._write_rows(conn, rows)
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                        [('schema', INDEX_SCHEMA_VERSION),
+                         ('specs_mtime', specs_stamp),
+                         ('plans_mtime', plans_stamp)]
+                    )
+                return True
+
+            stale = [
+                feature_id
+                for feature_id, spec_mtime, plan_mtime in conn.execute(
+                    "SELECT feature_id, spec_mtime, plan_mtime FROM features")
+                if self._changed(self.specs_dir / feature_id, spec_mtime)
+                or self._changed(self.plans_dir / feature_id, plan_mtime)
+            ]
+            if not stale:
+                return False
+            with conn:
+                self._write_rows(conn, [self._feature_row(feature_id) for feature_id in stale])
+            return True
+
+    def update_feature(self, feature_id: str) -> Dict:
+        """Re-stat one feature and store its row; called by the writers"""
+        row = self._feature_row(feature_id)
+        with self._lock:
+            try:
+                conn = self._connection()
+                with conn:
+                    self._write_rows(conn, [row])
+            except (sqlite3.Error, OSError):
+                self._reset()
+        return self._public(row)
+
+    def _reset(self):
+        """Drop a connection that failed so the next call reopens it"""
+        try:
+            self.close()
+        except sqlite3.Error:
+            self._conn = None
+
+    def _query(self, where: str, params: Tuple = (), predicate=None) -> List[Dict]:
+        """Select rows after a lazy reconcile; predicate mirrors where for the fallback"""
+        with self._lock:
+            try:
+                self.reconcile()
+                rows = self._connection().execute(
+                    f"SELECT * FROM features WHERE {where} ORDER BY feature_id", params
+                ).fetchall()
+                return [self._from_db(row) for row in rows]
+            except (sqlite3.Error, OSError):
+                self._reset()
+        # Read-only or corrupt index: answer from the filesystem instead
+        return [self._public(row) for row in self._scan() if predicate(row)]
+
+    def _public(self, row: Dict) -> Dict:
+        """A row without the folder stamps"""
+        return {key: value for key, value in row.items() if not key.endswith('_mtime')}
+
+    def _from_db(self, row: sqlite3.Row) -> Dict:
+        result = self._public(dict(row))
+        for key in ('numbered', 'spec_dir', 'has_spec', 'plan_dir', 'has_plan', 'has_tasks'):
+            result[key] = bool(result[key])
+        return result
+
+    def get_feature(self, feature_id: str) -> Optional[Dict]:
+        """Return the indexed row for one feature, or None"""
+        rows = self._query("feature_id = ?", (feature_id,),
+                           lambda row: row['feature_id'] == feature_id)
+        return rows[0] if rows else None
+
+    def existing_features(self) -> List[str]:
+        """Numbered feature folders under 01-specifications/features"""
+        rows = self._query("numbered AND spec_dir", (),
+                           lambda row: row['numbered'] and row['spec_dir'])
+        return [row['feature_id'] for row in rows]
+
+    def features_with_specs(self) -> List[str]:
+        """Numbered features that have a spec.md"""
+        rows = self._query("numbered AND has_spec", (),
+                           lambda row: row['numbered'] and row['has_spec'])
+        return [row['feature_id'] for row in rows]
+
+    def features_with_plans(self) -> List[str]:
+        """Numbered features that have a plan.md"""
+        rows = self._query("numbered AND has_plan", (),
+                           lambda row: row['numbered'] and row['has_plan'])
+        return [row['feature_id'] for row in rows]
+
+    def feature_status(self) -> List[Dict]:
+        """Every specification folder with its document flags, sorted by ID"""
+        return self._query("spec_dir", (), lambda row: row['spec_dir'])
@@ -464,6 +464,13 @@ Thumbs.db
 # Configuration overrides
 .specmap/local-config.yaml
 .specmap/.env
+.specmap/workflow-state.lock
+.specmap/jobs/
+.specmap/metrics/
+
+# Derived caches (rebuilt automatically)
+.specmap/cache/
+.specmap/index.sqlite
 
 # Backup files
 *.bak
@@ -0,0 +1,406 @@
+"""
+Instrumentation for SpecMap
+Opt-in timing, file I/O and cache counters for the workflow hot paths
+
+Nothing is recorded until metrics are enabled, either with the
+SPECMAP_METRICS environment variable or configure(enabled=True):
+
+    SPECMAP_METRICS=1                   record in memory only
+    SPECMAP_METRICS=jsonl               also append every call to .specmap/metrics/calls.jsonl
+    SPECMAP_METRICS=jsonl,prometheus    ... and keep .specmap/metrics/metrics.prom current
+
+Work is attributed to the tool call (see tool_call()) whose context it runs
+in. File opens are counted with an audit hook, so reads and writes made by
+any code are seen; "bytes read" is the size of each file opened for reading.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from .config import get_config_dir
+
+DUMP_FORMATS = ("jsonl", "prometheus")
+
+# calls.jsonl is rotated to calls.jsonl.1 past this size
+CALL_LOG_MAX_BYTES = 10 * 1024 * 1024
+
+_lock = threading.Lock()
+_settings = {'enabled': False, 'dump': ()}
+_hook_installed = False
+
+
+class CallMetrics:
+    """Counters of one tool call"""
+
+    def __init__(self, tool: str):
+        self.tool = tool
+        self.started = datetime.now()
+        self.wall = 0.0
+        self.queued = 0.0
+        self.error = False
+        self.reads = 0
+        self.bytes_read = 0
+        self.writes = 0
+        # name -> [calls, seconds]
+        self.extractors: Dict[str, List[float]] = {}
+        # name -> [hits, misses]
+        self.caches: Dict[str, List[int]] = {}
+
+    def as_record(self) -> Dict[str, Any]:
+        """JSON form, one line of calls.jsonl"""
+        return {
+            'time': self.started.isoformat(timespec='milliseconds'),
+            'tool': self.tool,
+            'wall_ms': round(self.wall * 1000, 3),
+            'queued_ms': round(self.queued * 1000, 3),
+            'error': self.error,
+            'reads': self.reads,
+            'bytes_read': self.bytes_read,
+            'writes': self.writes,
+            'extractors': {name: [int(calls), round(seconds * 1000, 3)]
+                           for name, (calls, seconds) in self.extractors.items()},
+            'caches': {name: list(counts) for name, counts in self.caches.items()}
+        }
+
+
+class MetricsSummary:
+    """Totals over many calls, per tool, extractor and cache"""
+
+    def __init__(self):
+        self.tools: Dict[str, Dict[str, float]] = {}
+        self.extractors: Dict[str, List[float]] = {}
+        self.caches: Dict[str, List[int]] = {}
+
+    def add(self, record: Dict[str, Any]):
+        """Add one call record (CallMetrics.as_record() or a calls.jsonl line)"""
+        tool = self.tools.setdefault(record['tool'], {
+            'calls': 0, 'errors': 0, 'wall_ms': 0.0, 'max_wall_ms': 0.0, 'queued_ms': 0.0,
+            'reads': 0, 'bytes_read': 0, 'writes': 0
+        })
+        tool['calls'] += 1
+        tool['errors'] += int(bool(record.get('error')))
+        tool['wall_ms'] += record['wall_ms']
+        tool['max_wall_ms'] = max(tool['max_wall_ms'], record['wall_ms'])
+        for key in ('queued_ms', 'reads', 'bytes_read', 'writes'):
+            tool[key] += record.get(key, 0)
+        self.add_extractors(record.get('extractors', {}), milliseconds=True)
+        self.add_caches(record.get('caches', {}))
+
+    def add_extractors(self, extractors: Dict[str, Sequence[float]], milliseconds: bool = False):
+        scale = 1000 if milliseconds else 1
+        for name, (calls, seconds) in extractors.items():
+            totals = self.extractors.setdefault(name, [0, 0.0])
+            totals[0] += calls
+            totals[1] += seconds / scale
+
+    def add_caches(self, caches: Dict[str, Sequence[int]]):
+        for name, (hits, misses) in caches.items():
+            totals = self.caches.setdefault(name, [0, 0])
+            totals[0] += hits
+            totals[1] += misses
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Tools sorted by total time, extractors by total time, caches with hit rates"""
+        tools = {}
+        for name, tool in sorted(self.tools.items(), key=lambda item: -item[1]['wall_ms']):
+            tools[name] = dict(tool, wall_ms=round(tool['wall_ms'], 3),
+                               mean_wall_ms=round(tool['wall_ms'] / tool['calls'], 3),
+                               queued_ms=round(tool['queued_ms'], 3))
+        extractors = {
+            name: {'calls': int(calls), 'total_ms': round(seconds * 1000, 3),
+                   'mean_ms': round(seconds * 1000 / calls, 3) if calls else 0.0}
+            for name, (calls, seconds) in sorted(self.extractors.items(), key=lambda item: -item[1][1])
+        }
+        caches = {
+            name: {'hits': hits, 'misses': misses,
+                   'hit_rate': round(hits / (hits + misses), 3) if hits + misses else None}
+            for name, (hits, misses) in sorted(self.caches.items())
+        }
+        return {'tools': tools, 'extractors': extractors, 'caches': caches}
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (e.g. for node_exporter's textfile collector)"""
+        lines = []
+
+        def family(name: str, kind: str, help_text: str, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for label, value, number in samples:
+                lines.append(f'{name}{{{label}="{_escape_label(value)}"}} {number:g}')
+
+        tools = self.tools.items()
+        family("specmap_tool_calls_total", "counter", "Tool calls",
+               [("tool", name, tool['calls']) for name, tool in tools])
+        family("specmap_tool_errors_total", "counter", "Tool calls that raised",
+               [("tool", name, tool['errors']) for name, tool in tools])
+        family("specmap_tool_seconds_total", "counter", "Wall time of tool calls",
+               [("tool", name, tool['wall_ms'] / 1000) for name, tool in tools])
+        family("specmap_tool_max_seconds", "gauge", "Slowest tool call",
+               [("tool", name, tool['max_wall_ms'] / 1000) for name, tool in tools])
+        family("specmap_tool_queued_seconds_total", "counter", "Time tool calls waited for a lane",
+               [("tool", name, tool['queued_ms'] / 1000) for name, tool in tools])
+        family("specmap_tool_file_reads_total", "counter", "Files opened for reading",
+               [("tool", name, tool['reads']) for name, tool in tools])
+        family("specmap_tool_read_bytes_total", "counter", "Size of files opened for reading",
+               [("tool", name, tool['bytes_read']) for name, tool in tools])
+        family("specmap_tool_file_writes_total", "counter", "Files opened for writing",
+               [("tool", name, tool['writes']) for name, tool in tools])
+        family("specmap_extractor_calls_total", "counter", "Extractor and parser calls",
+               [("extractor", name, calls) for name, (calls, _) in self.extractors.items()])
+        family("specmap_extractor_seconds_total", "counter", "Time spent in extractors and parsers",
+               [("extractor", name, seconds) for name, (_, seconds) in self.extractors.items()])
+        family("specmap_cache_hits_total", "counter", "Cache hits",
+               [("cache", name, hits) for name, (hits, _) in self.caches.items()])
+        family("specmap_cache_misses_total", "counter", "Cache misses",
+               [("cache", name, misses) for name, (_, misses) in self.caches.items()])
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+_current_call: ContextVar[Optional[CallMetrics]] = ContextVar('specmap_metrics_call', default=None)
+_summary = MetricsSummary()
+
+
+def enabled() -> bool:
+    """Whether metrics are being recorded"""
+    return _settings['enabled']
+
+
+def dump_formats() -> tuple:
+    """Formats written to .specmap/metrics/ after each tool call"""
+    return _settings['dump']
+
+
+def configure(enabled: Optional[bool] = None, dump: Optional[Sequence[str]] = None):
+    """
+    Turn recording on or off and choose the dump formats
+
+    Args:
+        enabled: Record metrics (None leaves it unchanged)
+        dump: Formats from DUMP_FORMATS to write per call; empty for none
+    """
+    global _hook_installed
+
+    if dump is not None:
+        unknown = [fmt for fmt in dump if fmt not in DUMP_FORMATS]
+        if unknown:
+            raise ValueError(f"Unknown metrics format: {', '.join(unknown)}")
+        _settings['dump'] = tuple(dict.fromkeys(dump))
+    if enabled is not None:
+        _settings['enabled'] = enabled
+
+    if _settings['enabled'] and not _hook_installed:
+        # Audit hooks cannot be removed, so it is installed on first use only
+        sys.addaudithook(_audit_open)
+        _hook_installed = True
+
+
+def _configure_from_env():
+    value = os.environ.get('SPECMAP_METRICS', '').strip().lower()
+    if value in ('', '0', 'false', 'no', 'off'):
+        return
+    formats = [fmt.strip() for fmt in value.split(',') if fmt.strip() in DUMP_FORMATS]
+    configure(enabled=True, dump=formats)
+
+
+def _audit_open(event: str, args: tuple):
+    if event != 'open' or not _settings['enabled']:
+        return
+    call = _current_call.get()
+    if call is None:
+        return
+
+    path, mode, flags = args
+    if not isinstance(path, (str, bytes, os.PathLike)):
+        return  # an already-open descriptor
+    if mode is not None:
+        writing = any(char in mode for char in 'wax+')
+    else:
+        writing = bool(flags & (os.O_WRONLY | os.O_RDWR))
+
+    if writing:
+        with _lock:
+            call.writes += 1
+        return
+
+    try:
+        size = os.stat(path).st_size
+    except (OSError, ValueError):
+        size = 0
+    with _lock:
+        call.reads += 1
+        call.bytes_read += size
+
+
+@contextmanager
+def tool_call(tool: str) -> Iterator[Optional[CallMetrics]]:
+    """
+    Attribute everything recorded inside the block to one call of a tool
+
+    Yields:
+        The call's CallMetrics, or None when metrics are disabled
+    """
+    if not _settings['enabled']:
+        yield None
+        return
+
+    call = CallMetrics(tool)
+    token = _current_call.set(call)
+    start = time.perf_counter()
+    try:
+        yield call
+    except BaseException:
+        call.error = True
+        raise
+    finally:
+        call.wall = time.perf_counter() - start
+        _current_call.reset(token)
+        with _lock:
+            _summary.add(call.as_record())
+
+
+def record_wait(seconds: float):
+    """Add time the current call spent queued before its work started"""
+    call = _current_call.get()
+    if call is not None:
+        with _lock:
+            call.queued += seconds
+
+
+def record_cache(name: str, hit: bool):
+    """Count a hit or miss of a named cache"""
+    if not _settings['enabled']:
+        return
+    call = _current_call.get()
+    with _lock:
+        caches = call.caches if call is not None else _summary.caches
+        counts = caches.setdefault(name, [0, 0])
+        counts[0 if hit else 1] += 1
+
+
+def _record_extractor(name: str, seconds: float):
+    call = _current_call.get()
+    with _lock:
+        extractors = call.extractors if call is not None else _summary.extractors
+        totals = extractors.setdefault(name, [0, 0.0])
+        totals[0] += 1
+        totals[1] += seconds
+
+
+@contextmanager
+def timer(name: str) -> Iterator[None]:
+    """Time the block as one call of the named extractor"""
+    if not _settings['enabled']:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record_extractor(name, time.perf_counter() - start)
+
+
+def timed(fn: Callable) -> Callable:
+    """Time every call of an extractor or parser (recorded by qualified name)"""
+    name = fn.__qualname__
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not _settings['enabled']:
+            return fn(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _record_extractor(name, time.perf_counter() - start)
+    return wrapper
+
+
+def snapshot() -> Dict[str, Any]:
+    """Totals recorded by this process since start or the last reset()"""
+    with _lock:
+        return _summary.as_dict()
+
+
+def reset():
+    """Forget this process's totals"""
+    global _summary
+    with _lock:
+        _summary = MetricsSummary()
+
+
+def metrics_dir(project_path: Path) -> Path:
+    """Folder of a project's metric dumps"""
+    return get_config_dir(project_path) / "metrics"
+
+
+def write_dumps(project_path: Path, call: CallMetrics, formats: Optional[Sequence[str]] = None):
+    """
+    Write a finished call to the project's metric dumps
+
+    jsonl appends the call to calls.jsonl; prometheus rewrites metrics.prom
+    with this process's totals.
+    """
+    formats = dump_formats() if formats is None else formats
+    if not formats:
+        return
+
+    folder = metrics_dir(project_path)
+    try:
+        folder.mkdir(parents=True, exist_ok=True)
+        if "jsonl" in formats:
+            log_path = folder / "calls.jsonl"
+            if log_path.exists() and log_path.stat().st_size > CALL_LOG_MAX_BYTES:
+                os.replace(log_path, log_path.with_name("calls.jsonl.1"))
+            with open(log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(call.as_record()) + '\n')
+        if "prometheus" in formats:
+            with _lock:
+                text = _summary.to_prometheus()
+            prom_path = folder / "metrics.prom"
+            tmp_path = prom_path.with_name(f"metrics.prom.{os.getpid()}.tmp")
+            tmp_path.write_text(text, encoding='utf-8')
+            os.replace(tmp_path, prom_path)
+    except OSError:
+        # Metrics must never fail the call they describe
+        pass
+
+
+def load_calls(project_path: Path) -> List[Dict[str, Any]]:
+    """Call records from a project's calls.jsonl (including the rotated file), oldest first"""
+    folder = metrics_dir(project_path)
+    records = []
+    for log_path in (folder / "calls.jsonl.1", folder / "calls.jsonl"):
+        try:
+            with open(log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue  # a line cut short by a crash
+        except OSError:
+            continue
+    return records
+
+
+def summarize(records: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Totals over call records, in the same shape as snapshot()"""
+    summary = MetricsSummary()
+    for record in records:
+        summary.add(record)
+    return summary.as_dict()
+
+
+_configure_from_env()
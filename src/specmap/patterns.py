@@ -0,0 +1,101 @@
+"""
+Regular expressions for SpecMap
+Precompiled patterns shared by the spec, plan, task, clarification and tracking extractors
+"""
+
+import re
+from functools import lru_cache
+
+# Feature folders: 001-user-auth
+FEATURE_ID_PATTERN = re.compile(r'^\d{3}-')
+
+# ----------------------------------------------------------------------------
+# Specifications (PlanGenerator)
+# ----------------------------------------------------------------------------
+
+FUNCTIONAL_REQUIREMENT_PATTERN = re.compile(r'\*\*FR-(\d{3})\*\*:\s*(.+)')
+FUNCTIONAL_REQUIREMENT_COUNT_PATTERN = re.compile(r'\*\*FR-\d{3}\*\*:')
+ENTITY_COUNT_PATTERN = re.compile(r'\*\*[A-Z][a-zA-Z\s]+\*\*:')
+
+ACCEPTANCE_TEST_PATTERN = re.compile(r'```yaml\s*ACCEPTANCE_TEST_(\d+):(.*?)```', re.DOTALL)
+ACCEPTANCE_SCENARIO_PATTERN = re.compile(r'scenario:\s*"([^"]+)"')
+ACCEPTANCE_GIVEN_PATTERN = re.compile(r'given:\s*"([^"]+)"')
+ACCEPTANCE_WHEN_PATTERN = re.compile(r'when:\s*"([^"]+)"')
+ACCEPTANCE_THEN_PATTERN = re.compile(r'then:\s*"([^"]+)"')
+
+USER_STORY_PATTERN = re.compile(
+    r'```\s*As\s+a\s+([^,]+),\s*I\s+want\s+to\s+([^,]+),\s*So\s+that\s+([^`]+)```', re.DOTALL
+)
+
+# Tried in order; the first that matches anywhere in the line wins
+SPEC_PERFORMANCE_VALUE_PATTERNS = (
+    re.compile(r'<(\d+(?:\.\d+)?\s*(?:ms|s))'),                     # <200ms
+    re.compile(r'(\d+(?:\.\d+)?%)'),                                # 99.9%
+    re.compile(r'(\d+(?:\.\d+)?\s*(?:req/s|rps|requests/s))'),      # 1000 req/s
+    re.compile(r'(\d+(?:\.\d+)?[kK]\s*(?:users|concurrent))'),      # 10k users
+)
+
+# ----------------------------------------------------------------------------
+# Implementation plans (TaskGenerator)
+# ----------------------------------------------------------------------------
+
+PLAN_DECISION_PATTERN = re.compile(
+    r'### (\d{3}-D-\d{3}): (.+?)\n\n\*\*Category\*\*: (.+?)\n\*\*Decision\*\*: (.+?)\n\*\*Rationale\*\*: (.+?)\n',
+    re.DOTALL
+)
+PLAN_MILESTONE_PATTERN = re.compile(
+    r'### (\d{3}-M-\d{3}): (.+?)\n\n\*\*Target Date\*\*: (.+?)\n\*\*Phase\*\*: (.+?)\n', re.DOTALL
+)
+PLAN_REQUIREMENT_ID_PATTERN = re.compile(r'(\d{3}-R-\d{3})')
+PLAN_DECISION_ID_PATTERN = re.compile(r'\d{3}-D-\d{3}')
+PLAN_MILESTONE_ID_PATTERN = re.compile(r'\d{3}-M-\d{3}')
+PLAN_ENTITY_PATTERN = re.compile(r'entity', re.IGNORECASE)
+PLAN_ENDPOINT_PATTERN = re.compile(r'endpoint|api', re.IGNORECASE)
+
+PLAN_PERFORMANCE_VALUE_PATTERNS = (
+    re.compile(r'<(\d+(?:\.\d+)?\s*(?:ms|s))'),         # <200ms
+    re.compile(r'(\d+(?:\.\d+)?%)'),                    # 99.9%
+    re.compile(r'(\d+(?:\.\d+)?\s*(?:req/s|rps))'),     # 1000 req/s
+    re.compile(r'(\d+[kK]\s*(?:users|concurrent))'),    # 10k users
+)
+
+PLAN_INTEGRATION_PATTERNS = (
+    re.compile(r'integrate with (.+?)(?:\n|$)', re.IGNORECASE),
+    re.compile(r'external (.+?) integration', re.IGNORECASE),
+    re.compile(r'(\w+) service integration', re.IGNORECASE),
+)
+
+ESTIMATE_HOURS_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*hour')
+ESTIMATE_RANGE_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(?:-|–|to)\s*(\d+(?:\.\d+)?)\s*(hour|day)')
+ESTIMATE_DAYS_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*day')
+
+# ----------------------------------------------------------------------------
+# Clarifications (ClarificationProcessor)
+# ----------------------------------------------------------------------------
+
+# Substrings a line needs to hold a question: a clarification marker, an
+# unchecked box, or a question mark
+QUESTION_MARKERS = ('NEEDS CLARIFICATION', '- [ ]', '?')
+
+CLARIFICATION_PATTERN = re.compile(r'\[NEEDS CLARIFICATION:\s*([^\]]+)\]')
+CHECKBOX_QUESTION_PATTERN = re.compile(r'\*\*(\d{3}-Q-\d{3})\*\*:\s*([^\n]+)')
+PLACEHOLDER_PATTERN = re.compile(r'\[.*?(to be determined|to be clarified).*?\]', re.IGNORECASE)
+
+# ----------------------------------------------------------------------------
+# Session summaries and TRACKING.md (scripts/update-tracking.py)
+# ----------------------------------------------------------------------------
+
+SUMMARY_FOCUS_PATTERN = re.compile(r'\*\*Focus\*\*:\s*(.+)')
+SUMMARY_STATUS_PATTERN = re.compile(r'\*\*Status\*\*:\s*(.+)')
+SUMMARY_RULEMAP_SCORE_PATTERN = re.compile(r'Overall RULEMAP Score:\s*\*\*\s*(\d+\.?\d*)/10')
+SUMMARY_COMPLETION_PATTERN = re.compile(r'\*\*Completion\*\*:\s*(\d+)%')
+SUMMARY_TESTS_PATTERN = re.compile(r'Tests Written:\s*(\d+)')
+SUMMARY_LINES_PATTERN = re.compile(r'Lines of Code:\s*(\d+\+?)')
+CHECKED_ITEM_PATTERN = re.compile(r'- \[x\]', re.IGNORECASE)
+UPDATE_LOG_PATTERN = re.compile(r'(## Update Log.*?)(\n## |\Z)', re.DOTALL)
+
+
+@lru_cache(maxsize=64)
+def summary_section_pattern(section: str) -> re.Pattern:
+    """Pattern for a '### <section>' block up to the next ### heading"""
+    return re.compile(rf'### {re.escape(section)}.*?(?=###|\Z)', re.DOTALL)
@@ -3,20 +3,47 @@ SpecMap Plan Command Implementation
 Generate comprehensive implementation plans from approved specifications
 """
 
-import re
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
+from . import filestat, metrics
 from .structure import ProjectStructure, TemplateManager
 from .config import WorkflowState
 from .clarify import ClarificationProcessor
+from .cache import FileCache
+from .index import FeatureIndex
+from .sections import SectionTree
+from .patterns import (
+    ACCEPTANCE_GIVEN_PATTERN, ACCEPTANCE_SCENARIO_PATTERN, ACCEPTANCE_TEST_PATTERN,
+    ACCEPTANCE_THEN_PATTERN, ACCEPTANCE_WHEN_PATTERN, ENTITY_COUNT_PATTERN, FEATURE_ID_PATTERN,
+    FUNCTIONAL_REQUIREMENT_COUNT_PATTERN, FUNCTIONAL_REQUIREMENT_PATTERN,
+    SPEC_PERFORMANCE_VALUE_PATTERNS, USER_STORY_PATTERN
+)
+
+# Bump whenever the extractors change shape or behaviour so cached analyses are rebuilt
+ANALYSIS_VERSION = "3"
+
+# Keys analyze_specification fills, in order, and the methods that extract them
+ANALYSIS_EXTRACTORS = (
+    ('functional_requirements', '_extract_functional_requirements'),
+    ('acceptance_criteria', '_extract_acceptance_criteria'),
+    ('technical_constraints', '_extract_technical_constraints'),
+    ('user_stories', '_extract_user_stories'),
+    ('performance_requirements', '_extract_performance_requirements'),
+    ('dependencies', '_extract_dependencies'),
+    ('business_context', '_extract_business_context'),
+    ('complexity_indicators', '_analyze_complexity'),
+)
+# Progress steps of analyze_specification: one per extractor, then scoring
+ANALYSIS_STEPS = len(ANALYSIS_EXTRACTORS) + 1
 
 
 class PlanGenerator:
     """Handles generation of implementation plans from specifications"""
 
-    def __init__(self, project_path: Path):
+    def __init__(self, project_path: Path, workflow: Optional[WorkflowState] = None,
+                 clarify_processor: Optional[ClarificationProcessor] = None):
         self.project_path = Path(project_path)
         self.structure = ProjectStructure(project_path)
 
@@ -25,76 +52,83 @@ class PlanGenerator:
         self.template_manager = TemplateManager(templates_dir)
 
         # Workflow state and clarification processor
-        self.workflow = WorkflowState(project_path)
-        self.workflow.load()
-        self.clarify_processor = ClarificationProcessor(project_path)
+        if workflow is None:
+            workflow = WorkflowState(project_path)
+            workflow.load()
+        self.workflow = workflow
+        self.clarify_processor = clarify_processor or ClarificationProcessor(project_path, workflow)
+        self.index = FeatureIndex(self.project_path)
+
+        # Parsed specifications shared with other processes through .specmap/cache
+        self.analysis_cache = FileCache.for_project(self.project_path, "analysis", ANALYSIS_VERSION)
 
     def get_available_features(self) -> List[str]:
         """Get list of features with approved specifications"""
-        features_dir = self.project_path / "01-specifications" / "features"
-        if not features_dir.exists():
-            return []
+        return self.clarify_processor.approved_features()
+
+    def is_feature_approved(self, feature_id: str) -> bool:
+        """Check one feature's RULEMAP approval without scoring the others
 
-        approved_features = []
-        for item in features_dir.iterdir():
-            if item.is_dir() and re.match(r'^\d{3}-', item.name):
-                spec_file = item / "spec.md"
-                if spec_file.exists():
-                    # Check RULEMAP score and approval status
-                    score_result = self.clarify_processor.calculate_rulemap_score(item.name)
-                    if score_result.get('meets_threshold', False):
-                        approved_features.append(item.name)
+        Only numbered features (NNN-name) can be approved, as in
+        get_available_features.
+        """
+        return (FEATURE_ID_PATTERN.match(feature_id) is not None
+                and self.clarify_processor.meets_threshold(feature_id))
 
-        return sorted(approved_features)
+    def analyze_specification(self, feature_id: str,
+                              progress: Optional[Callable[[int, int, str], None]] = None) -> Dict:
+        """Analyze specification to extract planning information
 
-    def analyze_specification(self, feature_id: str) -> Dict:
-        """Analyze specification to extract planning information"""
+        progress, if given, is called as progress(done, total, step) before
+        each extractor and before scoring; an exception it raises aborts the
+        analysis. A cached analysis is returned without calling it.
+        """
 
         feature_path = self.project_path / "01-specifications" / "features" / feature_id
         spec_file = feature_path / "spec.md"
 
-        if not spec_file.exists():
+        if not filestat.exists(spec_file):
             raise ValueError(f"Specification not found for feature {feature_id}")
 
+        cached = self.analysis_cache.get(feature_id, spec_file)
+        if cached is not None:
+            return cached
+
+        spec_stat = spec_file.stat()
         content = spec_file.read_text()
 
+        # Parse once; every extractor reads from the same section tree
+        tree = SectionTree(content)
+
         # Extract key information
-        analysis = {
-            'feature_id': feature_id,
-            'functional_requirements': self._extract_functional_requirements(content),
-            'acceptance_criteria': self._extract_acceptance_criteria(content),
-            'technical_constraints': self._extract_technical_constraints(content),
-            'user_stories': self._extract_user_stories(content),
-            'performance_requirements': self._extract_performance_requirements(content),
-            'dependencies': self._extract_dependencies(content),
-            'business_context': self._extract_business_context(content),
-            'complexity_indicators': self._analyze_complexity(content)
-        }
+        analysis = {'feature_id': feature_id}
+        for done, (key, extractor) in enumerate(ANALYSIS_EXTRACTORS):
+            if progress:
+                progress(done, ANALYSIS_STEPS, f"Extracting {key.replace('_', ' ')}")
+            analysis[key] = getattr(self, extractor)(tree)
 
         # Get RULEMAP score
+        if progress:
+            progress(ANALYSIS_STEPS - 1, ANALYSIS_STEPS, "Scoring specification")
         score_result = self.clarify_processor.calculate_rulemap_score(feature_id)
         analysis['rulemap_score'] = score_result
 
+        self.analysis_cache.put(feature_id, spec_file, content, analysis, stat=spec_stat)
+
         return analysis
 
-    def _extract_functional_requirements(self, content: str) -> List[Dict]:
+    @metrics.timed
+    def _extract_functional_requirements(self, tree: SectionTree) -> List[Dict]:
         """Extract functional requirements from specification"""
         requirements = []
-        lines = content.split('\n')
 
-        in_requirements_section = False
-        for line in lines:
-            # Check if we're in the functional requirements section
-            if 'functional requirements' in line.lower() and '#' in line:
-                in_requirements_section = True
-                continue
-            elif in_requirements_section and line.strip().startswith('#') and 'functional requirements' not in line.lower():
-                # Reached next section
-                in_requirements_section = False
+        for section in tree.find('functional requirements'):
+            for line in tree.body(section):
+                if '**FR-' not in line:
+                    continue
 
-            if in_requirements_section and '**FR-' in line:
                 # Extract requirement
-                match = re.search(r'\*\*FR-(\d{3})\*\*:\s*(.+)', line)
+                match = FUNCTIONAL_REQUIREMENT_PATTERN.search(line)
                 if match:
                     req_id = f"FR-{match.group(1)}"
                     req_text = match.group(2).strip()
@@ -106,23 +140,23 @@ class PlanGenerator:
 
         return requirements
 
-    def _extract_acceptance_criteria(self, content: str) -> List[Dict]:
+    @metrics.timed
+    def _extract_acceptance_criteria(self, tree: SectionTree) -> List[Dict]:
         """Extract acceptance criteria from specification"""
         criteria = []
 
         # Look for YAML-style acceptance tests
-        yaml_pattern = r'```yaml\s*ACCEPTANCE_TEST_(\d+):(.*?)```'
-        matches = re.findall(yaml_pattern, content, re.DOTALL)
+        matches = ACCEPTANCE_TEST_PATTERN.findall(tree.content)
 
         for match in matches:
             test_num = match[0]
             test_content = match[1].strip()
 
             # Parse the YAML-like content
-            scenario_match = re.search(r'scenario:\s*"([^"]+)"', test_content)
-            given_match = re.search(r'given:\s*"([^"]+)"', test_content)
-            when_match = re.search(r'when:\s*"([^"]+)"', test_content)
-            then_match = re.search(r'then:\s*"([^"]+)"', test_content)
+            scenario_match = ACCEPTANCE_SCENARIO_PATTERN.search(test_content)
+            given_match = ACCEPTANCE_GIVEN_PATTERN.search(test_content)
+            when_match = ACCEPTANCE_WHEN_PATTERN.search(test_content)
+            then_match = ACCEPTANCE_THEN_PATTERN.search(test_content)
 
             if scenario_match:
                 criteria.append({
@@ -136,7 +170,8 @@ class PlanGenerator:
 
         return criteria
 
-    def _extract_technical_constraints(self, content: str) -> Dict:
+    @metrics.timed
+    def _extract_technical_constraints(self, tree: SectionTree) -> Dict:
         """Extract technical constraints and requirements"""
         constraints = {
             'platform': '',
@@ -147,35 +182,27 @@ class PlanGenerator:
         }
 
         # Look for technical constraints section
-        lines = content.split('\n')
-        in_constraints = False
-
-        for line in lines:
-            if 'technical constraints' in line.lower() and '#' in line:
-                in_constraints = True
-                continue
-            elif in_constraints and line.strip().startswith('#') and 'technical constraints' not in line.lower():
-                in_constraints = False
-
-            if in_constraints:
-                if '**platform**:' in line.lower():
+        for section in tree.find('technical constraints'):
+            for line in tree.body(section):
+                line_lower = line.lower()
+                if '**platform**:' in line_lower:
                     constraints['platform'] = line.split(':', 1)[1].strip()
-                elif '**performance**:' in line.lower():
+                elif '**performance**:' in line_lower:
                     constraints['performance'] = line.split(':', 1)[1].strip()
-                elif '**security**:' in line.lower():
+                elif '**security**:' in line_lower:
                     constraints['security'] = line.split(':', 1)[1].strip()
-                elif '**integration**:' in line.lower():
+                elif '**integration**:' in line_lower:
                     constraints['integration'] = line.split(':', 1)[1].strip()
 
         return constraints
 
-    def _extract_user_stories(self, content: str) -> List[Dict]:
+    @metrics.timed
+    def _extract_user_stories(self, tree: SectionTree) -> List[Dict]:
         """Extract user stories from specification"""
         stories = []
 
         # Look for user story format
-        story_pattern = r'```\s*As\s+a\s+([^,]+),\s*I\s+want\s+to\s+([^,]+),\s*So\s+that\s+([^`]+)```'
-        matches = re.findall(story_pattern, content, re.DOTALL)
+        matches = USER_STORY_PATTERN.findall(tree.content)
 
         for i, match in enumerate(matches, 1):
             stories.append({
@@ -187,7 +214,8 @@ class PlanGenerator:
 
         return stories
 
-    def _extract_performance_requirements(self, content: str) -> Dict:
+    @metrics.timed
+    def _extract_performance_requirements(self, tree: SectionTree) -> Dict:
         """Extract performance requirements"""
         performance = {
             'response_time': '',
@@ -196,72 +224,56 @@ class PlanGenerator:
             'reliability': ''
         }
 
-        # Look for performance section
-        lines = content.split('\n')
-        in_performance = False
-
-        for line in lines:
-            if 'technical performance' in line.lower() or 'performance' in line.lower() and '#' in line:
-                in_performance = True
-                continue
-            elif in_performance and line.strip().startswith('#'):
-                in_performance = False
-
-            if in_performance:
-                if 'response time' in line.lower() or 'latency' in line.lower():
-                    performance['response_time'] = self._extract_performance_value(line)
-                elif 'throughput' in line.lower() or 'req/s' in line.lower():
-                    performance['throughput'] = self._extract_performance_value(line)
-                elif 'concurrent' in line.lower() or 'users' in line.lower():
-                    performance['concurrent_users'] = self._extract_performance_value(line)
-                elif 'uptime' in line.lower() or 'reliability' in line.lower():
-                    performance['reliability'] = self._extract_performance_value(line)
+        # Look for performance sections: a performance heading or any line
+        # mentioning technical performance, up to the next heading
+        def opens_section(line_lower: str) -> bool:
+            return 'technical performance' in line_lower or '#' in line_lower
+
+        for index in tree.blocks('performance', opens_section):
+            line_lower = tree.lower_lines[index]
+            line = tree.lines[index]
+            if 'response time' in line_lower or 'latency' in line_lower:
+                performance['response_time'] = self._extract_performance_value(line)
+            elif 'throughput' in line_lower or 'req/s' in line_lower:
+                performance['throughput'] = self._extract_performance_value(line)
+            elif 'concurrent' in line_lower or 'users' in line_lower:
+                performance['concurrent_users'] = self._extract_performance_value(line)
+            elif 'uptime' in line_lower or 'reliability' in line_lower:
+                performance['reliability'] = self._extract_performance_value(line)
 
         return performance
 
     def _extract_performance_value(self, line: str) -> str:
         """Extract performance value from line"""
         # Look for patterns like <200ms, 99.9%, 1000 req/s, etc.
-        patterns = [
-            r'<(\d+(?:\.\d+)?\s*(?:ms|s))',  # <200ms
-            r'(\d+(?:\.\d+)?%)',             # 99.9%
-            r'(\d+(?:\.\d+)?\s*(?:req/s|rps|requests/s))',  # 1000 req/s
-            r'(\d+(?:\.\d+)?[kK]\s*(?:users|concurrent))'   # 10k users
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, line)
+        for pattern in SPEC_PERFORMANCE_VALUE_PATTERNS:
+            match = pattern.search(line)
             if match:
                 return match.group(1)
 
         return line.split(':', 1)[1].strip() if ':' in line else ''
 
-    def _extract_dependencies(self, content: str) -> List[Dict]:
+    @metrics.timed
+    def _extract_dependencies(self, tree: SectionTree) -> List[Dict]:
         """Extract dependencies from specification"""
         dependencies = []
 
         # Look for dependencies section
-        lines = content.split('\n')
-        in_dependencies = False
-
-        for line in lines:
-            if 'dependencies' in line.lower() and '#' in line:
-                in_dependencies = True
-                continue
-            elif in_dependencies and line.strip().startswith('#'):
-                in_dependencies = False
-
-            if in_dependencies and (line.strip().startswith('-') or line.strip().startswith('*')):
-                dep_text = line.strip().lstrip('-*').strip()
-                if dep_text:
-                    dependencies.append({
-                        'type': 'external',
-                        'description': dep_text
-                    })
+        for section in tree.find('dependencies'):
+            for line in tree.body(section):
+                stripped = line.strip()
+                if stripped.startswith('-') or stripped.startswith('*'):
+                    dep_text = stripped.lstrip('-*').strip()
+                    if dep_text:
+                        dependencies.append({
+                            'type': 'external',
+                            'description': dep_text
+                        })
 
         return dependencies
 
-    def _extract_business_context(self, content: str) -> Dict:
+    @metrics.timed
+    def _extract_business_context(self, tree: SectionTree) -> Dict:
         """Extract business context information"""
         context = {
             'strategic_alignment': '',
@@ -279,28 +291,29 @@ class PlanGenerator:
             'urgency': 'timeline_pressure'
         }
 
-        lines = content.split('\n')
-        current_section = None
-
-        for line in lines:
-            line_lower = line.lower()
+        for index, line_lower in enumerate(tree.lower_lines):
+            if ':' not in line_lower:
+                continue
             for section_name, context_key in sections_to_find.items():
-                if section_name in line_lower and ':' in line:
-                    context[context_key] = line.split(':', 1)[1].strip()
+                if section_name in line_lower:
+                    context[context_key] = tree.lines[index].split(':', 1)[1].strip()
                     break
 
         return context
 
-    def _analyze_complexity(self, content: str) -> Dict:
+    @metrics.timed
+    def _analyze_complexity(self, tree: SectionTree) -> Dict:
         """Analyze specification complexity indicators"""
+        content = tree.content
+        content_lower = tree.lower
 
         complexity = {
-            'entities_count': len(re.findall(r'\*\*[A-Z][a-zA-Z\s]+\*\*:', content)),
-            'requirements_count': len(re.findall(r'\*\*FR-\d{3}\*\*:', content)),
-            'integrations_count': content.lower().count('integration') + content.lower().count('external'),
-            'has_auth': 'auth' in content.lower() or 'login' in content.lower(),
-            'has_database': 'database' in content.lower() or 'persist' in content.lower(),
-            'has_api': 'api' in content.lower() or 'endpoint' in content.lower(),
+            'entities_count': len(ENTITY_COUNT_PATTERN.findall(content)),
+            'requirements_count': len(FUNCTIONAL_REQUIREMENT_COUNT_PATTERN.findall(content)),
+            'integrations_count': content_lower.count('integration') + content_lower.count('external'),
+            'has_auth': 'auth' in content_lower or 'login' in content_lower,
+            'has_database': 'database' in content_lower or 'persist' in content_lower,
+            'has_api': 'api' in content_lower or 'endpoint' in content_lower,
             'complexity_score': 0
         }
 
@@ -748,27 +761,42 @@ class User(BaseModel):
         data_models_file.write_text(content, encoding='utf-8')
         return str(data_models_file)
 
-    def generate_implementation_plan(self, feature_id: str) -> Dict:
-        """Generate complete implementation plan"""
+    def generate_implementation_plan(self, feature_id: str,
+                                     progress: Optional[Callable[[int, int, str], None]] = None) -> Dict:
+        """Generate complete implementation plan
+
+        progress, if given, is called as progress(done, total, step) before
+        the approval check and each analysis and planning step, with one total
+        for the whole plan; an exception it raises aborts the plan. The last
+        call comes before any file is written.
+        """
+        # Approval check, the analysis, then three planning steps
+        steps = 1 + ANALYSIS_STEPS + 3
+        planned = 1 + ANALYSIS_STEPS
+
+        def analysis_progress(done: int, total: int, step: str):
+            progress(1 + done, steps, step)
 
         # Validate feature exists and is approved
-        available_features = self.get_available_features()
-        if feature_id not in available_features:
-            # Get RULEMAP score to check status
-            score_result = self.clarify_processor.calculate_rulemap_score(feature_id)
-            if not score_result.get('meets_threshold', False):
-                raise ValueError(f"Feature '{feature_id}' does not meet RULEMAP threshold (≥8.0). Run 'specmap clarify' first.")
-            else:
-                available_features.append(feature_id)  # Add if it meets threshold
+        if progress:
+            progress(0, steps, "Checking RULEMAP approval")
+        if not self.is_feature_approved(feature_id):
+            raise ValueError(f"Feature '{feature_id}' does not meet RULEMAP threshold (≥8.0). Run 'specmap clarify' first.")
 
         # Analyze specification
-        analysis = self.analyze_specification(feature_id)
+        analysis = self.analyze_specification(feature_id, analysis_progress if progress else None)
 
         # Generate plan components
+        if progress:
+            progress(planned, steps, "Choosing technical decisions")
         technical_decisions = self.generate_technical_decisions(feature_id, analysis)
+        if progress:
+            progress(planned + 1, steps, "Planning milestones")
         milestones = self.generate_milestones(feature_id, analysis)
 
         # Create feature planning folder
+        if progress:
+            progress(planned + 2, steps, "Writing plan documents")
         feature_paths = self.structure.get_feature_path(feature_id)
         plan_path = feature_paths['plan']
         plan_path.mkdir(parents=True, exist_ok=True)
@@ -810,13 +838,15 @@ class User(BaseModel):
             plan_file = plan_path / "plan.md"
             plan_file.write_text(plan_content, encoding='utf-8')
 
+        self.index.update_feature(feature_id)
+
         # Update workflow state
-        feature_data = self.workflow.get_feature(feature_id) or {}
-        feature_data['status'] = 'planning'
-        feature_data['plan_created'] = datetime.now().isoformat()
-        feature_data['decisions'] = technical_decisions
-        feature_data['milestones'] = milestones
-        self.workflow.add_feature(feature_id, feature_data)
+        self.workflow.modify_feature(feature_id, {
+            'status': 'planning',
+            'plan_created': datetime.now().isoformat(),
+            'decisions': technical_decisions,
+            'milestones': milestones
+        })
 
         # Update project phase
         self.workflow.update_phase('planning')
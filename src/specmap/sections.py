@@ -0,0 +1,160 @@
+"""
+Markdown section parsing for SpecMap
+Single-pass tokenizer that turns specs and plans into a heading tree
+"""
+
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from . import metrics
+
+
+class Section:
+    """A heading and the line spans it covers
+
+    Line numbers are 0-based indexes into SectionTree.lines:
+    - start: the heading line itself
+    - body_end: first line of the next heading of any level (direct body)
+    - end: first line after the whole subtree (next heading of same/higher level)
+    """
+
+    __slots__ = ('title', 'title_lower', 'level', 'path', 'start', 'body_end', 'end')
+
+    def __init__(self, title: str, level: int, path: Tuple[str, ...], start: int):
+        self.title = title
+        self.title_lower = title.lower()
+        self.level = level
+        self.path = path
+        self.start = start
+        self.body_end = start + 1
+        self.end = start + 1
+
+    def __repr__(self) -> str:
+        return f"Section({' > '.join(self.path)!r}, lines {self.start}-{self.end})"
+
+
+class SectionTree:
+    """Heading tree of a markdown document built in one pass over its lines
+
+    Any line starting with '#' is a heading, including lines inside fenced
+    blocks, since specs embed whole markdown documents in ```markdown fences.
+    Extractors share one tree per document, so analysis costs O(document size)
+    regardless of how many extractors run.
+    """
+
+    def __init__(self, content: str):
+        self.content = content
+        self.lines = content.split('\n')
+        self.sections: List[Section] = []
+        self._heading_set = set()
+        self._line_offsets: Optional[List[int]] = None
+        self._lower: Optional[str] = None
+        self._lower_lines: Optional[List[str]] = None
+        self._parse()
+
+    @metrics.timed
+    def _parse(self):
+        """Walk the document once, recording headings"""
+        stack: List[Section] = []
+
+        for index, line in enumerate(self.lines):
+            # The substring test skips most lines without building a stripped copy
+            if '#' not in line:
+                continue
+            stripped = line.strip()
+            if not stripped.startswith('#'):
+                continue
+
+            level = len(stripped) - len(stripped.lstrip('#'))
+            title = stripped[level:].strip()
+
+            if self.sections:
+                self.sections[-1].body_end = index
+            while stack and stack[-1].level >= level:
+                stack.pop().end = index
+
+            path = (stack[-1].path if stack else ()) + (title,)
+            section = Section(title, level, path, index)
+            self.sections.append(section)
+            self._heading_set.add(index)
+            stack.append(section)
+
+        total = len(self.lines)
+        if self.sections:
+            self.sections[-1].body_end = total
+        for section in stack:
+            section.end = total
+
+    @property
+    def line_offsets(self) -> List[int]:
+        """Character offset of each line's start, computed once on first use"""
+        if self._line_offsets is None:
+            self._line_offsets = list(accumulate((len(line) + 1 for line in self.lines[:-1]), initial=0))
+        return self._line_offsets
+
+    @property
+    def lower(self) -> str:
+        """Lowercased document, computed once on first use"""
+        if self._lower is None:
+            self._lower = self.content.lower()
+        return self._lower
+
+    @property
+    def lower_lines(self) -> List[str]:
+        """Lowercased lines, lower_lines[i] == lines[i].lower(), computed once on first use"""
+        if self._lower_lines is None:
+            self._lower_lines = self.lower.split('\n')
+        return self._lower_lines
+
+    def find(self, keyword: str) -> List[Section]:
+        """Return sections whose heading contains keyword (case-insensitive)"""
+        keyword = keyword.lower()
+        return [s for s in self.sections if keyword in s.title_lower]
+
+    def body(self, section: Section) -> List[str]:
+        """Lines directly under a heading, up to the next heading"""
+        return self.lines[section.start + 1:section.body_end]
+
+    def subtree(self, section: Section) -> List[str]:
+        """Lines under a heading including its nested subsections"""
+        return self.lines[section.start + 1:section.end]
+
+    def is_heading(self, line_index: int) -> bool:
+        """Check whether a line starts a section"""
+        return line_index in self._heading_set
+
+    def blocks(self, keyword: str, starts: Callable[[str], bool]) -> Iterator[int]:
+        """Yield indexes of the lines in blocks that open at a start line and end at the next heading
+
+        A start line contains keyword and passes starts(lowercased line). It
+        is not yielded itself, and one met inside a block keeps it open,
+        even when it is a heading. Only lines containing keyword are tested,
+        so documents with few blocks are skimmed at C speed.
+        """
+        lower_lines = self.lower_lines
+        total = len(lower_lines)
+        position = 0
+
+        for start in [index for index, line in enumerate(lower_lines) if keyword in line]:
+            if start < position or not starts(lower_lines[start]):
+                continue
+            index = start + 1
+            while index < total:
+                line_lower = lower_lines[index]
+                if keyword in line_lower and starts(line_lower):
+                    index += 1
+                    continue
+                if index in self._heading_set:
+                    break
+                yield index
+                index += 1
+            position = index
+
+    def line_at(self, offset: int) -> int:
+        """Map a character offset in content to its line index"""
+        return bisect_right(self.line_offsets, offset) - 1
+
+    def outline(self) -> Dict[Tuple[str, ...], Tuple[int, int]]:
+        """Map each heading path to its (start, end) line span"""
+        return {s.path: (s.start, s.end) for s in self.sections}
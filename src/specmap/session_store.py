@@ -0,0 +1,213 @@
+"""
+Session metadata store for SpecMap
+Keeps session details, tracked artifacts and checkpoints in 04-agents/sessions/sessions.sqlite
+"""
+
+import json
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+STORE_SCHEMA_VERSION = "1"
+
+ARTIFACT_ACTIONS = ("created", "modified")
+
+
+class SessionStore:
+    """SQLite store behind SessionManager's session metadata
+
+    Artifacts are rows keyed by (session, action, path), so tracking one is a
+    single INSERT OR IGNORE instead of a YAML load, list scan and dump.
+    Counters in the metrics block are derived from the tables. metadata()
+    rebuilds the nested dict that session.yaml has always held; the manager
+    writes that file as a human-readable export at checkpoints and at the
+    end of a session.
+    """
+
+    def __init__(self, sessions_dir: Path):
+        self.sessions_dir = Path(sessions_dir)
+        self.db_path = self.sessions_dir / "sessions.sqlite"
+
+    def _connect(self) -> sqlite3.Connection:
+        self.sessions_dir.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=10)
+        conn.executescript(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "session_id TEXT PRIMARY KEY, status TEXT, info TEXT, custom TEXT, "
+            "rulemap_score REAL, duration_minutes INTEGER);"
+            "CREATE TABLE IF NOT EXISTS artifacts ("
+            "session_id TEXT, action TEXT, path TEXT, "
+            "PRIMARY KEY (session_id, action, path));"
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            "session_id TEXT, checkpoint TEXT);"
+            "CREATE INDEX IF NOT EXISTS checkpoints_session ON checkpoints (session_id);"
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);"
+            f"INSERT OR IGNORE INTO meta VALUES ('schema', '{STORE_SCHEMA_VERSION}');"
+        )
+        return conn
+
+    def create_session(self, session_id: str, info: Dict[str, Any],
+                       custom: Optional[Dict[str, Any]] = None):
+        """Register a new session (replacing any earlier record with the same ID)"""
+        with closing(self._connect()) as conn:
+            with conn:
+                self._delete(conn, session_id)
+                conn.execute(
+                    "INSERT INTO sessions VALUES (?, ?, ?, ?, NULL, 0)",
+                    (session_id, info.get('status'), json.dumps(info),
+                     json.dumps(custom) if custom is not None else None)
+                )
+
+    def import_metadata(self, session_id: str, meta: Dict[str, Any]) -> bool:
+        """Load a session.yaml written before the store existed; returns False if already known"""
+        with closing(self._connect()) as conn:
+            with conn:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO sessions VALUES (?, ?, ?, ?, ?, ?)",
+                    (session_id, meta['session'].get('status'), json.dumps(meta['session']),
+                     json.dumps(meta['custom']) if 'custom' in meta else None,
+                     meta.get('rulemap_score'),
+                     meta.get('metrics', {}).get('duration_minutes', 0))
+                )
+                if cursor.rowcount == 0:
+                    return False
+
+                artifacts = meta.get('artifacts') or {}
+                conn.executemany(
+                    "INSERT OR IGNORE INTO artifacts VALUES (?, ?, ?)",
+                    [(session_id, action, path)
+                     for action in ARTIFACT_ACTIONS
+                     for path in artifacts.get(action) or []]
+                )
+                conn.executemany(
+                    "INSERT INTO checkpoints VALUES (?, ?)",
+                    [(session_id, json.dumps(checkpoint))
+                     for checkpoint in meta.get('checkpoints') or []]
+                )
+        return True
+
+    def has_session(self, session_id: str) -> bool:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return row is not None
+
+    def add_artifact(self, session_id: str, file_path: str, action: str = "created") -> bool:
+        """Record an artifact; returns True if it was not tracked yet"""
+        if action not in ARTIFACT_ACTIONS:
+            return False
+        with closing(self._connect()) as conn:
+            with conn:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO artifacts VALUES (?, ?, ?)",
+                    (session_id, action, file_path)
+                )
+        return cursor.rowcount == 1
+
+    def add_artifacts(self, session_id: str,
+                      artifacts: Iterable[Tuple[str, str]]) -> List[str]:
+        """Record many (file_path, action) pairs in one transaction
+
+        Returns one status per input item: 'tracked', 'duplicate' (already
+        tracked, or repeated within the batch) or 'invalid_action'.
+        """
+        statuses = []
+        seen = set()
+        with closing(self._connect()) as conn:
+            with conn:
+                for file_path, action in artifacts:
+                    if action not in ARTIFACT_ACTIONS:
+                        statuses.append('invalid_action')
+                        continue
+                    if (file_path, action) in seen:
+                        statuses.append('duplicate')
+                        continue
+                    seen.add((file_path, action))
+                    cursor = conn.execute(
+                        "INSERT OR IGNORE INTO artifacts VALUES (?, ?, ?)",
+                        (session_id, action, file_path)
+                    )
+                    statuses.append('tracked' if cursor.rowcount == 1 else 'duplicate')
+        return statuses
+
+    def add_checkpoint(self, session_id: str, checkpoint: Dict[str, Any]):
+        with closing(self._connect()) as conn:
+            with conn:
+                conn.execute(
+                    "INSERT INTO checkpoints VALUES (?, ?)",
+                    (session_id, json.dumps(checkpoint))
+                )
+
+    def checkpoint_count(self, session_id: str) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM checkpoints WHERE session_id = ?", (session_id,)
+            ).fetchone()[0]
+
+    def finish_session(self, session_id: str, info: Dict[str, Any], duration_minutes: int,
+                       rulemap_score: Optional[float] = None):
+        """Store the final session block, duration and optional score"""
+        with closing(self._connect()) as conn:
+            with conn:
+                conn.execute(
+                    "UPDATE sessions SET status = ?, info = ?, duration_minutes = ?, "
+                    "rulemap_score = COALESCE(?, rulemap_score) WHERE session_id = ?",
+                    (info.get('status'), json.dumps(info), duration_minutes,
+                     rulemap_score, session_id)
+                )
+
+    def metadata(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Rebuild the session.yaml structure for one session, or None if unknown"""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT info, custom, rulemap_score, duration_minutes FROM sessions "
+                "WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            info, custom, rulemap_score, duration_minutes = row
+
+            artifacts = {action: [] for action in ARTIFACT_ACTIONS}
+            for action, path in conn.execute(
+                    "SELECT action, path FROM artifacts WHERE session_id = ? ORDER BY rowid",
+                    (session_id,)):
+                artifacts[action].append(path)
+            checkpoints = [
+                json.loads(checkpoint) for (checkpoint,) in conn.execute(
+                    "SELECT checkpoint FROM checkpoints WHERE session_id = ? ORDER BY rowid",
+                    (session_id,))
+            ]
+
+        meta = {
+            'session': json.loads(info),
+            'artifacts': artifacts,
+            'checkpoints': checkpoints,
+            'metrics': {
+                'duration_minutes': duration_minutes,
+                'files_created': len(artifacts['created']),
+                'files_modified': len(artifacts['modified']),
+                'checkpoints': len(checkpoints)
+            }
+        }
+        if custom is not None:
+            meta['custom'] = json.loads(custom)
+        if rulemap_score is not None:
+            meta['rulemap_score'] = rulemap_score
+        return meta
+
+    def sessions(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Session blocks of all stored sessions, optionally filtered by status"""
+        with closing(self._connect()) as conn:
+            if status is None:
+                rows = conn.execute("SELECT info FROM sessions ORDER BY session_id").fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT info FROM sessions WHERE status = ? ORDER BY session_id", (status,)
+                ).fetchall()
+        return [json.loads(info) for (info,) in rows]
+
+    def _delete(self, conn: sqlite3.Connection, session_id: str):
+        for table in ("sessions", "artifacts", "checkpoints"):
+            conn.execute(f"DELETE FROM {table} WHERE session_id = ?", (session_id,))
@@ -4,15 +4,65 @@ Handles session lifecycle, backups, and artifact organization
 """
 
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from datetime import datetime
+import os
 import shutil
+import threading
 import yaml
 import json
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .archive import ARCHIVE_SUFFIXES, check_format, create_archive, member_count
+from .session_store import ARTIFACT_ACTIONS, SessionStore
+from .snapshots import SnapshotStore, file_digest
+
+
+# Session backups running in the background, by backup path; entries are
+# removed when the backup finishes
+_backup_jobs: Dict[str, Future] = {}
+_backup_executor: Optional[ThreadPoolExecutor] = None
+_backup_lock = threading.Lock()
+
+# Errors of the most recent failed background backups, by backup path
+_backup_failures: "OrderedDict[str, str]" = OrderedDict()
+BACKUP_FAILURES_KEPT = 64
+
+
+def _submit_backup(backup_path: Path, fn, *args) -> Future:
+    global _backup_executor
+    key = str(backup_path)
+    with _backup_lock:
+        if _backup_executor is None:
+            _backup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="specmap-backup")
+        future = _backup_executor.submit(fn, *args)
+        _backup_jobs[key] = future
+        _backup_failures.pop(key, None)
+    # Outside the lock: the callback runs at once if the backup already finished
+    future.add_done_callback(lambda done: _finish_backup(key, done))
+    return future
+
+
+def _finish_backup(key: str, future: Future):
+    """Forget a finished backup job, keeping its error if it failed"""
+    with _backup_lock:
+        if _backup_jobs.get(key) is future:
+            del _backup_jobs[key]
+        if not future.cancelled() and future.exception() is not None:
+            _backup_failures[key] = str(future.exception())
+            while len(_backup_failures) > BACKUP_FAILURES_KEPT:
+                _backup_failures.popitem(last=False)
 
 
 class SessionManager:
-    """Manages development sessions with automatic backup and organization"""
+    """Manages development sessions with automatic backup and organization
+
+    Session metadata lives in a SessionStore (04-agents/sessions/sessions.sqlite).
+    Each session's session.yaml is an export of it for humans and backups,
+    rewritten at start, at each checkpoint and when the session ends. Artifacts
+    tracked in between appear in session.yaml at the next of those points.
+    """
 
     def __init__(self, project_path: Path):
         """
@@ -26,6 +76,7 @@ class SessionManager:
         self.active_dir = self.sessions_dir / "active"
         self.archive_dir = self.sessions_dir / "archive"
         self.backups_dir = self.project_path / "04-agents" / "backups"
+        self.store = SessionStore(self.sessions_dir)
 
     def create_session_id(self, focus: Optional[str] = None) -> str:
         """
@@ -115,9 +166,9 @@ class SessionManager:
             session_meta['custom'] = metadata
 
         # Save metadata
+        self.store.create_session(session_id, session_meta['session'], session_meta.get('custom'))
         meta_path = session_path / "session.yaml"
-        with open(meta_path, 'w', encoding='utf-8') as f:
-            yaml.dump(session_meta, f, default_flow_style=False, sort_keys=False)
+        self._write_metadata_yaml(meta_path, session_meta)
 
         # Create session summary template
         self._create_session_summary_template(session_path, session_id, focus)
@@ -288,49 +339,44 @@ See `artifacts/` folder for all files created during this session.
         if not session_path.exists():
             raise ValueError(f"Session not found: {session_id}")
 
-        # Load metadata
-        meta_path = session_path / "session.yaml"
-        with open(meta_path, 'r', encoding='utf-8') as f:
-            session_meta = yaml.safe_load(f)
+        self._ensure_stored(session_id, session_path)
 
         # Create checkpoint
-        checkpoint_num = len(session_meta['checkpoints']) + 1
+        checkpoint_num = self.store.checkpoint_count(session_id) + 1
         timestamp = datetime.now().strftime("%H-%M-%S")
         checkpoint_id = f"checkpoint-{checkpoint_num:03d}-{timestamp}"
-        checkpoint_path = session_path / "snapshots" / checkpoint_id
-        checkpoint_path.mkdir(parents=True, exist_ok=True)
 
-        # Snapshot files
-        snapshotted = []
+        # Collect files to snapshot
+        files = []
         if files_to_snapshot:
             for file_path in files_to_snapshot:
                 src = self.project_path / file_path
-                if src.exists():
-                    dst = checkpoint_path / Path(file_path).name
-                    shutil.copy2(src, dst)
-                    snapshotted.append(file_path)
+                if src.is_file():
+                    files.append((file_path, src))
         else:
             # Snapshot all artifacts
             artifacts_dir = session_path / "artifacts"
             if artifacts_dir.exists():
                 for artifact in artifacts_dir.iterdir():
                     if artifact.is_file():
-                        shutil.copy2(artifact, checkpoint_path / artifact.name)
-                        snapshotted.append(str(artifact.relative_to(session_path)))
+                        files.append((str(artifact.relative_to(session_path)), artifact))
+
+        # Unchanged contents are referenced by hash, not copied again
+        snapshots = SnapshotStore(session_path / "snapshots")
+        checkpoint_time = datetime.now().strftime("%H:%M:%S")
+        snapshots.create(checkpoint_id, files, {'time': checkpoint_time, 'description': description})
+        checkpoint_path = snapshots.snapshots_dir / f"{checkpoint_id}.json"
+        snapshotted = [recorded for recorded, _ in files]
 
         # Update metadata
         checkpoint_info = {
             'id': checkpoint_id,
-            'time': datetime.now().strftime("%H:%M:%S"),
+            'time': checkpoint_time,
             'description': description,
             'files_snapshot': snapshotted
         }
-        session_meta['checkpoints'].append(checkpoint_info)
-        session_meta['metrics']['checkpoints'] += 1
-
-        # Save metadata
-        with open(meta_path, 'w', encoding='utf-8') as f:
-            yaml.dump(session_meta, f, default_flow_style=False, sort_keys=False)
+        self.store.add_checkpoint(session_id, checkpoint_info)
+        self.export_metadata(session_id, session_path)
 
         return {
             'checkpoint_id': checkpoint_id,
@@ -354,38 +400,58 @@ See `artifacts/` folder for all files created during this session.
             action: "created" or "modified"
 
         Returns:
-            True if tracked successfully
+            True if tracked successfully (or already tracked), False if the
+            session does not exist or action is not "created" or "modified"
+            (the item track_artifacts() reports as "invalid_action")
         """
+        if action not in ARTIFACT_ACTIONS:
+            return False
+
         session_path = self.active_dir / session_id
 
         if not session_path.exists():
             return False
 
-        meta_path = session_path / "session.yaml"
-        with open(meta_path, 'r', encoding='utf-8') as f:
-            session_meta = yaml.safe_load(f)
-
-        # Add to appropriate list
-        if action == "created":
-            if file_path not in session_meta['artifacts']['created']:
-                session_meta['artifacts']['created'].append(file_path)
-                session_meta['metrics']['files_created'] += 1
-        elif action == "modified":
-            if file_path not in session_meta['artifacts']['modified']:
-                session_meta['artifacts']['modified'].append(file_path)
-                session_meta['metrics']['files_modified'] += 1
+        # Duplicates are ignored by the store's primary key
+        self.store.add_artifact(session_id, file_path, action)
+        return True
 
-        # Save metadata
-        with open(meta_path, 'w', encoding='utf-8') as f:
-            yaml.dump(session_meta, f, default_flow_style=False, sort_keys=False)
+    def track_artifacts(
+        self,
+        session_id: str,
+        artifacts: List[Tuple[str, str]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Track many file artifacts in one transaction
 
-        return True
+        Args:
+            session_id: Session ID
+            artifacts: (file_path, action) pairs, action being "created" or "modified"
+
+        Returns:
+            One dict per input item with file_path, action and status
+            ("tracked", "duplicate" or "invalid_action")
+        """
+        session_path = self.active_dir / session_id
+
+        if not session_path.exists():
+            raise ValueError(f"Session not found: {session_id}")
+
+        artifacts = [(file_path, action) for file_path, action in artifacts]
+        statuses = self.store.add_artifacts(session_id, artifacts)
+        return [
+            {'file_path': file_path, 'action': action, 'status': status}
+            for (file_path, action), status in zip(artifacts, statuses)
+        ]
 
     def end_session(
         self,
         session_id: str,
         rulemap_score: Optional[float] = None,
-        create_backup: bool = True
+        create_backup: bool = True,
+        backup_format: str = "zip",
+        background: bool = False,
+        progress: Optional[Callable[[int, int, str], None]] = None
     ) -> Dict[str, Any]:
         """
         End a session and archive it
@@ -394,6 +460,13 @@ See `artifacts/` folder for all files created during this session.
             session_id: Session ID to end
             rulemap_score: Optional RULEMAP score for session
             create_backup: Whether to create backup (default: True)
+            backup_format: "zip" (default) or "tar.zst" (needs zstandard)
+            background: Return before the backup is written; poll backup_status()
+            progress: Optional callback(done, total, item) called before the
+                session is closed, before it is moved to the archive and before
+                each backup member, with one total for all of them; an exception
+                it raises aborts the work. Once the session is archived, that
+                leaves it without a backup.
 
         Returns:
             Dict with archival details
@@ -402,11 +475,12 @@ See `artifacts/` folder for all files created during this session.
 
         if not session_path.exists():
             raise ValueError(f"Session not found: {session_id}")
+        if create_backup:
+            check_format(backup_format)
 
         # Load and update metadata
-        meta_path = session_path / "session.yaml"
-        with open(meta_path, 'r', encoding='utf-8') as f:
-            session_meta = yaml.safe_load(f)
+        self._ensure_stored(session_id, session_path)
+        session_meta = self.store.metadata(session_id)
 
         # Update end time
         end_time = datetime.now()
@@ -424,46 +498,97 @@ See `artifacts/` folder for all files created during this session.
         if rulemap_score is not None:
             session_meta['rulemap_score'] = rulemap_score
 
+        # Closing, moving, then each member of a foreground backup
+        steps = 2
+        if progress and create_backup and not background:
+            steps += member_count(session_path)
+
+        def backup_progress(done: int, total: int, item: str):
+            progress(2 + done, steps, item)
+
         # Save updated metadata
-        with open(meta_path, 'w', encoding='utf-8') as f:
-            yaml.dump(session_meta, f, default_flow_style=False, sort_keys=False)
+        if progress:
+            progress(0, steps, "Closing session")
+        self.store.finish_session(session_id, session_meta['session'], duration_minutes, rulemap_score)
+        self._write_metadata_yaml(session_path / "session.yaml", session_meta)
+
+        # Move to archive; the backup is taken from there, where nothing changes it
+        archive_path = self.archive_dir / session_id
+        if progress:
+            progress(1, steps, "Moving session to archive")
+        shutil.move(str(session_path), str(archive_path))
 
         # Create backup if requested
         backup_path = None
+        backup_status = None
         if create_backup:
-            backup_path = self._backup_session(session_id, session_path)
-
-        # Move to archive
-        archive_path = self.archive_dir / session_id
-        shutil.move(str(session_path), str(archive_path))
+            backup_path = self._backup_path(session_id, backup_format)
+            if background:
+                _submit_backup(backup_path, self._backup_session, session_id, archive_path, backup_format)
+                backup_status = 'pending'
+            else:
+                self._backup_session(session_id, archive_path, backup_format,
+                                     backup_progress if progress else None)
+                backup_status = 'completed'
 
         return {
             'session_id': session_id,
             'archived': True,
             'archive_path': str(archive_path),
             'backup_path': str(backup_path) if backup_path else None,
+            'backup_status': backup_status,
             'duration_minutes': duration_minutes,
             'files_created': session_meta['metrics']['files_created'],
             'files_modified': session_meta['metrics']['files_modified'],
             'checkpoints': session_meta['metrics']['checkpoints']
         }
 
-    def _backup_session(self, session_id: str, session_path: Path) -> Path:
-        """Create backup of session"""
-        backup_dir = self.backups_dir / "sessions"
-        backup_dir.mkdir(parents=True, exist_ok=True)
+    def _backup_path(self, session_id: str, backup_format: str = "zip") -> Path:
+        return self.backups_dir / "sessions" / f"{session_id}-backup{ARCHIVE_SUFFIXES[backup_format]}"
 
-        backup_name = f"{session_id}-backup.zip"
-        backup_path = backup_dir / backup_name
+    def _backup_session(self, session_id: str, session_path: Path, backup_format: str = "zip",
+                        progress: Optional[Callable[[int, int, str], None]] = None) -> Path:
+        """Create backup of session (members are compressed in parallel)"""
+        backup_path = self._backup_path(session_id, backup_format)
+        backup_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Create zip archive
-        shutil.make_archive(
-            str(backup_path.with_suffix('')),
-            'zip',
-            session_path
-        )
+        def member_progress(done: int, total: int, name: str):
+            progress(done, total, f"Backing up {name}")
+
+        suffix = ARCHIVE_SUFFIXES[backup_format]
+        return create_archive(session_path, str(backup_path)[:-len(suffix)], backup_format,
+                              progress=member_progress if progress else None)
 
-        return backup_path
+    def backup_status(self, session_id: str) -> Dict[str, Any]:
+        """
+        Report on a session's backup archive
+
+        Returns:
+            Dict with status ("pending", "completed", "failed" or "missing"),
+            backup_path and, for failures, the error
+        """
+        for backup_format in ARCHIVE_SUFFIXES:
+            backup_path = self._backup_path(session_id, backup_format)
+            with _backup_lock:
+                job = _backup_jobs.get(str(backup_path))
+                error = _backup_failures.get(str(backup_path))
+            if job is not None:
+                # Finished jobs stay here until their done callback has run
+                if not job.done():
+                    return {'status': 'pending', 'backup_path': str(backup_path)}
+                if job.exception() is not None:
+                    error = str(job.exception())
+            if error is not None:
+                return {'status': 'failed', 'backup_path': str(backup_path), 'error': error}
+
+            if backup_path.exists():
+                return {'status': 'completed', 'backup_path': str(backup_path),
+                        'size': backup_path.stat().st_size}
+            # Written by another process that has not finished yet
+            if backup_path.with_name(backup_path.name + '.partial').exists():
+                return {'status': 'pending', 'backup_path': str(backup_path)}
+
+        return {'status': 'missing', 'backup_path': None}
 
     def list_active_sessions(self) -> List[Dict[str, Any]]:
         """List all active sessions"""
@@ -472,19 +597,20 @@ See `artifacts/` folder for all files created during this session.
         if not self.active_dir.exists():
             return sessions
 
+        stored = {info['id']: info for info in self.store.sessions()}
         for session_dir in sorted(self.active_dir.iterdir()):
             if session_dir.is_dir():
-                meta_path = session_dir / "session.yaml"
-                if meta_path.exists():
-                    with open(meta_path, 'r', encoding='utf-8') as f:
-                        meta = yaml.safe_load(f)
-                        sessions.append({
-                            'id': meta['session']['id'],
-                            'focus': meta['session']['focus'],
-                            'agent': meta['session']['agent'],
-                            'started': meta['session']['start_time'],
-                            'path': str(session_dir)
-                        })
+                info = stored.get(session_dir.name)
+                if info is None and self._ensure_stored(session_dir.name, session_dir):
+                    info = self.store.metadata(session_dir.name)['session']
+                if info is not None:
+                    sessions.append({
+                        'id': info['id'],
+                        'focus': info['focus'],
+                        'agent': info['agent'],
+                        'started': info['start_time'],
+                        'path': str(session_dir)
+                    })
 
         return sessions
 
@@ -499,18 +625,60 @@ See `artifacts/` folder for all files created during this session.
         if not session_path.exists():
             return None
 
-        meta_path = session_path / "session.yaml"
-        if not meta_path.exists():
+        if not self._ensure_stored(session_id, session_path):
             return None
+        return self.store.metadata(session_id)
+
+    def export_metadata(self, session_id: str, session_path: Optional[Path] = None) -> Optional[Path]:
+        """Rewrite a session's session.yaml from the store"""
+        if session_path is None:
+            session_path = self.active_dir / session_id
+            if not session_path.exists():
+                session_path = self.archive_dir / session_id
+        session_meta = self.store.metadata(session_id)
+        if session_meta is None or not session_path.exists():
+            return None
+
+        meta_path = session_path / "session.yaml"
+        self._write_metadata_yaml(meta_path, session_meta)
+        return meta_path
 
+    def _ensure_stored(self, session_id: str, session_path: Path) -> bool:
+        """Make sure the store knows a session, importing a pre-store session.yaml"""
+        if self.store.has_session(session_id):
+            return True
+        meta_path = session_path / "session.yaml"
+        if not meta_path.exists():
+            return False
         with open(meta_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+            self.store.import_metadata(session_id, yaml.safe_load(f))
+        return True
+
+    def _write_metadata_yaml(self, meta_path: Path, session_meta: Dict[str, Any]):
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            yaml.dump(session_meta, f, default_flow_style=False, sort_keys=False)
+
+    def create_daily_backup(
+        self,
+        progress: Optional[Callable[[int, int, str], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Create daily backup of entire project
+
+        Backups are incremental. manifest.json records the size, mtime and
+        SHA-256 of every backed-up file; files whose size and mtime match the
+        most recent earlier backup are hardlinked from it instead of copied.
+        Each day's folder is still a complete tree, but the time and space a
+        backup takes scale with what changed.
 
-    def create_daily_backup(self) -> Dict[str, Any]:
-        """Create daily backup of entire project"""
+        Args:
+            progress: Optional callback(done, total, item) called before each
+                backup item; an exception it raises aborts the backup
+        """
         date_str = datetime.now().strftime("%Y-%m-%d")
         backup_name = f"daily-backup-{date_str}"
-        backup_dir = self.backups_dir / "daily" / backup_name
+        daily_dir = self.backups_dir / "daily"
+        backup_dir = daily_dir / backup_name
 
         # Files/folders to backup
         backup_items = [
@@ -524,35 +692,187 @@ See `artifacts/` folder for all files created during this session.
             "PROJECT-STATUS.md"
         ]
 
-        backup_dir.mkdir(parents=True, exist_ok=True)
-        backed_up = []
+        base_dir, base_files = self._latest_daily_backup()
 
-        for item in backup_items:
+        # Build next to the final folder and swap it in, so a rerun on the same
+        # day can still link from the backup it replaces
+        staging_dir = daily_dir / f".{backup_name}.tmp"
+        if staging_dir.exists():
+            shutil.rmtree(staging_dir)
+        staging_dir.mkdir(parents=True)
+
+        backed_up = []
+        files = {}
+        skipped_links = []
+        copied = linked = 0
+
+        for done, item in enumerate(backup_items):
+            if progress:
+                try:
+                    progress(done, len(backup_items), item)
+                except BaseException:
+                    shutil.rmtree(staging_dir, ignore_errors=True)
+                    raise
             src = self.project_path / item
-            if src.exists():
-                dst = backup_dir / item
-                if src.is_dir():
-                    shutil.copytree(src, dst, dirs_exist_ok=True)
+            if not src.exists():
+                continue
+            for path in self._iter_backup_files(src, staging_dir, skipped_links):
+                rel = path.relative_to(self.project_path).as_posix()
+                dst = staging_dir / rel
+                stat = path.stat()
+                previous = base_files.get(rel)
+
+                if (previous is not None and previous['size'] == stat.st_size
+                        and previous['mtime_ns'] == stat.st_mtime_ns
+                        and _link_file(base_dir / rel, dst)):
+                    digest = previous['hash']
+                    linked += 1
                 else:
                     dst.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(src, dst)
-                backed_up.append(item)
+                    shutil.copy2(path, dst)
+                    digest = file_digest(dst)
+                    copied += 1
+
+                files[rel] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': digest}
+            backed_up.append(item)
 
         # Create backup manifest
         manifest = {
             'date': date_str,
             'timestamp': datetime.now().isoformat(),
             'items_backed_up': backed_up,
-            'backup_path': str(backup_dir)
+            'backup_path': str(backup_dir),
+            'base': base_dir.name if base_dir is not None else None,
+            'files_copied': copied,
+            'files_linked': linked,
+            'skipped_links': skipped_links,
+            'files': files
         }
 
-        manifest_path = backup_dir / "manifest.json"
-        with open(manifest_path, 'w', encoding='utf-8') as f:
+        with open(staging_dir / "manifest.json", 'w', encoding='utf-8') as f:
             json.dump(manifest, f, indent=2)
 
+        if backup_dir.exists():
+            replaced_dir = daily_dir / f".{backup_name}.old"
+            if replaced_dir.exists():
+                shutil.rmtree(replaced_dir)
+            backup_dir.rename(replaced_dir)
+            staging_dir.rename(backup_dir)
+            shutil.rmtree(replaced_dir)
+        else:
+            staging_dir.rename(backup_dir)
+
         return {
             'backup_date': date_str,
             'backup_path': str(backup_dir),
             'items_backed_up': len(backed_up),
-            'manifest': str(manifest_path)
+            'files_copied': copied,
+            'files_linked': linked,
+            'skipped_links': skipped_links,
+            'manifest': str(backup_dir / "manifest.json")
+        }
+
+    def verify_daily_backup(self, backup_date: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Check a daily backup's files against its manifest
+
+        Args:
+            backup_date: Backup date (YYYY-MM-DD); defaults to the latest backup
+
+        Returns:
+            Dict with the files checked, any missing or mismatched files, and
+            the links the backup skipped (cycles, repeated or dangling links)
+        """
+        daily_dir = self.backups_dir / "daily"
+        if backup_date is None:
+            candidates = sorted(daily_dir.glob("daily-backup-*")) if daily_dir.exists() else []
+            if not candidates:
+                raise ValueError("No daily backups found")
+            backup_dir = candidates[-1]
+        else:
+            backup_dir = daily_dir / f"daily-backup-{backup_date}"
+
+        manifest = self._read_backup_manifest(backup_dir)
+        if manifest is None:
+            raise ValueError(f"Backup not found: {backup_dir}")
+        if 'files' not in manifest:
+            raise ValueError(f"Backup has no file manifest (created before incremental backups): {backup_dir}")
+
+        missing = []
+        mismatched = []
+        for rel, entry in manifest['files'].items():
+            path = backup_dir / rel
+            try:
+                size = path.stat().st_size
+            except OSError:
+                missing.append(rel)
+                continue
+            if size != entry['size'] or file_digest(path) != entry['hash']:
+                mismatched.append(rel)
+
+        return {
+            'backup_date': manifest['date'],
+            'backup_path': str(backup_dir),
+            'files_checked': len(manifest['files']),
+            'missing': missing,
+            'mismatched': mismatched,
+            'skipped_links': manifest.get('skipped_links', []),
+            'verified': not missing and not mismatched
         }
+
+    def _latest_daily_backup(self):
+        """Folder and file manifest of the newest backup that has one"""
+        daily_dir = self.backups_dir / "daily"
+        if daily_dir.exists():
+            for backup_dir in sorted(daily_dir.glob("daily-backup-*"), reverse=True):
+                manifest = self._read_backup_manifest(backup_dir)
+                if manifest is not None and 'files' in manifest:
+                    return backup_dir, manifest['files']
+        return None, {}
+
+    def _read_backup_manifest(self, backup_dir: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(backup_dir / "manifest.json", 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _iter_backup_files(self, src: Path, staging_dir: Path, skipped: List[str]):
+        """Yield files under a backup item, recreating its folders (empty ones too)
+
+        Directory links are followed, as copytree did. A folder reached a
+        second time (a link cycle or a second link to the same folder) and
+        links to nothing are not backed up; their paths go to skipped.
+        """
+        if src.is_file():
+            yield src
+            return
+        visited = set()
+        for root, dirnames, filenames in os.walk(src, followlinks=True):
+            root_path = Path(root)
+            rel = root_path.relative_to(self.project_path)
+            stat = root_path.stat()
+            if (stat.st_dev, stat.st_ino) in visited:
+                skipped.append(rel.as_posix())
+                dirnames[:] = []
+                continue
+            visited.add((stat.st_dev, stat.st_ino))
+            dirnames.sort()
+
+            (staging_dir / rel).mkdir(parents=True, exist_ok=True)
+            for filename in sorted(filenames):
+                path = root_path / filename
+                if not path.exists():
+                    skipped.append((rel / filename).as_posix())
+                    continue
+                yield path
+
+
+def _link_file(src: Path, dst: Path) -> bool:
+    """Hardlink src to dst; False if the filesystem refuses (e.g. FAT, other device)"""
+    try:
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        os.link(src, dst)
+        return True
+    except OSError:
+        return False
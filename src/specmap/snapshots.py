@@ -0,0 +1,154 @@
+"""
+Checkpoint snapshots for SpecMap sessions
+Stores snapshot file contents once per hash and describes each checkpoint with a manifest
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ioctl request that makes dst share src's extents (btrfs, XFS, overlayfs on those)
+FICLONE = 0x40049409
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of a file's content"""
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+def clone_file(src: Path, dst: Path):
+    """Copy src to dst, as a copy-on-write reflink when the filesystem supports it"""
+    if fcntl is not None:
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            return
+        except OSError:
+            pass
+    shutil.copyfile(src, dst)
+
+
+class SnapshotStore:
+    """Content-addressed snapshots under a session's snapshots/ folder
+
+    File contents are kept once in snapshots/.objects/<aa>/<sha256>. A
+    checkpoint is snapshots/<checkpoint-id>.json, listing each file's hash,
+    size and mtime. Files whose size and mtime match the previous checkpoint
+    reuse its hash without being read, and contents already stored are
+    never copied again. Blobs are reflinked where possible but never
+    hardlinked, because artifacts are edited in place and a hardlink would
+    let those edits rewrite history.
+    """
+
+    def __init__(self, snapshots_dir: Path):
+        self.snapshots_dir = Path(snapshots_dir)
+        self.objects_dir = self.snapshots_dir / ".objects"
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def _manifest_path(self, checkpoint_id: str) -> Path:
+        return self.snapshots_dir / f"{checkpoint_id}.json"
+
+    def _store_blob(self, src: Path) -> str:
+        """Hash src and add it to the object store if its content is new"""
+        digest = file_digest(src)
+        blob_path = self._blob_path(digest)
+        if not blob_path.exists():
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = blob_path.with_name(f"{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+            clone_file(src, tmp_path)
+            os.replace(tmp_path, blob_path)
+        return digest
+
+    def create(self, checkpoint_id: str, files: List[Tuple[str, Path]],
+               info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Snapshot files into a new checkpoint manifest
+
+        Args:
+            checkpoint_id: Checkpoint ID (manifest file name without .json)
+            files: (recorded path, source file) pairs; the file is restored
+                under the recorded path's base name
+            info: Extra fields stored in the manifest (description, time, ...)
+
+        Returns:
+            The manifest dict
+        """
+        previous = self.latest()
+        known = {
+            entry['path']: entry for entry in (previous or {}).get('files', [])
+        }
+
+        entries = []
+        for recorded, src in files:
+            stat = src.stat()
+            entry = known.get(recorded)
+            if (entry is not None and entry['size'] == stat.st_size
+                    and entry['mtime_ns'] == stat.st_mtime_ns
+                    and self._blob_path(entry['hash']).exists()):
+                digest = entry['hash']
+            else:
+                digest = self._store_blob(src)
+            entries.append({
+                'path': recorded,
+                'name': Path(recorded).name,
+                'hash': digest,
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns
+            })
+
+        manifest = dict(info or {})
+        manifest['id'] = checkpoint_id
+        manifest['files'] = entries
+
+        self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+        manifest_path = self._manifest_path(checkpoint_id)
+        tmp_path = manifest_path.with_name(f"{manifest_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+        os.replace(tmp_path, manifest_path)
+        return manifest
+
+    def checkpoint_ids(self) -> List[str]:
+        """IDs of all manifest checkpoints, oldest first"""
+        if not self.snapshots_dir.exists():
+            return []
+        return sorted(path.stem for path in self.snapshots_dir.glob("*.json"))
+
+    def load(self, checkpoint_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._manifest_path(checkpoint_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Manifest of the most recent checkpoint, or None"""
+        checkpoint_ids = self.checkpoint_ids()
+        return self.load(checkpoint_ids[-1]) if checkpoint_ids else None
+
+    def restore(self, checkpoint_id: str, restore_to: Path) -> List[Path]:
+        """Write a checkpoint's files into restore_to; returns the restored paths"""
+        manifest = self.load(checkpoint_id)
+        if manifest is None:
+            raise FileNotFoundError(f"Checkpoint not found: {checkpoint_id}")
+
+        restore_to = Path(restore_to)
+        restore_to.mkdir(parents=True, exist_ok=True)
+        restored = []
+        for entry in manifest['files']:
+            dst = restore_to / entry['name']
+            clone_file(self._blob_path(entry['hash']), dst)
+            os.utime(dst, ns=(entry['mtime_ns'], entry['mtime_ns']))
+            restored.append(dst)
+        return restored
@@ -3,19 +3,19 @@ SpecMap Specify Command Implementation
 Creates RULEMAP-enhanced specifications with tracking IDs
 """
 
-import re
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
 
 from .structure import ProjectStructure, TemplateManager, generate_feature_id, sanitize_name
 from .config import WorkflowState
+from .index import FeatureIndex
 
 
 class SpecificationCreator:
     """Handles creation of feature specifications with RULEMAP structure"""
 
-    def __init__(self, project_path: Path):
+    def __init__(self, project_path: Path, workflow: Optional[WorkflowState] = None):
         self.project_path = Path(project_path)
         self.structure = ProjectStructure(project_path)
 
@@ -24,21 +24,15 @@ class SpecificationCreator:
         self.template_manager = TemplateManager(templates_dir)
 
         # Workflow state
-        self.workflow = WorkflowState(project_path)
-        self.workflow.load()
+        if workflow is None:
+            workflow = WorkflowState(project_path)
+            workflow.load()
+        self.workflow = workflow
+        self.index = FeatureIndex(self.project_path)
 
     def get_existing_features(self) -> List[str]:
         """Get list of existing feature IDs"""
-        features_dir = self.project_path / "01-specifications" / "features"
-        if not features_dir.exists():
-            return []
-
-        features = []
-        for item in features_dir.iterdir():
-            if item.is_dir() and re.match(r'^\d{3}-', item.name):
-                features.append(item.name)
-
-        return sorted(features)
+        return self.index.existing_features()
 
     def generate_tracking_ids(self, feature_id: str) -> Dict[str, List[str]]:
         """Generate initial tracking IDs for the feature"""
@@ -258,6 +252,7 @@ class SpecificationCreator:
         # Create clarifications and research files
         clarifications_file = self.create_clarifications_file(feature_path, feature_id)
         research_file = self.create_research_file(feature_path, feature_id)
+        self.index.update_feature(feature_id)
 
         # Update workflow state
         self.workflow.add_feature(feature_id, {
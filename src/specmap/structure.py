@@ -4,7 +4,7 @@ AI-powered specification-driven development system
 """
 
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from datetime import datetime
 
 
@@ -118,13 +118,24 @@ class TemplateManager:
 
     def __init__(self, templates_dir: Path):
         self.templates_dir = Path(templates_dir)
+        # template name -> (mtime_ns, content); long-lived managers skip re-reads
+        self._templates: Dict[str, Tuple[int, str]] = {}
 
     def get_template(self, template_name: str) -> str:
         """Load a template file"""
         template_path = self.templates_dir / f"{template_name}.md"
-        if template_path.exists():
-            return template_path.read_text(encoding='utf-8')
-        raise FileNotFoundError(f"Template not found: {template_name}")
+        try:
+            mtime_ns = template_path.stat().st_mtime_ns
+        except OSError:
+            raise FileNotFoundError(f"Template not found: {template_name}")
+
+        cached = self._templates.get(template_name)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        content = template_path.read_text(encoding='utf-8')
+        self._templates[template_name] = (mtime_ns, content)
+        return content
 
     def render_template(self, template_name: str, variables: Dict[str, str]) -> str:
         """Load and render a template with variables"""
@@ -0,0 +1,262 @@
+"""
+Task dependency graph for SpecMap
+Topological levels, critical path and slack of a task breakdown
+"""
+
+import heapq
+from collections import deque
+from typing import Dict, List, Sequence
+
+from . import metrics
+
+# Tolerance when comparing float hours along the critical path
+EPSILON = 1e-9
+
+# Priority rules for simulate(): which ready task a free worker picks up next
+PRIORITY_RULES = ("longest_path", "least_slack", "shortest_first", "task_order")
+
+
+class CycleError(ValueError):
+    """Task dependencies form a cycle"""
+
+    def __init__(self, cycle: List[str]):
+        self.cycle = cycle
+        super().__init__(f"Task dependencies form a cycle: {' -> '.join(cycle)}")
+
+
+class TaskGraph:
+    """Dependency graph of tasks scheduled with the critical path method
+
+    Edges come from each task's depends_on and blocks lists; ids that name no
+    task are ignored. Building the graph orders it topologically (Kahn) and
+    computes earliest/latest start and slack in one forward and one backward
+    pass, so everything costs O(tasks + dependencies). Times are in the unit
+    of durations (hours for TaskGenerator) and assume unlimited workers;
+    simulate() schedules the tasks on a fixed number of workers instead.
+
+    Tasks are addressed by position internally: order, predecessors and
+    successors hold indexes into ids and durations.
+    """
+
+    def __init__(self, tasks: Sequence[Dict], durations: Sequence[float]):
+        if len(durations) != len(tasks):
+            raise ValueError("Need one duration per task")
+
+        self.ids: List[str] = [task['id'] for task in tasks]
+        self.position: Dict[str, int] = {task_id: index for index, task_id in enumerate(self.ids)}
+        if len(self.position) != len(self.ids):
+            raise ValueError("Task ids must be unique")
+        self.durations: List[float] = [float(duration) for duration in durations]
+
+        edges = set()
+        for index, task in enumerate(tasks):
+            for dep_id in task.get('depends_on') or ():
+                if dep_id in self.position:
+                    edges.add((self.position[dep_id], index))
+            for blocked_id in task.get('blocks') or ():
+                if blocked_id in self.position:
+                    edges.add((index, self.position[blocked_id]))
+
+        self.predecessors: List[List[int]] = [[] for _ in self.ids]
+        self.successors: List[List[int]] = [[] for _ in self.ids]
+        for before, after in sorted(edges):
+            self.successors[before].append(after)
+            self.predecessors[after].append(before)
+
+        self.order: List[int] = self._topological_order()
+        self._schedule()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _topological_order(self) -> List[int]:
+        """Kahn's algorithm; ties keep the tasks' original order"""
+        indegree = [len(preds) for preds in self.predecessors]
+        ready = deque(index for index, degree in enumerate(indegree) if degree == 0)
+        order = []
+        while ready:
+            index = ready.popleft()
+            order.append(index)
+            for successor in self.successors[index]:
+                indegree[successor] -= 1
+                if indegree[successor] == 0:
+                    ready.append(successor)
+
+        if len(order) < len(self.ids):
+            raise CycleError(self._find_cycle(indegree))
+        return order
+
+    def _find_cycle(self, indegree: List[int]) -> List[str]:
+        """One cycle among the tasks Kahn's algorithm could not order
+
+        Each of them still has an unordered predecessor, so walking
+        predecessors from any of them must revisit a task.
+        """
+        index = next(index for index, degree in enumerate(indegree) if degree > 0)
+        seen: Dict[int, int] = {}
+        walk = []
+        while index not in seen:
+            seen[index] = len(walk)
+            walk.append(index)
+            index = next(pred for pred in self.predecessors[index] if indegree[pred] > 0)
+
+        cycle = walk[seen[index]:]
+        cycle.reverse()  # dependency order: each task depends on the one before it
+        return [self.ids[index] for index in cycle + cycle[:1]]
+
+    @metrics.timed
+    def _schedule(self):
+        """Forward pass for levels and earliest times, backward pass for latest times"""
+        count = len(self.ids)
+        durations = self.durations
+        self.level: List[int] = [0] * count
+        self.earliest_start: List[float] = [0.0] * count
+        self.earliest_finish: List[float] = [0.0] * count
+
+        for index in self.order:
+            start = 0.0
+            level = 0
+            for pred in self.predecessors[index]:
+                if self.earliest_finish[pred] > start:
+                    start = self.earliest_finish[pred]
+                if self.level[pred] >= level:
+                    level = self.level[pred] + 1
+            self.level[index] = level
+            self.earliest_start[index] = start
+            self.earliest_finish[index] = start + durations[index]
+
+        self.makespan: float = max(self.earliest_finish, default=0.0)
+
+        self.latest_start: List[float] = [0.0] * count
+        self.latest_finish: List[float] = [0.0] * count
+        for index in reversed(self.order):
+            finish = self.makespan
+            for successor in self.successors[index]:
+                if self.latest_start[successor] < finish:
+                    finish = self.latest_start[successor]
+            self.latest_finish[index] = finish
+            self.latest_start[index] = finish - durations[index]
+
+        self.slack: List[float] = [
+            latest - earliest for latest, earliest in zip(self.latest_start, self.earliest_start)
+        ]
+
+    def levels(self) -> List[List[str]]:
+        """Tasks grouped by depth; every task only depends on tasks in earlier levels"""
+        levels: List[List[str]] = [[] for _ in range(max(self.level, default=-1) + 1)]
+        for index in self.order:
+            levels[self.level[index]].append(self.ids[index])
+        return levels
+
+    def parallel_groups(self) -> List[List[str]]:
+        """Levels with more than one task, i.e. tasks that can run at the same time"""
+        return [level for level in self.levels() if len(level) > 1]
+
+    def critical_path(self) -> List[str]:
+        """Longest chain of dependent tasks; it alone determines the makespan"""
+        if not self.ids:
+            return []
+
+        # The last task (in topological order) to finish with the makespan
+        index = next(index for index in reversed(self.order)
+                     if self.earliest_finish[index] >= self.makespan - EPSILON)
+        path = [index]
+        while self.predecessors[index]:
+            start = self.earliest_start[index]
+            # The predecessor that finishes last is what held this task back
+            index = min((pred for pred in self.predecessors[index]
+                         if abs(self.earliest_finish[pred] - start) <= EPSILON),
+                        key=lambda pred: self.slack[pred], default=None)
+            if index is None:
+                break
+            path.append(index)
+
+        path.reverse()
+        return [self.ids[index] for index in path]
+
+    def schedule(self) -> Dict[str, Dict]:
+        """Per-task level, earliest/latest start and finish, slack and criticality"""
+        return {
+            task_id: {
+                'level': self.level[index],
+                'earliest_start': self.earliest_start[index],
+                'earliest_finish': self.earliest_finish[index],
+                'latest_start': self.latest_start[index],
+                'latest_finish': self.latest_finish[index],
+                'slack': self.slack[index],
+                'critical': self.slack[index] <= EPSILON
+            }
+            for index, task_id in enumerate(self.ids)
+        }
+
+    def simulate(self, workers: int, priority: str = "longest_path") -> Dict:
+        """Simulate running the tasks with a fixed number of workers
+
+        Event-driven list scheduling: whenever a worker is free it starts the
+        ready task ranked first by the priority rule, with ties broken by task
+        order. "longest_path" ranks by the longest chain of work a task still
+        heads (its duration plus everything that must follow it), which keeps
+        the critical path moving; "least_slack" by slack, "shortest_first" by
+        duration and "task_order" by position in the breakdown.
+
+        Args:
+            workers: Number of developers or agents working at the same time
+            priority: One of PRIORITY_RULES
+
+        Returns:
+            dict: Makespan, overall and per-worker utilization, and each
+                worker's timeline of {'id', 'start', 'finish'}
+        """
+        if workers < 1:
+            raise ValueError("Need at least one worker")
+        if priority not in PRIORITY_RULES:
+            raise ValueError(f"Unknown priority rule: {priority} (expected one of {', '.join(PRIORITY_RULES)})")
+
+        if priority == "longest_path":
+            keys = [latest - self.makespan for latest in self.latest_start]
+        elif priority == "least_slack":
+            keys = self.slack
+        elif priority == "shortest_first":
+            keys = self.durations
+        else:
+            keys = [0.0] * len(self.ids)
+
+        indegree = [len(preds) for preds in self.predecessors]
+        ready = [(keys[index], index) for index, degree in enumerate(indegree) if degree == 0]
+        heapq.heapify(ready)
+        idle = list(range(workers))
+        running = []  # (finish, index, worker)
+        timelines: List[List[Dict]] = [[] for _ in range(workers)]
+        busy = [0.0] * workers
+        now = 0.0
+
+        while ready or running:
+            while ready and idle:
+                _key, index = heapq.heappop(ready)
+                worker = heapq.heappop(idle)
+                finish = now + self.durations[index]
+                heapq.heappush(running, (finish, index, worker))
+                timelines[worker].append({'id': self.ids[index], 'start': now, 'finish': finish})
+                busy[worker] += self.durations[index]
+
+            # Advance to the next finish and release every task ending then
+            now = running[0][0]
+            while running and running[0][0] <= now + EPSILON:
+                _finish, index, worker = heapq.heappop(running)
+                heapq.heappush(idle, worker)
+                for successor in self.successors[index]:
+                    indegree[successor] -= 1
+                    if indegree[successor] == 0:
+                        heapq.heappush(ready, (keys[successor], successor))
+
+        makespan = now if self.ids else 0.0
+        return {
+            'workers': workers,
+            'priority': priority,
+            'makespan': makespan,
+            'critical_path_length': self.makespan,
+            'total_work': sum(self.durations),
+            'utilization': sum(busy) / (workers * makespan) if makespan else 0.0,
+            'worker_utilization': [hours / makespan if makespan else 0.0 for hours in busy],
+            'timelines': timelines
+        }
@@ -3,20 +3,54 @@ SpecMap Tasks Command Implementation
 Generate detailed task breakdown from implementation plans
 """
 
-import re
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
+from . import metrics
 from .structure import ProjectStructure, TemplateManager
 from .config import WorkflowState
 from .plan import PlanGenerator
+from .sections import SectionTree
+from .taskgraph import TaskGraph
+from .forecast import DEFAULT_SAMPLES
+from .index import FeatureIndex
+from .patterns import (
+    ESTIMATE_DAYS_PATTERN, ESTIMATE_HOURS_PATTERN, ESTIMATE_RANGE_PATTERN, PLAN_DECISION_ID_PATTERN,
+    PLAN_DECISION_PATTERN, PLAN_ENDPOINT_PATTERN, PLAN_ENTITY_PATTERN,
+    PLAN_INTEGRATION_PATTERNS, PLAN_MILESTONE_ID_PATTERN, PLAN_MILESTONE_PATTERN,
+    PLAN_PERFORMANCE_VALUE_PATTERNS, PLAN_REQUIREMENT_ID_PATTERN
+)
+
+# Three-point spread of generated estimates: (optimistic, pessimistic) as
+# multiples of the likely estimate, by the first keyword in the task type.
+# Estimates written as a range ("2-5 hours") use the range instead.
+# The multipliers are judgment calls, not fitted to data: tasks overrun more
+# often and by more than they finish early, so every spread is skewed to the
+# right, and most of all for integration work, where unknowns surface late.
+# Setup, test and documentation tasks are better understood up front. Tune
+# them to a team's recorded actuals where those exist.
+ESTIMATE_SPREAD = {
+    'Integration': (0.75, 2.5),
+    'Test': (0.75, 1.5),
+    'Setup': (0.5, 1.5),
+    'Documentation': (0.75, 1.5),
+}
+DEFAULT_ESTIMATE_SPREAD = (0.75, 2.0)
+
+# Phases generate_task_breakdown fills, in order, each by _generate_<phase>_tasks:
+# setup & prerequisites, TDD red (tests first), TDD green (implementation),
+# integration & enhancement, QA & testing, documentation & deployment
+TASK_PHASES = ('setup', 'tdd_red', 'tdd_green', 'integration', 'qa', 'docs_deploy')
+# Progress steps of generate_task_breakdown: one per phase, then scheduling
+BREAKDOWN_STEPS = len(TASK_PHASES) + 1
 
 
 class TaskGenerator:
     """Handles generation of detailed task breakdown from implementation plans"""
 
-    def __init__(self, project_path: Path):
+    def __init__(self, project_path: Path, workflow: Optional[WorkflowState] = None,
+                 plan_generator: Optional[PlanGenerator] = None):
         self.project_path = Path(project_path)
         self.structure = ProjectStructure(project_path)
 
@@ -25,24 +59,16 @@ class TaskGenerator:
         self.template_manager = TemplateManager(templates_dir)
 
         # Workflow state and plan generator
-        self.workflow = WorkflowState(project_path)
-        self.workflow.load()
-        self.plan_generator = PlanGenerator(project_path)
+        if workflow is None:
+            workflow = WorkflowState(project_path)
+            workflow.load()
+        self.workflow = workflow
+        self.plan_generator = plan_generator or PlanGenerator(project_path, workflow)
+        self.index = FeatureIndex(self.project_path)
 
     def get_features_with_plans(self) -> List[str]:
         """Get list of features that have implementation plans"""
-        features_dir = self.project_path / "02-planning" / "features"
-        if not features_dir.exists():
-            return []
-
-        features_with_plans = []
-        for item in features_dir.iterdir():
-            if item.is_dir() and re.match(r'^\d{3}-', item.name):
-                plan_file = item / "plan.md"
-                if plan_file.exists():
-                    features_with_plans.append(item.name)
-
-        return sorted(features_with_plans)
+        return self.index.features_with_plans()
 
     def analyze_implementation_plan(self, feature_id: str) -> Dict:
         """Analyze implementation plan to extract task generation information"""
@@ -54,27 +80,30 @@ class TaskGenerator:
 
         content = plan_path.read_text()
 
+        # Parse once; every extractor reads from the same section tree
+        tree = SectionTree(content)
+
         # Extract key information from plan
         analysis = {
             'feature_id': feature_id,
-            'technical_decisions': self._extract_decisions_from_plan(content),
-            'milestones': self._extract_milestones_from_plan(content),
-            'requirements_mapping': self._extract_requirements_from_plan(content),
-            'technology_stack': self._extract_technology_stack(content),
-            'complexity_indicators': self._analyze_plan_complexity(content),
-            'performance_requirements': self._extract_performance_requirements_from_plan(content),
-            'integration_points': self._extract_integration_points(content)
+            'technical_decisions': self._extract_decisions_from_plan(tree),
+            'milestones': self._extract_milestones_from_plan(tree),
+            'requirements_mapping': self._extract_requirements_from_plan(tree),
+            'technology_stack': self._extract_technology_stack(tree),
+            'complexity_indicators': self._analyze_plan_complexity(tree),
+            'performance_requirements': self._extract_performance_requirements_from_plan(tree),
+            'integration_points': self._extract_integration_points(tree)
         }
 
         return analysis
 
-    def _extract_decisions_from_plan(self, content: str) -> List[Dict]:
+    @metrics.timed
+    def _extract_decisions_from_plan(self, tree: SectionTree) -> List[Dict]:
         """Extract technical decisions from implementation plan"""
         decisions = []
 
         # Look for decision sections in the plan
-        decision_pattern = r'### (\d{3}-D-\d{3}): (.+?)\n\n\*\*Category\*\*: (.+?)\n\*\*Decision\*\*: (.+?)\n\*\*Rationale\*\*: (.+?)\n'
-        matches = re.findall(decision_pattern, content, re.DOTALL)
+        matches = PLAN_DECISION_PATTERN.findall(tree.content)
 
         for match in matches:
             decisions.append({
@@ -87,13 +116,13 @@ class TaskGenerator:
 
         return decisions
 
-    def _extract_milestones_from_plan(self, content: str) -> List[Dict]:
+    @metrics.timed
+    def _extract_milestones_from_plan(self, tree: SectionTree) -> List[Dict]:
         """Extract milestones from implementation plan"""
         milestones = []
 
         # Look for milestone sections
-        milestone_pattern = r'### (\d{3}-M-\d{3}): (.+?)\n\n\*\*Target Date\*\*: (.+?)\n\*\*Phase\*\*: (.+?)\n'
-        matches = re.findall(milestone_pattern, content, re.DOTALL)
+        matches = PLAN_MILESTONE_PATTERN.findall(tree.content)
 
         for match in matches:
             milestones.append({
@@ -105,13 +134,13 @@ class TaskGenerator:
 
         return milestones
 
-    def _extract_requirements_from_plan(self, content: str) -> List[Dict]:
+    @metrics.timed
+    def _extract_requirements_from_plan(self, tree: SectionTree) -> List[Dict]:
         """Extract requirements mapping from plan"""
         requirements = []
 
         # Look for requirement references
-        req_pattern = r'(\d{3}-R-\d{3})'
-        req_matches = re.findall(req_pattern, content)
+        req_matches = PLAN_REQUIREMENT_ID_PATTERN.findall(tree.content)
 
         for req_id in set(req_matches):  # Remove duplicates
             requirements.append({
@@ -122,7 +151,8 @@ class TaskGenerator:
 
         return requirements
 
-    def _extract_technology_stack(self, content: str) -> Dict:
+    @metrics.timed
+    def _extract_technology_stack(self, tree: SectionTree) -> Dict:
         """Extract technology stack information from plan"""
         stack = {
             'language': '',
@@ -132,12 +162,12 @@ class TaskGenerator:
             'deployment': ''
         }
 
-        # Look for technology stack section
-        if 'technology_stack:' in content.lower():
-            lines = content.split('\n')
+        # Look for technology stack section, starting at its first mention
+        stack_offset = tree.lower.find('technology_stack:')
+        if stack_offset != -1:
             in_stack_section = False
 
-            for line in lines:
+            for line in tree.lines[tree.line_at(stack_offset):]:
                 if 'technology_stack:' in line.lower():
                     in_stack_section = True
                     continue
@@ -157,17 +187,21 @@ class TaskGenerator:
 
         return stack
 
-    def _analyze_plan_complexity(self, content: str) -> Dict:
+    @metrics.timed
+    def _analyze_plan_complexity(self, tree: SectionTree) -> Dict:
         """Analyze complexity indicators from the plan"""
+        content = tree.content
+        content_lower = tree.lower
+
         complexity = {
-            'has_database': 'database' in content.lower() or 'model' in content.lower(),
-            'has_api': 'api' in content.lower() or 'endpoint' in content.lower(),
-            'has_auth': 'auth' in content.lower() or 'login' in content.lower(),
-            'has_external_integrations': 'integration' in content.lower() or 'external' in content.lower(),
-            'entity_count': len(re.findall(r'entity', content, re.IGNORECASE)),
-            'endpoint_count': len(re.findall(r'endpoint|api', content, re.IGNORECASE)),
-            'decision_count': len(re.findall(r'\d{3}-D-\d{3}', content)),
-            'milestone_count': len(re.findall(r'\d{3}-M-\d{3}', content))
+            'has_database': 'database' in content_lower or 'model' in content_lower,
+            'has_api': 'api' in content_lower or 'endpoint' in content_lower,
+            'has_auth': 'auth' in content_lower or 'login' in content_lower,
+            'has_external_integrations': 'integration' in content_lower or 'external' in content_lower,
+            'entity_count': len(PLAN_ENTITY_PATTERN.findall(content)),
+            'endpoint_count': len(PLAN_ENDPOINT_PATTERN.findall(content)),
+            'decision_count': len(PLAN_DECISION_ID_PATTERN.findall(content)),
+            'milestone_count': len(PLAN_MILESTONE_ID_PATTERN.findall(content))
         }
 
         # Calculate complexity score
@@ -183,7 +217,8 @@ class TaskGenerator:
 
         return complexity
 
-    def _extract_performance_requirements_from_plan(self, content: str) -> Dict:
+    @metrics.timed
+    def _extract_performance_requirements_from_plan(self, tree: SectionTree) -> Dict:
         """Extract performance requirements from plan"""
         performance = {
             'response_time': '',
@@ -192,59 +227,39 @@ class TaskGenerator:
             'availability': ''
         }
 
-        # Look for performance section
-        lines = content.split('\n')
-        in_performance = False
-
-        for line in lines:
-            if 'performance' in line.lower() and ':' in line:
-                in_performance = True
-                continue
-            elif in_performance and line.strip().startswith('#'):
-                in_performance = False
-
-            if in_performance:
-                if 'response' in line.lower() or 'latency' in line.lower():
-                    performance['response_time'] = self._extract_performance_value(line)
-                elif 'throughput' in line.lower() or 'req/s' in line.lower():
-                    performance['throughput'] = self._extract_performance_value(line)
-                elif 'concurrent' in line.lower() or 'users' in line.lower():
-                    performance['concurrent_users'] = self._extract_performance_value(line)
-                elif 'uptime' in line.lower() or 'availability' in line.lower():
-                    performance['availability'] = self._extract_performance_value(line)
+        # Look for performance blocks (a "performance:" line up to the next heading)
+        for index in tree.blocks('performance', lambda line_lower: ':' in line_lower):
+            line_lower = tree.lower_lines[index]
+            line = tree.lines[index]
+            if 'response' in line_lower or 'latency' in line_lower:
+                performance['response_time'] = self._extract_performance_value(line)
+            elif 'throughput' in line_lower or 'req/s' in line_lower:
+                performance['throughput'] = self._extract_performance_value(line)
+            elif 'concurrent' in line_lower or 'users' in line_lower:
+                performance['concurrent_users'] = self._extract_performance_value(line)
+            elif 'uptime' in line_lower or 'availability' in line_lower:
+                performance['availability'] = self._extract_performance_value(line)
 
         return performance
 
     def _extract_performance_value(self, line: str) -> str:
         """Extract performance value from line"""
         # Look for patterns like <200ms, 99.9%, 1000 req/s, etc.
-        patterns = [
-            r'<(\d+(?:\.\d+)?\s*(?:ms|s))',  # <200ms
-            r'(\d+(?:\.\d+)?%)',             # 99.9%
-            r'(\d+(?:\.\d+)?\s*(?:req/s|rps))',  # 1000 req/s
-            r'(\d+[kK]\s*(?:users|concurrent))'   # 10k users
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, line)
+        for pattern in PLAN_PERFORMANCE_VALUE_PATTERNS:
+            match = pattern.search(line)
             if match:
                 return match.group(1)
 
         return ''
 
-    def _extract_integration_points(self, content: str) -> List[Dict]:
+    @metrics.timed
+    def _extract_integration_points(self, tree: SectionTree) -> List[Dict]:
         """Extract external integration points from plan"""
         integrations = []
 
         # Look for integration mentions
-        integration_patterns = [
-            r'integrate with (.+?)(?:\n|$)',
-            r'external (.+?) integration',
-            r'(\w+) service integration'
-        ]
-
-        for pattern in integration_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
+        for pattern in PLAN_INTEGRATION_PATTERNS:
+            matches = pattern.findall(tree.content)
             for match in matches:
                 if isinstance(match, tuple):
                     match = match[0]
@@ -255,58 +270,48 @@ class TaskGenerator:
 
         return integrations
 
-    def generate_task_breakdown(self, feature_id: str, analysis: Dict) -> Dict:
-        """Generate comprehensive task breakdown"""
+    def generate_task_breakdown(self, feature_id: str, analysis: Dict,
+                                progress: Optional[Callable[[int, int, str], None]] = None) -> Dict:
+        """Generate comprehensive task breakdown
+
+        progress, if given, is called as progress(done, total, step) before
+        each phase's tasks are generated and before scheduling; an exception
+        it raises aborts the breakdown.
+        """
 
         feature_num = feature_id.split('-')[0]
         task_counter = 1
-        tasks = {
-            'setup': [],
-            'tdd_red': [],
-            'tdd_green': [],
-            'integration': [],
-            'qa': [],
-            'docs_deploy': []
-        }
-
-        # Phase 0: Setup & Prerequisites
-        tasks['setup'] = self._generate_setup_tasks(feature_num, task_counter, analysis)
-        task_counter += len(tasks['setup'])
-
-        # Phase 1: TDD Red Phase (Tests First)
-        tasks['tdd_red'] = self._generate_tdd_red_tasks(feature_num, task_counter, analysis)
-        task_counter += len(tasks['tdd_red'])
-
-        # Phase 2: TDD Green Phase (Implementation)
-        tasks['tdd_green'] = self._generate_tdd_green_tasks(feature_num, task_counter, analysis)
-        task_counter += len(tasks['tdd_green'])
-
-        # Phase 3: Integration & Enhancement
-        tasks['integration'] = self._generate_integration_tasks(feature_num, task_counter, analysis)
-        task_counter += len(tasks['integration'])
-
-        # Phase 4: QA & Testing
-        tasks['qa'] = self._generate_qa_tasks(feature_num, task_counter, analysis)
-        task_counter += len(tasks['qa'])
-
-        # Phase 5: Documentation & Deployment
-        tasks['docs_deploy'] = self._generate_docs_deploy_tasks(feature_num, task_counter, analysis)
+        tasks = {}
+        for done, phase in enumerate(TASK_PHASES):
+            if progress:
+                progress(done, BREAKDOWN_STEPS, f"Generating {phase} tasks")
+            tasks[phase] = getattr(self, f"_generate_{phase}_tasks")(feature_num, task_counter, analysis)
+            task_counter += len(tasks[phase])
 
         # Calculate dependencies and parallel execution
+        if progress:
+            progress(BREAKDOWN_STEPS - 1, BREAKDOWN_STEPS, "Scheduling tasks")
         all_tasks = []
         for phase_tasks in tasks.values():
             all_tasks.extend(phase_tasks)
 
         self._calculate_dependencies(all_tasks)
         self._mark_parallel_execution(all_tasks)
+        for task in all_tasks:
+            task['estimate_range'] = self._three_point_estimate(task)
+        graph = self.build_task_graph(all_tasks)
+        self._annotate_schedule(all_tasks, graph)
 
         return {
             'feature_id': feature_id,
             'tasks_by_phase': tasks,
             'all_tasks': all_tasks,
             'total_tasks': len(all_tasks),
-            'estimated_duration': self._calculate_total_duration(all_tasks),
-            'parallel_groups': self._identify_parallel_groups(all_tasks)
+            'estimated_duration': self._calculate_total_duration(graph),
+            'parallel_groups': graph.parallel_groups(),
+            'critical_path': graph.critical_path(),
+            'critical_path_hours': graph.makespan,
+            'effort_hours': sum(graph.durations)
         }
 
     def _generate_setup_tasks(self, feature_num: str, start_counter: int, analysis: Dict) -> List[Dict]:
@@ -837,49 +842,141 @@ class TaskGenerator:
 
             task['parallel'] = can_be_parallel
 
-    def _calculate_total_duration(self, tasks: List[Dict]) -> int:
-        """Calculate estimated total duration in days"""
-        total_hours = 0
+    def simulate_schedule(self, feature_id: str, workers: int, priority: str = "longest_path") -> Dict:
+        """Simulate a feature's task breakdown on a number of workers
 
-        for task in tasks:
-            estimate = task.get('estimated', '1 hour')
-            hours = self._parse_time_estimate(estimate)
-            total_hours += hours
+        The breakdown is generated from the implementation plan as
+        generate_tasks_for_feature would; tasks.md is not written.
+
+        Args:
+            feature_id: Feature with an implementation plan
+            workers: Number of developers or agents working at the same time
+            priority: Rule from taskgraph.PRIORITY_RULES for picking the next task
 
-        # Convert to days (assuming 8 hours per day)
-        return max(1, int(total_hours / 8))
+        Returns:
+            dict: TaskGraph.simulate() result plus the makespan in days
+        """
+        if not self.index.update_feature(feature_id)['has_plan']:
+            raise ValueError(f"No implementation plan found for feature '{feature_id}'. Run 'specmap plan' first.")
+
+        analysis = self.analyze_implementation_plan(feature_id)
+        task_breakdown = self.generate_task_breakdown(feature_id, analysis)
+        schedule = self.build_task_graph(task_breakdown['all_tasks']).simulate(workers, priority)
+
+        schedule['feature_id'] = feature_id
+        schedule['total_tasks'] = task_breakdown['total_tasks']
+        schedule['estimated_duration'] = self._hours_to_days(schedule['makespan'])
+        return schedule
+
+    def forecast_completion(self, feature_ids: Optional[List[str]] = None, samples: int = DEFAULT_SAMPLES,
+                            distribution: str = "pert", seed: Optional[int] = None) -> Dict:
+        """Monte Carlo forecast of when features' tasks are complete
+
+        Task durations are drawn from their three-point estimates. Like
+        estimated_duration, the forecast assumes unlimited workers, so several
+        features run side by side and finish with the last of them.
+
+        Args:
+            feature_ids: Features to forecast (default: every feature with a plan)
+            samples: Number of Monte Carlo samples
+            distribution: "pert" or "triangular"
+            seed: Seed for reproducible forecasts
+
+        Returns:
+            dict: P50/P80/P95 completion in hours and days, the duration with
+                likely estimates and sample statistics
+        """
+        from . import forecast
+
+        if feature_ids is None:
+            feature_ids = self.get_features_with_plans()
+        for feature_id in feature_ids:
+            if not self.index.update_feature(feature_id)['has_plan']:
+                raise ValueError(f"No implementation plan found for feature '{feature_id}'. Run 'specmap plan' first.")
+        if not feature_ids:
+            raise ValueError("No implementation plans found. Run 'specmap plan' first.")
+
+        graphs = []
+        total_tasks = 0
+        likely_hours = 0.0
+        for feature_id in feature_ids:
+            tasks = self.generate_task_breakdown(feature_id, self.analyze_implementation_plan(feature_id))['all_tasks']
+            graph = self.build_task_graph(tasks)
+            ranges = [task['estimate_range'] for task in tasks]
+            graphs.append((graph, [estimate['optimistic'] for estimate in ranges],
+                           [estimate['likely'] for estimate in ranges],
+                           [estimate['pessimistic'] for estimate in ranges]))
+            total_tasks += len(tasks)
+            likely_hours = max(likely_hours, graph.makespan)
+
+        result = forecast.forecast(graphs, samples, distribution, seed)
+        result['feature_ids'] = list(feature_ids)
+        result['total_tasks'] = total_tasks
+        result['likely_hours'] = likely_hours
+        result['percentile_days'] = {name: round(hours / 8, 1) for name, hours in result['percentiles'].items()}
+        return result
+
+    def build_task_graph(self, tasks: List[Dict]) -> TaskGraph:
+        """Dependency graph of tasks weighted by their estimates in hours
+
+        Raises:
+            CycleError: If the dependencies form a cycle
+        """
+        return TaskGraph(tasks, [self._parse_time_estimate(task.get('estimated', '1 hour')) for task in tasks])
+
+    def _annotate_schedule(self, tasks: List[Dict], graph: TaskGraph):
+        """Record each task's level, earliest/latest start and slack (in hours)"""
+        for index, task in enumerate(tasks):
+            task['level'] = graph.level[index]
+            task['earliest_start'] = round(graph.earliest_start[index], 2)
+            task['latest_start'] = round(graph.latest_start[index], 2)
+            task['slack'] = round(graph.slack[index], 2)
+
+    def _calculate_total_duration(self, graph: TaskGraph) -> int:
+        """Calculate estimated total duration in days
+
+        Tasks off the critical path run alongside it, so the duration is the
+        length of the critical path rather than the sum of all estimates.
+        """
+        return self._hours_to_days(graph.makespan)
+
+    def _hours_to_days(self, hours: float) -> int:
+        """Convert hours of work to days (assuming 8 hours per day)"""
+        return max(1, int(hours / 8))
+
+    def _three_point_estimate(self, task: Dict) -> Dict[str, float]:
+        """Optimistic, likely and pessimistic hours of a task"""
+        if task.get('estimate_range'):
+            return task['estimate_range']
+
+        estimate = task.get('estimated', '1 hour').lower()
+        range_match = ESTIMATE_RANGE_PATTERN.search(estimate)
+        if range_match:
+            unit = 8 if range_match.group(3) == 'day' else 1
+            low, high = sorted(float(value) * unit for value in range_match.group(1, 2))
+            return {'optimistic': low, 'likely': (low + high) / 2, 'pessimistic': high}
+
+        likely = self._parse_time_estimate(estimate)
+        optimistic, pessimistic = next(
+            (spread for keyword, spread in ESTIMATE_SPREAD.items() if keyword in task.get('type', '')),
+            DEFAULT_ESTIMATE_SPREAD
+        )
+        return {'optimistic': likely * optimistic, 'likely': likely, 'pessimistic': likely * pessimistic}
 
     def _parse_time_estimate(self, estimate: str) -> float:
         """Parse time estimate string to hours"""
         estimate = estimate.lower()
 
+        # A range ("2-5 hours") counts as its upper bound; _three_point_estimate reads both ends
         if 'hour' in estimate:
-            hours_match = re.search(r'(\d+(?:\.\d+)?)\s*hour', estimate)
+            hours_match = ESTIMATE_HOURS_PATTERN.search(estimate)
             return float(hours_match.group(1)) if hours_match else 1.0
         elif 'day' in estimate:
-            days_match = re.search(r'(\d+(?:\.\d+)?)\s*day', estimate)
+            days_match = ESTIMATE_DAYS_PATTERN.search(estimate)
             return float(days_match.group(1)) * 8 if days_match else 8.0
         else:
             return 1.0
 
-    def _identify_parallel_groups(self, tasks: List[Dict]) -> List[List[str]]:
-        """Identify groups of tasks that can run in parallel"""
-        parallel_groups = []
-        current_group = []
-
-        for task in tasks:
-            if task.get('parallel', False):
-                current_group.append(task['id'])
-            else:
-                if current_group:
-                    parallel_groups.append(current_group)
-                    current_group = []
-
-        if current_group:
-            parallel_groups.append(current_group)
-
-        return parallel_groups
-
     def create_tasks_document(self, feature_id: str, task_breakdown: Dict) -> str:
         """Create the tasks.md document"""
 
@@ -942,14 +1039,22 @@ class TaskGenerator:
 - **Type**: {task['type']}
 - **File**: {task['file']}
 - **Description**: {task['description']}
-- **Estimated**: {task['estimated']}
+- **Estimated**: {task['estimated']}{self._format_range(task)}
 - **Implements**: {task.get('implements', 'N/A')}
 - **Depends on**: {', '.join(task.get('depends_on', []))}
+- **Slack**: {task.get('slack', 0)} hours
 - **Status**: {task['status']}
 
 """
         return content
 
+    def _format_range(self, task: Dict) -> str:
+        """' (1.5-4 hours)' for a task's three-point estimate, if it has one"""
+        estimate = task.get('estimate_range')
+        if not estimate:
+            return ""
+        return f" ({estimate['optimistic']:g}-{estimate['pessimistic']:g} hours)"
+
     def _create_basic_tasks_document(self, feature_id: str, task_breakdown: Dict) -> str:
         """Create basic tasks document if template is not available"""
 
@@ -978,7 +1083,7 @@ class TaskGenerator:
                     parallel_marker = "[P] " if task.get('parallel', False) else ""
                     content += f"- **{task['id']}**: {parallel_marker}{task['title']}\n"
                     content += f"  - File: {task['file']}\n"
-                    content += f"  - Estimated: {task['estimated']}\n"
+                    content += f"  - Estimated: {task['estimated']}{self._format_range(task)}\n"
                     if task.get('depends_on'):
                         content += f"  - Depends on: {', '.join(task['depends_on'])}\n"
                     content += "\n"
@@ -990,6 +1095,8 @@ class TaskGenerator:
 
 - **Total Tasks**: {task_breakdown['total_tasks']}
 - **Estimated Duration**: {task_breakdown['estimated_duration']} days
+- **Total Effort**: {task_breakdown['effort_hours']:g} hours
+- **Critical Path**: {' -> '.join(task_breakdown['critical_path'])} ({task_breakdown['critical_path_hours']:g} hours)
 - **Parallel Groups**: {len(task_breakdown['parallel_groups'])}
 
 **Status**: Ready for implementation
@@ -997,30 +1104,47 @@ class TaskGenerator:
 
         return content
 
-    def generate_tasks_for_feature(self, feature_id: str) -> Dict:
-        """Generate complete task breakdown for a feature"""
+    def generate_tasks_for_feature(self, feature_id: str,
+                                   progress: Optional[Callable[[int, int, str], None]] = None) -> Dict:
+        """Generate complete task breakdown for a feature
+
+        progress, if given, is called as progress(done, total, step) before
+        the plan is analyzed, before each task phase and before tasks.md is
+        written, with one total for the whole breakdown; an exception it
+        raises aborts the breakdown.
+        """
+        # Plan analysis, the breakdown, then writing tasks.md
+        steps = 1 + BREAKDOWN_STEPS + 1
+
+        def breakdown_progress(done: int, total: int, step: str):
+            progress(1 + done, steps, step)
 
-        # Validate feature has implementation plan
-        features_with_plans = self.get_features_with_plans()
-        if feature_id not in features_with_plans:
+        # Validate feature has implementation plan (re-stat it: plans may be written by hand)
+        if not self.index.update_feature(feature_id)['has_plan']:
             raise ValueError(f"No implementation plan found for feature '{feature_id}'. Run 'specmap plan' first.")
 
         # Analyze implementation plan
+        if progress:
+            progress(0, steps, "Analyzing implementation plan")
         analysis = self.analyze_implementation_plan(feature_id)
 
         # Generate task breakdown
-        task_breakdown = self.generate_task_breakdown(feature_id, analysis)
+        task_breakdown = self.generate_task_breakdown(feature_id, analysis,
+                                                      breakdown_progress if progress else None)
 
         # Create tasks document
+        if progress:
+            progress(steps - 1, steps, "Writing tasks.md")
         tasks_file = self.create_tasks_document(feature_id, task_breakdown)
+        self.index.update_feature(feature_id)
 
         # Update workflow state
-        feature_data = self.workflow.get_feature(feature_id) or {}
-        feature_data['status'] = 'tasks_generated'
-        feature_data['tasks_created'] = datetime.now().isoformat()
-        feature_data['total_tasks'] = task_breakdown['total_tasks']
-        feature_data['estimated_duration'] = task_breakdown['estimated_duration']
-        self.workflow.add_feature(feature_id, feature_data)
+        self.workflow.modify_feature(feature_id, {
+            'status': 'tasks_generated',
+            'tasks_created': datetime.now().isoformat(),
+            'total_tasks': task_breakdown['total_tasks'],
+            'estimated_duration': task_breakdown['estimated_duration']
+        })
 
         # Update project phase
         self.workflow.update_phase('task_generation')
@@ -1032,5 +1156,7 @@ class TaskGenerator:
             'estimated_duration': task_breakdown['estimated_duration'],
             'tasks_by_phase': {phase: len(tasks) for phase, tasks in task_breakdown['tasks_by_phase'].items()},
             'parallel_groups': len(task_breakdown['parallel_groups']),
+            'max_parallelism': max((len(group) for group in task_breakdown['parallel_groups']), default=1),
+            'critical_path': task_breakdown['critical_path'],
             'analysis': analysis
         }
\ No newline at end of file
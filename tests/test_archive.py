@@ -0,0 +1,183 @@
+"""
+Tests for the session archive writer
+"""
+
+import io
+import os
+import tarfile
+import time
+import zipfile
+import pytest
+from pathlib import Path
+import tempfile
+import shutil
+
+from specmap.archive import create_archive, write_zip
+from specmap.sessions import SessionManager, _backup_jobs
+
+
+@pytest.fixture
+def source():
+    """Create a folder with text, an already-compressed file and an empty folder"""
+    temp_dir = Path(tempfile.mkdtemp())
+    folder = temp_dir / "session"
+    (folder / "notes").mkdir(parents=True)
+    (folder / "decisions").mkdir()
+    (folder / "notes" / "a.md").write_text("notes " * 2000)
+    (folder / "README.md").write_text("# Session\n")
+    (folder / "image.png").write_bytes(os.urandom(4096))
+    yield folder
+    shutil.rmtree(temp_dir)
+
+
+def read_tree(folder: Path) -> dict:
+    return {
+        path.relative_to(folder).as_posix(): path.read_bytes()
+        for path in folder.rglob("*") if path.is_file()
+    }
+
+
+class TestArchive:
+    """Test zip and tar.zst archive writing"""
+
+    def test_zip_round_trip(self, source):
+        """Test that the zip is valid, complete and stores compressed types as-is"""
+        dest = source.parent / "out.zip"
+        write_zip(source, dest, workers=3)
+
+        with zipfile.ZipFile(dest) as archive:
+            assert archive.testzip() is None
+            infos = {info.filename: info for info in archive.infolist()}
+            assert "decisions/" in infos
+            assert infos["image.png"].compress_type == zipfile.ZIP_STORED
+            assert infos["notes/a.md"].compress_type == zipfile.ZIP_DEFLATED
+            for name, content in read_tree(source).items():
+                assert archive.read(name) == content
+
+            # DOS timestamps have two-second resolution
+            mtime = (source / "README.md").stat().st_mtime
+            assert infos["README.md"].date_time[:5] == time.localtime(mtime)[:5]
+
+    def test_large_members_are_streamed(self, source, monkeypatch):
+        """Test that files over the streaming threshold are written in chunks with valid headers"""
+        monkeypatch.setattr('specmap.archive.STREAM_MEMBER_SIZE', 1000)
+        monkeypatch.setattr('specmap.archive.STREAM_CHUNK_SIZE', 333)
+        dest = source.parent / "out.zip"
+        write_zip(source, dest, workers=2)
+
+        with zipfile.ZipFile(dest) as archive:
+            assert archive.testzip() is None
+            infos = {info.filename: info for info in archive.infolist()}
+            assert infos["image.png"].compress_type == zipfile.ZIP_STORED
+            assert infos["notes/a.md"].compress_type == zipfile.ZIP_DEFLATED
+            assert infos["notes/a.md"].compress_size < infos["notes/a.md"].file_size
+            for name, content in read_tree(source).items():
+                assert archive.read(name) == content
+
+    def test_create_archive_is_atomic(self, source, monkeypatch):
+        """Test that a failed archive leaves neither a final nor a partial file"""
+        base = source.parent / "backup"
+
+        def fail(*args):
+            raise OSError("disk full")
+
+        monkeypatch.setattr('specmap.archive.write_zip', fail)
+        with pytest.raises(OSError):
+            create_archive(source, base)
+        assert list(source.parent.glob("backup*")) == []
+
+        with pytest.raises(ValueError):
+            create_archive(source, base, 'rar')
+
+    def test_tar_zst_round_trip(self, source):
+        """Test the zstd-compressed tar format"""
+        zstandard = pytest.importorskip('zstandard')
+        dest = create_archive(source, source.parent / "backup", 'tar.zst')
+        assert dest.name == "backup.tar.zst"
+
+        data = zstandard.ZstdDecompressor().stream_reader(dest.read_bytes()).read()
+        with tarfile.open(fileobj=io.BytesIO(data)) as archive:
+            names = archive.getnames()
+            assert "decisions" in names
+            assert archive.extractfile("notes/a.md").read() == (source / "notes" / "a.md").read_bytes()
+
+    def test_end_session_backs_up_in_background(self, source):
+        """Test that end_session can return before the backup exists"""
+        project = source.parent / "project"
+        manager = SessionManager(project)
+        session_id = manager.start_session("archive")['session_id']
+
+        result = manager.end_session(session_id, create_backup=True, background=True)
+        assert result['backup_status'] == 'pending'
+        assert result['backup_path'].endswith(f"{session_id}-backup.zip")
+
+        for _ in range(200):
+            status = manager.backup_status(session_id)
+            if status['status'] != 'pending':
+                break
+            time.sleep(0.05)
+        assert status['status'] == 'completed'
+        assert status['backup_path'] == result['backup_path']
+
+        with zipfile.ZipFile(result['backup_path']) as archive:
+            assert "session.yaml" in archive.namelist()
+        assert manager.backup_status("unknown-session")['status'] == 'missing'
+
+        # The job is forgotten once it finishes, just after the archive appears
+        for _ in range(200):
+            if result['backup_path'] not in _backup_jobs:
+                break
+            time.sleep(0.01)
+        assert result['backup_path'] not in _backup_jobs
+
+    def test_failed_background_backup_is_reported(self, source, monkeypatch):
+        """Test that a failed backup's job is dropped but its error is kept"""
+        project = source.parent / "project"
+        manager = SessionManager(project)
+        session_id = manager.start_session("archive")['session_id']
+
+        def fail(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr('specmap.sessions.create_archive', fail)
+        result = manager.end_session(session_id, create_backup=True, background=True)
+
+        for _ in range(200):
+            status = manager.backup_status(session_id)
+            if status['status'] != 'pending':
+                break
+            time.sleep(0.05)
+        assert status == {'status': 'failed', 'backup_path': result['backup_path'], 'error': "disk full"}
+        assert result['backup_path'] not in _backup_jobs
+
+    def test_end_session_progress_and_abort(self, source):
+        """Test that end_session reports each step and an abort leaves no partial backup"""
+        project = source.parent / "project"
+        manager = SessionManager(project)
+        session_id = manager.start_session("archive")['session_id']
+        calls = []
+
+        def abort(done, total, message):
+            calls.append(message)
+            if message == "Backing up session.yaml":
+                raise KeyboardInterrupt()
+
+        with pytest.raises(KeyboardInterrupt):
+            manager.end_session(session_id, progress=abort)
+        assert calls[:2] == ["Closing session", "Moving session to archive"]
+        assert (manager.archive_dir / session_id / "session.yaml").exists()
+        assert list((manager.backups_dir / "sessions").iterdir()) == []
+
+    def test_end_session_progress_never_decreases(self, source):
+        """Test that closing, archiving and backing up share one total and never go back"""
+        project = source.parent / "project"
+        manager = SessionManager(project)
+        session_id = manager.start_session("archive")['session_id']
+        (manager.active_dir / session_id / "notes.md").write_text("notes\n")
+        calls = []
+
+        manager.end_session(session_id, progress=lambda done, total, message: calls.append((done, total)))
+
+        totals = {total for _, total in calls}
+        assert len(totals) == 1
+        assert [done for done, _ in calls] == list(range(totals.pop()))
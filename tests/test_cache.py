@@ -0,0 +1,229 @@
+"""
+Tests for on-disk caching of derived specification data
+"""
+
+import os
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import tempfile
+import shutil
+
+from specmap.cache import FileCache
+from specmap.plan import PlanGenerator
+from specmap.clarify import ClarificationProcessor
+
+
+SPEC_CONTENT = """# Feature Specification: Login
+
+## L - LOGIC & STRUCTURE
+
+### Functional Requirements
+- **FR-001**: System MUST allow users to log in
+- **FR-002**: System MUST lock accounts after failed attempts
+
+### Dependencies
+- Identity provider
+"""
+
+APPROVED_SPEC = """# Feature Specification: Export
+
+## R - Role & Authority
+Specification owner and technical authority: platform team.
+
+## U - Understanding & Objectives
+Problem statement, user scenarios and acceptance scenarios are agreed.
+
+## L - Logic & Structure
+Functional requirements and implementation sequence are listed.
+
+## E - Elements & Specifications
+Technical constraints and acceptance criteria are listed.
+
+## M - Mood & Experience
+User experience goals and emotional journey are described.
+
+## A - Audience & Stakeholders
+Primary users and stakeholder matrix are known.
+
+## P - Performance & Metrics
+Business KPIs and technical performance targets are set.
+"""
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory"""
+    temp_dir = tempfile.mkdtemp()
+    yield Path(temp_dir)
+    shutil.rmtree(temp_dir)
+
+
+class TestFileCache:
+    """Test FileCache class"""
+
+    def test_miss_then_hit(self, temp_dir):
+        """Test that a stored value is returned for an unchanged source"""
+        source = temp_dir / "spec.md"
+        source.write_text("hello")
+        cache = FileCache(temp_dir / "cache", "1")
+
+        assert cache.get("feature", source) is None
+        cache.put("feature", source, "hello", {'answer': 42})
+        assert cache.get("feature", source) == {'answer': 42}
+
+    def test_content_change_invalidates(self, temp_dir):
+        """Test that editing the source invalidates the entry"""
+        source = temp_dir / "spec.md"
+        source.write_text("hello")
+        cache = FileCache(temp_dir / "cache", "1")
+        cache.put("feature", source, "hello", [1, 2, 3])
+
+        source.write_text("hello, world")
+        assert cache.get("feature", source) is None
+
+    def test_touch_with_same_content_still_hits(self, temp_dir):
+        """Test that a new mtime alone falls back to the content hash"""
+        source = temp_dir / "spec.md"
+        source.write_text("hello")
+        cache = FileCache(temp_dir / "cache", "1")
+        cache.put("feature", source, "hello", "value")
+
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+        assert cache.get("feature", source) == "value"
+
+    def test_concurrent_writers(self, temp_dir):
+        """Test that threads writing the same entry never corrupt it"""
+        source = temp_dir / "spec.md"
+        source.write_text("hello")
+        cache = FileCache(temp_dir / "cache", "1")
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda i: cache.put("feature", source, "hello", i), range(200)))
+
+        assert cache.get("feature", source) in range(200)
+        assert not list((temp_dir / "cache").glob("*.tmp"))
+
+    def test_version_change_invalidates(self, temp_dir):
+        """Test that a parser version bump ignores old entries"""
+        source = temp_dir / "spec.md"
+        source.write_text("hello")
+        FileCache(temp_dir / "cache", "1").put("feature", source, "hello", "old")
+
+        assert FileCache(temp_dir / "cache", "2").get("feature", source) is None
+
+
+class TestAnalysisCache:
+    """Test that PlanGenerator caches specification analysis on disk"""
+
+    def test_analysis_is_cached_and_refreshed(self, temp_dir):
+        """Test that analysis survives across generators and tracks edits"""
+        spec_dir = temp_dir / "01-specifications" / "features" / "001-login"
+        spec_dir.mkdir(parents=True)
+        spec_file = spec_dir / "spec.md"
+        spec_file.write_text(SPEC_CONTENT)
+
+        analysis = PlanGenerator(temp_dir).analyze_specification("001-login")
+        assert len(analysis['functional_requirements']) == 2
+        assert (temp_dir / ".specmap" / "cache" / "analysis" / "001-login.json").exists()
+
+        # A fresh generator (e.g. another process) reads the cached analysis
+        assert PlanGenerator(temp_dir).analyze_specification("001-login") == analysis
+
+        spec_file.write_text(SPEC_CONTENT.replace(
+            "\n\n### Dependencies",
+            "\n- **FR-003**: System MUST support logout\n\n### Dependencies"
+        ))
+        refreshed = PlanGenerator(temp_dir).analyze_specification("001-login")
+        assert len(refreshed['functional_requirements']) == 3
+
+
+    def test_plan_progress_never_decreases(self, temp_dir):
+        """Test that planning reports one total, with or without a cached analysis"""
+        (temp_dir / ".specmap").mkdir()
+        spec_dir = temp_dir / "01-specifications" / "features" / "001-export"
+        spec_dir.mkdir(parents=True)
+        (spec_dir / "spec.md").write_text(APPROVED_SPEC)
+
+        for _ in range(2):
+            calls = []
+            PlanGenerator(temp_dir).generate_implementation_plan(
+                "001-export", progress=lambda done, total, message: calls.append((done, total)))
+
+            totals = {total for _, total in calls}
+            assert len(totals) == 1
+            done = [d for d, _ in calls]
+            assert done == sorted(done)
+            assert done[-1] < totals.pop()
+
+
+class TestScoreCache:
+    """Test persisted RULEMAP scores"""
+
+    def _write_spec(self, project: Path, feature_id: str, content: str) -> Path:
+        spec_dir = project / "01-specifications" / "features" / feature_id
+        spec_dir.mkdir(parents=True, exist_ok=True)
+        spec_file = spec_dir / "spec.md"
+        spec_file.write_text(content)
+        return spec_file
+
+    def test_score_all_rescores_only_changed_specs(self, temp_dir, monkeypatch):
+        """Test that score_all recomputes just the edited specification"""
+        (temp_dir / ".specmap").mkdir()
+        self._write_spec(temp_dir, "001-login", SPEC_CONTENT)
+        spec_file = self._write_spec(temp_dir, "002-search", SPEC_CONTENT)
+
+        first = ClarificationProcessor(temp_dir).score_all()
+        assert sorted(first) == ["001-login", "002-search"]
+        assert (temp_dir / ".specmap" / "cache" / "scores" / "001-login.json").exists()
+        assert 'L - LOGIC & STRUCTURE' in first["001-login"]['section_scores']
+
+        spec_file.write_text(SPEC_CONTENT + "\n[NEEDS CLARIFICATION: search scope]\n")
+
+        processor = ClarificationProcessor(temp_dir)
+        scored = []
+        original = processor._score_specification
+        monkeypatch.setattr(processor, "_score_specification",
+                            lambda content: scored.append(content) or original(content))
+
+        second = processor.score_all()
+        assert len(scored) == 1
+        assert second["001-login"] == first["001-login"]
+        assert second["002-search"]['clarification_markers'] == 1
+
+    def test_single_feature_eligibility(self, temp_dir, monkeypatch):
+        """Test that checking one feature scores only that feature"""
+        (temp_dir / ".specmap").mkdir()
+        for n in range(1, 6):
+            self._write_spec(temp_dir, f"00{n}-feature", SPEC_CONTENT)
+        self._write_spec(temp_dir, "006-approved", APPROVED_SPEC)
+        self._write_spec(temp_dir, "unnumbered", APPROVED_SPEC)
+
+        generator = PlanGenerator(temp_dir)
+        scored = []
+        original = generator.clarify_processor.calculate_rulemap_score
+        monkeypatch.setattr(generator.clarify_processor, "calculate_rulemap_score",
+                            lambda feature_id: scored.append(feature_id) or original(feature_id))
+
+        assert generator.is_feature_approved("006-approved")
+        assert not generator.is_feature_approved("003-feature")
+        assert not generator.is_feature_approved("404-missing")
+        assert not generator.is_feature_approved("unnumbered")
+        assert scored == ["006-approved", "003-feature"]
+
+        # Unchanged specs are answered from the in-memory view
+        assert generator.is_feature_approved("006-approved")
+        assert len(scored) == 2
+
+    def test_approved_view_follows_edits(self, temp_dir):
+        """Test that the approved-features view picks up edited specifications"""
+        (temp_dir / ".specmap").mkdir()
+        self._write_spec(temp_dir, "001-login", APPROVED_SPEC)
+        spec_file = self._write_spec(temp_dir, "002-search", SPEC_CONTENT)
+
+        processor = ClarificationProcessor(temp_dir)
+        assert processor.approved_features() == ["001-login"]
+
+        spec_file.write_text(APPROVED_SPEC + "\n")
+        assert processor.approved_features() == ["001-login", "002-search"]
@@ -0,0 +1,90 @@
+"""
+Tests for open-question scanning in ClarificationProcessor
+"""
+
+import pytest
+from pathlib import Path
+import tempfile
+import shutil
+
+from specmap.clarify import ClarificationProcessor
+
+
+SPEC_CONTENT = """# Feature Specification: Login
+
+Café owners sign in with email.
+- **Retention**: [NEEDS CLARIFICATION: how long are sessions kept?]
+- [ ] **001-Q-001**: Which identity provider?
+- [ ] Confirm the question with legal
+Should lockout apply to admins?
+- [x] Done item?
+"""
+
+
+@pytest.fixture
+def project():
+    """Create a project with one feature specification"""
+    temp_dir = Path(tempfile.mkdtemp())
+    feature_path = temp_dir / "01-specifications" / "features" / "001-login"
+    feature_path.mkdir(parents=True)
+    (feature_path / "spec.md").write_text(SPEC_CONTENT)
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+class TestQuestionScanner:
+    """Test question extraction"""
+
+    def test_marker_types_lines_and_offsets(self, project):
+        """Test that each marker type is found with its line and byte offset"""
+        questions = ClarificationProcessor(project).find_open_questions("001-login")
+
+        assert [(q['type'], q['line']) for q in questions] == [
+            ('clarification_needed', 4),
+            ('outstanding_question', 5),
+            ('question_line', 5),
+            ('unchecked_item', 6),
+            ('question_line', 7),
+            ('question_line', 8),
+        ]
+        assert questions[0]['question'] == "how long are sessions kept?"
+        assert questions[1]['id'] == "001-Q-001"
+
+        encoded = SPEC_CONTENT.encode('utf-8')
+        for question in questions:
+            assert encoded[question['offset']:].startswith(question['context'].encode('utf-8'))
+
+    def test_results_are_cached_until_the_file_changes(self, project):
+        """Test that rescans happen only after an edit"""
+        processor = ClarificationProcessor(project)
+        first = processor.find_open_questions("001-login")
+        first[0]['answer'] = "30 days"
+
+        assert processor.find_open_questions("001-login")[0].get('answer') is None
+
+        spec_file = project / "01-specifications" / "features" / "001-login" / "spec.md"
+        spec_file.write_text("# Spec\nNothing open.\n")
+        assert processor.find_open_questions("001-login") == []
+
+    def test_streaming_scan(self):
+        """Test iter_questions on a buffer without a trailing newline"""
+        processor = ClarificationProcessor(Path(tempfile.gettempdir()))
+        questions = list(processor.iter_questions("intro\nIs this the end?", "inline.md"))
+
+        assert len(questions) == 1
+        assert questions[0]['line'] == 2
+        assert questions[0]['offset'] == 6
+
+    def test_sparse_and_dense_scans_agree(self, monkeypatch):
+        """Test that seeking between sparse markers finds what the line split finds"""
+        processor = ClarificationProcessor(Path(tempfile.gettempdir()))
+        content = "filler line é\n" * 200 + SPEC_CONTENT + "filler\n" * 200 + "Last one?"
+
+        sparse = list(processor.iter_questions(content, "spec.md"))
+        monkeypatch.setattr('specmap.clarify.SPARSE_MARKER_LINES', 10 ** 9)
+        assert list(processor.iter_questions(content, "spec.md")) == sparse
+
+        assert [q['line'] for q in sparse] == [204, 205, 205, 206, 207, 208, 409]
+        encoded = content.encode('utf-8')
+        for question in sparse:
+            assert encoded[question['offset']:].startswith(question['context'].encode('utf-8'))
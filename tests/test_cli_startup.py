@@ -0,0 +1,64 @@
+"""
+Import-time budget for the specmap CLI entry point
+"""
+
+import compileall
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('click')
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Modules that only specific subcommands need
+DEFERRED_MODULES = [
+    'rich', 'yaml',
+    'specmap.init', 'specmap.agents', 'specmap.skills', 'specmap.structure',
+    'specmap.specify', 'specmap.clarify', 'specmap.plan', 'specmap.tasks',
+]
+
+# Microseconds specmap.cli may add on top of click itself
+IMPORT_BUDGET_US = 20_000
+
+
+@pytest.fixture(scope='module', autouse=True)
+def bytecode():
+    """Compile the package first so timings match an installed CLI, not the compiler"""
+    compileall.compile_dir(SRC_DIR / "specmap", quiet=1)
+
+
+def import_times(module: str) -> dict:
+    """Run `python -X importtime` and return {module: cumulative microseconds}"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=SRC_DIR, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestCliStartup:
+    """Test that importing the CLI stays cheap"""
+
+    def test_heavy_modules_are_deferred(self):
+        """Test that --help/--version/completion do not pull in subcommand dependencies"""
+        times = import_times('specmap.cli')
+        loaded = [name for name in DEFERRED_MODULES if name in times]
+        assert loaded == []
+
+    def test_import_budget(self):
+        """Test the import-time cost of specmap.cli beyond click"""
+        # Best of three to ride out scheduler noise
+        costs = []
+        for _ in range(3):
+            times = import_times('specmap.cli')
+            costs.append(times['specmap.cli'] - times.get('click', 0))
+        assert min(costs) < IMPORT_BUDGET_US
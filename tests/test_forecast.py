@@ -0,0 +1,107 @@
+"""
+Tests for three-point estimates and Monte Carlo forecasting
+"""
+
+import pytest
+
+from specmap.forecast import completion_samples, forecast
+from specmap.taskgraph import TaskGraph
+from specmap.tasks import TaskGenerator
+
+
+@pytest.fixture
+def np():
+    """numpy, which forecasting needs"""
+    return pytest.importorskip('numpy')
+
+
+def diamond():
+    """A -> (B, C) -> D"""
+    tasks = [
+        {'id': 'A'},
+        {'id': 'B', 'depends_on': ['A']},
+        {'id': 'C', 'depends_on': ['A']},
+        {'id': 'D', 'depends_on': ['B', 'C']},
+    ]
+    return TaskGraph(tasks, [1, 5, 2, 1])
+
+
+class TestThreePointEstimates:
+    """Test how TaskGenerator derives three-point estimates"""
+
+    def test_spread_by_type(self, tmp_path):
+        """Test that point estimates get a right-skewed spread by task type"""
+        generator = TaskGenerator(tmp_path)
+
+        estimate = generator._three_point_estimate({'type': 'Integration Test', 'estimated': '4 hours'})
+        assert estimate == {'optimistic': 3.0, 'likely': 4.0, 'pessimistic': 10.0}
+
+        estimate = generator._three_point_estimate({'type': 'Model Implementation', 'estimated': '1 day'})
+        assert estimate == {'optimistic': 6.0, 'likely': 8.0, 'pessimistic': 16.0}
+
+    def test_ranges(self, tmp_path):
+        """Test that written ranges are used as they are"""
+        generator = TaskGenerator(tmp_path)
+
+        estimate = generator._three_point_estimate({'type': 'Setup', 'estimated': '2-5 hours'})
+        assert estimate == {'optimistic': 2.0, 'likely': 3.5, 'pessimistic': 5.0}
+
+    def test_point_estimate_of_range(self, tmp_path):
+        """Test that a range's point estimate stays its upper bound"""
+        generator = TaskGenerator(tmp_path)
+
+        assert generator._parse_time_estimate('2-5 hours') == 5.0
+        assert generator._parse_time_estimate('1 to 2 days') == 16.0
+
+
+class TestForecast:
+    """Test the vectorized Monte Carlo engine"""
+
+    def test_fixed_estimates_give_critical_path(self, np):
+        """Test that zero-width estimates reproduce the deterministic makespan"""
+        durations = [1, 5, 2, 1]
+        result = forecast([(diamond(), durations, durations, durations)], samples=500)
+
+        assert result['percentiles'] == {'p50': 7.0, 'p80': 7.0, 'p95': 7.0}
+        assert result['std'] == 0
+
+    def test_matches_direct_sampling(self, np):
+        """Test percentiles against a direct simulation of the same diamond"""
+        low, likely, high = [1, 4, 1, 1], [1, 5, 2, 1], [1, 8, 6, 1]
+        for distribution in ("pert", "triangular"):
+            result = forecast([(diamond(), low, likely, high)], samples=100_000,
+                              distribution=distribution, seed=1)
+
+            rng = np.random.default_rng(2)
+            if distribution == "pert":
+                b = 4 + 4 * rng.beta(1 + 4 * 1 / 4, 1 + 4 * 3 / 4, 100_000)
+                c = 1 + 5 * rng.beta(1 + 4 * 1 / 5, 1 + 4 * 4 / 5, 100_000)
+            else:
+                b = rng.triangular(4, 5, 8, 100_000)
+                c = rng.triangular(1, 2, 6, 100_000)
+            expected = np.percentile(2 + np.maximum(b, c), [50, 80, 95])
+
+            assert list(result['percentiles'].values()) == pytest.approx(expected, rel=0.01)
+
+    def test_graphs_run_side_by_side(self, np):
+        """Test that a forecast of several graphs is the last to finish, batched or not"""
+        long_chain = TaskGraph([{'id': 'X'}, {'id': 'Y', 'depends_on': ['X']}], [3, 3])
+        graphs = [(diamond(), [1, 4, 1, 1], [1, 5, 2, 1], [1, 8, 6, 1]),
+                  (long_chain, [3, 3], [3, 3], [3, 3])]
+
+        result = forecast(graphs, samples=2000, seed=0)
+        assert result['min'] >= 6.0
+        assert result['percentiles']['p95'] <= 11.0
+
+        samples = completion_samples(diamond(), [1, 4, 1, 1], [1, 5, 2, 1], [1, 8, 6, 1],
+                                     samples=1000, rng=np.random.default_rng(0))
+        assert samples.shape == (1000,)
+        assert samples.min() >= 6.0
+
+    def test_invalid_estimates(self, np):
+        """Test that estimates out of order and unknown distributions are rejected"""
+        with pytest.raises(ValueError):
+            forecast([(diamond(), [2, 5, 2, 1], [1, 5, 2, 1], [1, 8, 6, 1])], samples=10)
+        with pytest.raises(ValueError):
+            forecast([(diamond(), [1, 5, 2, 1], [1, 5, 2, 1], [1, 5, 2, 1])], samples=10,
+                     distribution="normal")
@@ -0,0 +1,107 @@
+"""
+Tests for the SQLite feature index
+"""
+
+import os
+import pytest
+from pathlib import Path
+import tempfile
+import shutil
+import time
+
+from specmap.index import FeatureIndex
+
+
+@pytest.fixture
+def project():
+    """Create a minimal project with two features"""
+    temp_dir = Path(tempfile.mkdtemp())
+    (temp_dir / ".specmap").mkdir()
+    for feature_id in ["001-login", "002-search"]:
+        spec_dir = temp_dir / "01-specifications" / "features" / feature_id
+        spec_dir.mkdir(parents=True)
+        (spec_dir / "spec.md").write_text("# Spec")
+        (temp_dir / "02-planning" / "features" / feature_id).mkdir(parents=True)
+    (temp_dir / "02-planning" / "features" / "001-login" / "plan.md").write_text("# Plan")
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+def age_folders(project):
+    """Backdate every folder so its mtime is outside the racy window"""
+    past = time.time() - 60
+    for path in [project / "01-specifications" / "features", project / "02-planning" / "features"]:
+        for folder in [path] + [item for item in path.iterdir() if item.is_dir()]:
+            os.utime(folder, (past, past))
+
+
+class TestFeatureIndex:
+    """Test FeatureIndex class"""
+
+    def test_listings(self, project):
+        """Test listing queries against a freshly built index"""
+        index = FeatureIndex(project)
+
+        assert index.existing_features() == ["001-login", "002-search"]
+        assert index.features_with_specs() == ["001-login", "002-search"]
+        assert index.features_with_plans() == ["001-login"]
+        assert (project / ".specmap" / "index.sqlite").exists()
+
+        status = {row['feature_id']: row for row in index.feature_status()}
+        assert status["001-login"]['has_plan'] is True
+        assert status["002-search"]['has_tasks'] is False
+
+    def test_new_feature_folder_triggers_reconcile(self, project):
+        """Test that adding a feature folder is picked up lazily"""
+        index = FeatureIndex(project)
+        index.existing_features()
+
+        new_dir = project / "01-specifications" / "features" / "003-export"
+        new_dir.mkdir()
+        (new_dir / "spec.md").write_text("# Spec")
+
+        assert FeatureIndex(project).features_with_specs()[-1] == "003-export"
+
+    def test_documents_added_inside_feature_folder(self, project):
+        """Test that a new plan.md in an existing folder refreshes just that feature"""
+        age_folders(project)
+        index = FeatureIndex(project)
+        assert index.features_with_plans() == ["001-login"]
+        assert index.reconcile() is False
+
+        plan_dir = project / "02-planning" / "features" / "002-search"
+        (plan_dir / "plan.md").write_text("# Plan")
+        assert index.features_with_plans() == ["001-login", "002-search"]
+
+        (plan_dir / "plan.md").unlink()
+        assert index.features_with_plans() == ["001-login"]
+
+    def test_update_feature_records_new_documents(self, project):
+        """Test that writers refresh a single feature without a rescan"""
+        index = FeatureIndex(project)
+        index.reconcile()
+
+        (project / "02-planning" / "features" / "002-search" / "plan.md").write_text("# Plan")
+        row = index.update_feature("002-search")
+        assert row['has_plan'] is True
+        assert 'plan_mtime' not in row
+        assert index.features_with_plans() == ["001-login", "002-search"]
+
+    def test_connection_is_kept(self, project):
+        """Test that queries share one connection until close()"""
+        index = FeatureIndex(project)
+        index.existing_features()
+        conn = index._conn
+        index.features_with_specs()
+        assert index._conn is conn
+
+        index.close()
+        assert index._conn is None
+        assert index.features_with_specs() == ["001-login", "002-search"]
+
+    def test_outside_project_falls_back_to_scan(self, project):
+        """Test that listing a folder without .specmap does not create one"""
+        shutil.rmtree(project / ".specmap")
+
+        assert FeatureIndex(project).features_with_plans() == ["001-login"]
+        assert not (project / ".specmap").exists()
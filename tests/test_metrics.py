@@ -0,0 +1,96 @@
+"""
+Tests for opt-in tool call instrumentation
+"""
+
+import pytest
+from pathlib import Path
+import tempfile
+import shutil
+
+from specmap import metrics
+from specmap.cache import FileCache
+from specmap.sections import SectionTree
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory"""
+    temp_dir = tempfile.mkdtemp()
+    yield Path(temp_dir)
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture(autouse=True)
+def recording():
+    """Record metrics during a test and leave them disabled and empty afterwards"""
+    metrics.reset()
+    metrics.configure(enabled=True, dump=())
+    yield
+    metrics.configure(enabled=False, dump=())
+    metrics.reset()
+
+
+class TestMetrics:
+    """Test metrics recording, summaries and dumps"""
+
+    def test_disabled_records_nothing(self, temp_dir):
+        """Test that nothing is counted while metrics are off"""
+        metrics.configure(enabled=False)
+        with metrics.tool_call("specmap_status") as call:
+            SectionTree("# Title\n")
+            (temp_dir / "spec.md").write_text("# Spec\n")
+
+        assert call is None
+        assert metrics.snapshot() == {'tools': {}, 'extractors': {}, 'caches': {}}
+
+    def test_call_records_io_extractors_and_caches(self, temp_dir):
+        """Test that a call counts its file I/O, extractor time and cache lookups"""
+        source = temp_dir / "spec.md"
+        source.write_text("# Spec\n\n## Section\n" * 100)
+        cache = FileCache(temp_dir / "analysis", "1")
+
+        with metrics.tool_call("specmap_plan") as call:
+            content = source.read_text()
+            SectionTree(content)
+            assert cache.get("spec", source) is None
+            cache.put("spec", source, content, {'sections': 2})
+            assert cache.get("spec", source) == {'sections': 2}
+
+        assert call.reads >= 3
+        assert call.bytes_read >= len(content)
+        assert call.writes >= 1
+        assert call.extractors['SectionTree._parse'][0] == 1
+        assert call.caches['analysis'] == [1, 1]
+
+        summary = metrics.snapshot()
+        assert summary['tools']['specmap_plan']['calls'] == 1
+        assert summary['caches']['analysis']['hit_rate'] == 0.5
+
+    def test_errors_are_counted(self):
+        """Test that a call that raises is recorded as an error"""
+        with pytest.raises(RuntimeError):
+            with metrics.tool_call("session_end"):
+                raise RuntimeError("boom")
+
+        assert metrics.snapshot()['tools']['session_end']['errors'] == 1
+
+    def test_dumps_round_trip(self, temp_dir):
+        """Test that JSONL dumps summarize like the live totals and Prometheus text is written"""
+        (temp_dir / ".specmap").mkdir()
+        for _ in range(3):
+            with metrics.tool_call("specmap_status") as call:
+                metrics.record_cache("documents", True)
+            metrics.write_dumps(temp_dir, call, ("jsonl", "prometheus"))
+
+        records = metrics.load_calls(temp_dir)
+        assert len(records) == 3
+        assert metrics.summarize(records)['tools'] == metrics.snapshot()['tools']
+
+        prom = (temp_dir / ".specmap" / "metrics" / "metrics.prom").read_text()
+        assert 'specmap_tool_calls_total{tool="specmap_status"} 3' in prom
+        assert 'specmap_cache_hits_total{cache="documents"} 3' in prom
+
+    def test_unknown_dump_format(self):
+        """Test that dump formats are validated"""
+        with pytest.raises(ValueError):
+            metrics.configure(dump=["csv"])
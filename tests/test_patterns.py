@@ -0,0 +1,38 @@
+"""
+Tests for the shared precompiled extractor patterns
+"""
+
+from specmap.patterns import (
+    SPEC_PERFORMANCE_VALUE_PATTERNS, UPDATE_LOG_PATTERN, summary_section_pattern
+)
+from specmap.plan import PlanGenerator
+from specmap.tasks import TaskGenerator
+
+
+class TestPatterns:
+    """Test specmap.patterns"""
+
+    def test_performance_patterns_keep_priority_order(self, tmp_path):
+        """Test that a latency bound wins over a percentage earlier in the line"""
+        line = "- Uptime 99.9% with responses <200ms"
+        assert SPEC_PERFORMANCE_VALUE_PATTERNS[1].search(line).start() < line.index('<')
+
+        assert PlanGenerator(tmp_path)._extract_performance_value(line) == "200ms"
+        assert TaskGenerator(tmp_path)._extract_performance_value("- Load: 10k users") == "10k users"
+        assert TaskGenerator(tmp_path)._parse_time_estimate("2.5 days") == 20.0
+
+    def test_summary_section_pattern(self):
+        """Test that section names are matched literally and patterns are reused"""
+        content = "### Cost (USD)\n- [x] a\n### Cost USD\n- [x] b\n- [x] c\n"
+        section = summary_section_pattern("Cost (USD)").search(content).group(0)
+        assert section == "### Cost (USD)\n- [x] a\n"
+        assert summary_section_pattern("Cost (USD)") is summary_section_pattern("Cost (USD)")
+
+    def test_update_log_may_be_the_last_section(self):
+        """Test that the Update Log section is found at the end of TRACKING.md"""
+        content = "# Tracking\n\n## Update Log\n\n### 2025-10-25\n- Done\n"
+        match = UPDATE_LOG_PATTERN.search(content)
+        assert match.group(1) == "## Update Log\n\n### 2025-10-25\n- Done\n"
+
+        content += "\n## Archive\n"
+        assert UPDATE_LOG_PATTERN.search(content).group(2) == "\n## "
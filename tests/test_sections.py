@@ -0,0 +1,77 @@
+"""
+Tests for the markdown section tree shared by spec and plan extractors
+"""
+
+from specmap.sections import SectionTree
+
+
+DOCUMENT = """# Feature Specification: Login
+
+## L - LOGIC & STRUCTURE
+
+### Functional Requirements
+- **FR-001**: System MUST allow users to log in
+
+### Dependencies & Risks
+- Identity provider
+
+## M - MEASUREMENT
+Strategic alignment: growth
+"""
+
+
+class TestSectionTree:
+    """Test SectionTree class"""
+
+    def test_heading_paths_and_spans(self):
+        """Test that headings nest by level with correct line spans"""
+        tree = SectionTree(DOCUMENT)
+        outline = tree.outline()
+
+        logic = ('Feature Specification: Login', 'L - LOGIC & STRUCTURE')
+        assert outline[logic] == (2, 10)
+        assert outline[logic + ('Functional Requirements',)] == (4, 7)
+        assert outline[('Feature Specification: Login', 'M - MEASUREMENT')] == (10, 13)
+
+    def test_find_and_body(self):
+        """Test that body stops at the next heading of any level"""
+        tree = SectionTree(DOCUMENT)
+
+        sections = tree.find('dependencies')
+        assert len(sections) == 1
+        assert [line for line in tree.body(sections[0]) if line] == ['- Identity provider']
+
+        logic = tree.find('logic')[0]
+        assert tree.body(logic) == ['']
+        assert '- **FR-001**: System MUST allow users to log in' in tree.subtree(logic)
+
+    def test_line_at_offset(self):
+        """Test mapping character offsets back to lines"""
+        tree = SectionTree(DOCUMENT)
+        offset = DOCUMENT.index('- Identity provider')
+
+        assert tree.line_at(offset) == 8
+        assert tree.is_heading(tree.line_at(DOCUMENT.index('### Dependencies')))
+
+    def test_blocks(self):
+        """Test that blocks open at start lines, stay open across them and close at headings"""
+        tree = SectionTree("intro\nPerformance: a\n1\nperformance: b\n2\n## Performance: c\n3\n# End\n4\n")
+
+        assert list(tree.blocks('performance', lambda line: ':' in line)) == [2, 4, 6]
+        assert tree.lower_lines[1] == "performance: a"
+
+
+class TestPerformanceExtraction:
+    """Test where PlanGenerator looks for performance requirements"""
+
+    def test_technical_performance_line_starts_section(self, tmp_path):
+        """Test that a plain 'Technical performance' line opens a section like a heading does"""
+        from specmap.plan import PlanGenerator
+
+        content = ("# Spec\n\nTechnical performance targets:\n- Response time: <200ms\n\n"
+                   "## Other\n- Throughput: 1000 req/s\n\n## Performance\n- Uptime: 99.9%\n")
+        performance = PlanGenerator(tmp_path)._extract_performance_requirements(SectionTree(content))
+
+        assert performance['response_time'] == '200ms'
+        assert performance['throughput'] == ''
+        assert performance['reliability'] == '99.9%'
@@ -0,0 +1,222 @@
+"""
+Tests for SessionManager and its SQLite session store
+"""
+
+import pytest
+from pathlib import Path
+import tempfile
+import shutil
+import yaml
+
+from specmap.sessions import SessionManager
+
+
+@pytest.fixture
+def project():
+    """Create an empty project folder"""
+    temp_dir = Path(tempfile.mkdtemp())
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+class TestSessionStore:
+    """Test session metadata kept in sessions.sqlite"""
+
+    def test_track_artifact_skips_duplicates(self, project):
+        """Test that artifacts are tracked once per action and counted in metrics"""
+        manager = SessionManager(project)
+        session_id = manager.start_session("store test")['session_id']
+
+        assert manager.track_artifact(session_id, "src/a.py")
+        assert manager.track_artifact(session_id, "src/a.py")
+        assert manager.track_artifact(session_id, "src/b.py")
+        assert manager.track_artifact(session_id, "src/a.py", "modified")
+        assert not manager.track_artifact("missing-session", "src/a.py")
+
+        meta = manager.get_session_metadata(session_id)
+        assert meta['artifacts'] == {'created': ["src/a.py", "src/b.py"], 'modified': ["src/a.py"]}
+        assert meta['metrics']['files_created'] == 2
+        assert meta['metrics']['files_modified'] == 1
+        assert (project / "04-agents" / "sessions" / "sessions.sqlite").exists()
+
+    def test_track_artifact_rejects_unknown_action(self, project):
+        """Test that an unknown action is reported as not tracked, like the batch API does"""
+        manager = SessionManager(project)
+        session_id = manager.start_session("action test")['session_id']
+
+        assert not manager.track_artifact(session_id, "src/a.py", "deleted")
+        assert manager.track_artifacts(session_id, [("src/a.py", "deleted")])[0]['status'] == 'invalid_action'
+
+        meta = manager.get_session_metadata(session_id)
+        assert meta['artifacts'] == {'created': [], 'modified': []}
+
+    def test_track_artifacts_batch(self, project):
+        """Test that a batch reports one status per item"""
+        manager = SessionManager(project)
+        session_id = manager.start_session("batch test")['session_id']
+        manager.track_artifact(session_id, "src/a.py")
+
+        results = manager.track_artifacts(session_id, [
+            ("src/a.py", "created"),
+            ("src/b.py", "created"),
+            ("src/b.py", "created"),
+            ("src/b.py", "modified"),
+            ("src/c.py", "deleted"),
+        ])
+        assert [r['status'] for r in results] == [
+            'duplicate', 'tracked', 'duplicate', 'tracked', 'invalid_action'
+        ]
+        assert results[1] == {'file_path': "src/b.py", 'action': "created", 'status': 'tracked'}
+
+        meta = manager.get_session_metadata(session_id)
+        assert meta['artifacts'] == {'created': ["src/a.py", "src/b.py"], 'modified': ["src/b.py"]}
+
+        with pytest.raises(ValueError):
+            manager.track_artifacts("missing-session", [("src/a.py", "created")])
+
+    def test_yaml_export(self, project):
+        """Test that session.yaml is rewritten at checkpoints and at the end"""
+        manager = SessionManager(project)
+        session_id = manager.start_session("export test", metadata={'ticket': 7})['session_id']
+        meta_path = Path(manager.active_dir / session_id / "session.yaml")
+
+        manager.track_artifact(session_id, "notes.md")
+        assert yaml.safe_load(meta_path.read_text())['artifacts']['created'] == []
+
+        checkpoint = manager.create_checkpoint(session_id, "first")
+        exported = yaml.safe_load(meta_path.read_text())
+        assert exported['artifacts']['created'] == ["notes.md"]
+        assert exported['checkpoints'][0]['id'] == checkpoint['checkpoint_id']
+        assert exported['custom'] == {'ticket': 7}
+
+        result = manager.end_session(session_id, rulemap_score=8.5, create_backup=False)
+        assert result['files_created'] == 1
+        assert result['checkpoints'] == 1
+        archived = yaml.safe_load((Path(result['archive_path']) / "session.yaml").read_text())
+        assert archived['session']['status'] == 'completed'
+        assert archived['rulemap_score'] == 8.5
+        assert manager.get_session_metadata(session_id)['rulemap_score'] == 8.5
+        assert manager.list_active_sessions() == []
+
+    def test_imports_pre_store_sessions(self, project):
+        """Test that a session.yaml written before the store existed is picked up"""
+        session_path = project / "04-agents" / "sessions" / "active" / "2025-01-01-session-001"
+        session_path.mkdir(parents=True)
+        (session_path / "session.yaml").write_text(yaml.dump({
+            'session': {'id': "2025-01-01-session-001", 'date': "2025-01-01",
+                        'start_time': "09:00:00", 'end_time': None, 'focus': "legacy",
+                        'agent': "claude", 'status': 'active'},
+            'artifacts': {'created': ["old.md"], 'modified': []},
+            'checkpoints': [{'id': "checkpoint-001-09-30-00", 'time': "09:30:00",
+                             'description': "old", 'files_snapshot': []}],
+            'metrics': {'duration_minutes': 0, 'files_created': 1,
+                        'files_modified': 0, 'checkpoints': 1}
+        }))
+
+        manager = SessionManager(project)
+        manager.track_artifact("2025-01-01-session-001", "new.md")
+        assert [s['focus'] for s in manager.list_active_sessions()] == ["legacy"]
+
+        checkpoint = manager.create_checkpoint("2025-01-01-session-001", "second")
+        assert checkpoint['checkpoint_id'].startswith("checkpoint-002-")
+
+        meta = manager.get_session_metadata("2025-01-01-session-001")
+        assert set(meta['artifacts']['created']) == {"old.md", "new.md"}
+        assert meta['metrics']['checkpoints'] == 2
+
+
+class TestDailyBackup:
+    """Test incremental daily backups"""
+
+    def test_unchanged_files_are_linked(self, project, monkeypatch):
+        """Test that a second backup only copies changed files"""
+        (project / "00-governance").mkdir()
+        (project / "00-governance" / "constitution.md").write_text("rules")
+        (project / "01-specifications" / "features" / "001-login").mkdir(parents=True)
+        (project / "01-specifications" / "features" / "001-login" / "spec.md").write_text("spec")
+        (project / "TRACKING.md").write_text("tracking")
+        manager = SessionManager(project)
+
+        first = manager.create_daily_backup()
+        assert first['files_copied'] == 3
+        assert first['files_linked'] == 0
+
+        # Pretend the first backup was taken yesterday
+        backup_dir = Path(first['backup_path'])
+        yesterday = backup_dir.with_name("daily-backup-2000-01-01")
+        backup_dir.rename(yesterday)
+
+        (project / "TRACKING.md").write_text("tracking, updated")
+        second = manager.create_daily_backup()
+        assert second['files_copied'] == 1
+        assert second['files_linked'] == 2
+
+        linked = Path(second['backup_path']) / "00-governance" / "constitution.md"
+        assert linked.samefile(yesterday / "00-governance" / "constitution.md")
+        assert (Path(second['backup_path']) / "TRACKING.md").read_text() == "tracking, updated"
+
+        # A rerun on the same day replaces today's backup and links from it
+        third = manager.create_daily_backup()
+        assert third['files_copied'] == 0
+        assert third['backup_path'] == second['backup_path']
+        assert manager.verify_daily_backup()['verified']
+
+    def test_verify_reports_damage(self, project):
+        """Test that verify finds missing and altered files"""
+        (project / "00-governance").mkdir()
+        (project / "00-governance" / "charter.md").write_text("charter")
+        (project / "PROJECT-STATUS.md").write_text("status")
+        manager = SessionManager(project)
+        backup_path = Path(manager.create_daily_backup()['backup_path'])
+
+        (backup_path / "00-governance" / "charter.md").write_text("tampered")
+        (backup_path / "PROJECT-STATUS.md").unlink()
+
+        result = manager.verify_daily_backup()
+        assert not result['verified']
+        assert result['mismatched'] == ["00-governance/charter.md"]
+        assert result['missing'] == ["PROJECT-STATUS.md"]
+
+        with pytest.raises(ValueError):
+            manager.verify_daily_backup("1999-01-01")
+
+    def test_directory_links(self, project, tmp_path):
+        """Test that linked folders are backed up and cycles are listed as skipped"""
+        shared = tmp_path / "shared-docs"
+        shared.mkdir()
+        (shared / "glossary.md").write_text("terms")
+        (shared / "loop").symlink_to(shared)
+        (project / "00-governance").mkdir()
+        (project / "00-governance" / "shared").symlink_to(shared)
+        (project / "00-governance" / "gone.md").symlink_to(tmp_path / "missing.md")
+        manager = SessionManager(project)
+
+        result = manager.create_daily_backup()
+        backup_path = Path(result['backup_path'])
+        assert (backup_path / "00-governance" / "shared" / "glossary.md").read_text() == "terms"
+        assert result['skipped_links'] == ["00-governance/gone.md", "00-governance/shared/loop"]
+
+        verified = manager.verify_daily_backup()
+        assert verified['verified']
+        assert verified['skipped_links'] == result['skipped_links']
+
+    def test_progress_and_abort(self, project):
+        """Test that progress is reported per item and an abort leaves no backup behind"""
+        (project / "TRACKING.md").write_text("tracking")
+        manager = SessionManager(project)
+        calls = []
+
+        first = manager.create_daily_backup(
+            progress=lambda done, total, item: calls.append((done, item)))
+        assert calls[0] == (0, "00-governance")
+        assert calls[-1] == (7, "PROJECT-STATUS.md")
+
+        def abort(done, total, item):
+            if item == "TRACKING.md":
+                raise KeyboardInterrupt()
+
+        with pytest.raises(KeyboardInterrupt):
+            manager.create_daily_backup(progress=abort)
+        backup_dir = Path(first['backup_path'])
+        assert [path.name for path in backup_dir.parent.iterdir()] == [backup_dir.name]
+        assert manager.verify_daily_backup()['verified']
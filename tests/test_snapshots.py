@@ -0,0 +1,95 @@
+"""
+Tests for content-addressed checkpoint snapshots
+"""
+
+import os
+import pytest
+from pathlib import Path
+import tempfile
+import shutil
+
+from specmap.sessions import SessionManager
+from specmap.snapshots import SnapshotStore
+
+
+@pytest.fixture
+def workdir():
+    """Create a folder with two source files"""
+    temp_dir = Path(tempfile.mkdtemp())
+    (temp_dir / "src").mkdir()
+    (temp_dir / "src" / "a.md").write_text("alpha")
+    (temp_dir / "src" / "b.md").write_text("beta")
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+def source_files(workdir):
+    return [(f"src/{name}", workdir / "src" / name) for name in ("a.md", "b.md")]
+
+
+def blob_count(store):
+    return sum(1 for path in store.objects_dir.rglob("*") if path.is_file())
+
+
+class TestSnapshotStore:
+    """Test SnapshotStore class"""
+
+    def test_unchanged_files_are_not_read_or_copied(self, workdir, monkeypatch):
+        """Test that a repeat checkpoint only stats unchanged files"""
+        store = SnapshotStore(workdir / "snapshots")
+        first = store.create("checkpoint-001", source_files(workdir))
+        assert blob_count(store) == 2
+
+        stored = []
+        original = SnapshotStore._store_blob
+        monkeypatch.setattr(SnapshotStore, '_store_blob',
+                            lambda self, src: stored.append(src.name) or original(self, src))
+
+        second = store.create("checkpoint-002", source_files(workdir))
+        assert stored == []
+        assert second['files'] == first['files']
+
+        (workdir / "src" / "b.md").write_text("beta v2")
+        store.create("checkpoint-003", source_files(workdir))
+        assert stored == ["b.md"]
+        assert blob_count(store) == 3
+        assert store.checkpoint_ids() == ["checkpoint-001", "checkpoint-002", "checkpoint-003"]
+
+    def test_identical_content_is_stored_once(self, workdir):
+        """Test that files with the same content share one blob"""
+        (workdir / "src" / "b.md").write_text("alpha")
+        store = SnapshotStore(workdir / "snapshots")
+        manifest = store.create("checkpoint-001", source_files(workdir))
+
+        assert manifest['files'][0]['hash'] == manifest['files'][1]['hash']
+        assert blob_count(store) == 1
+
+    def test_restore(self, workdir):
+        """Test that a checkpoint restores the contents it recorded"""
+        store = SnapshotStore(workdir / "snapshots")
+        store.create("checkpoint-001", source_files(workdir))
+        (workdir / "src" / "a.md").write_text("changed")
+
+        restored = store.restore("checkpoint-001", workdir / "restored")
+        assert sorted(path.name for path in restored) == ["a.md", "b.md"]
+        assert (workdir / "restored" / "a.md").read_text() == "alpha"
+        assert os.access(workdir / "restored" / "a.md", os.W_OK)
+
+        with pytest.raises(FileNotFoundError):
+            store.restore("checkpoint-999", workdir / "restored")
+
+    def test_session_checkpoints_write_manifests(self, workdir):
+        """Test that SessionManager checkpoints are manifests, not copied folders"""
+        manager = SessionManager(workdir)
+        session_id = manager.start_session("snapshots")['session_id']
+        artifacts_dir = manager.active_dir / session_id / "artifacts"
+        (artifacts_dir / "notes.md").write_text("notes")
+
+        first = manager.create_checkpoint(session_id, "first")
+        second = manager.create_checkpoint(session_id, "second")
+
+        assert first['files_snapshotted'] == 1
+        assert second['checkpoint_path'].endswith(".json")
+        store = SnapshotStore(manager.active_dir / session_id / "snapshots")
+        assert store.load(second['checkpoint_id'])['description'] == "second"
+        assert blob_count(store) == 1
@@ -0,0 +1,169 @@
+"""
+Tests for the task dependency graph
+"""
+
+import pytest
+
+from specmap.taskgraph import CycleError, TaskGraph
+from specmap.tasks import TaskGenerator
+
+
+def task(task_id, depends_on=(), blocks=()):
+    """Build a minimal task dict"""
+    return {'id': task_id, 'depends_on': list(depends_on), 'blocks': list(blocks)}
+
+
+class TestTaskGraph:
+    """Test levels, critical path and slack"""
+
+    def test_diamond_schedule(self):
+        """Test earliest/latest start and slack of a diamond with one long branch"""
+        tasks = [task('A'), task('B', ['A']), task('C', ['A']), task('D', ['B', 'C'])]
+        graph = TaskGraph(tasks, [1, 5, 2, 1])
+
+        assert graph.makespan == 7
+        assert graph.levels() == [['A'], ['B', 'C'], ['D']]
+        assert graph.parallel_groups() == [['B', 'C']]
+        assert graph.critical_path() == ['A', 'B', 'D']
+
+        schedule = graph.schedule()
+        assert schedule['C']['earliest_start'] == 1
+        assert schedule['C']['latest_start'] == 4
+        assert schedule['C']['slack'] == 3
+        assert not schedule['C']['critical']
+        assert all(schedule[task_id]['critical'] for task_id in ('A', 'B', 'D'))
+
+    def test_blocks_and_unknown_ids(self):
+        """Test that blocks adds edges and ids naming no task are ignored"""
+        tasks = [task('A', blocks=['B']), task('B', ['missing']), task('C')]
+        graph = TaskGraph(tasks, [2, 3, 4])
+
+        assert graph.levels() == [['A', 'C'], ['B']]
+        assert graph.makespan == 5
+        assert graph.critical_path() == ['A', 'B']
+
+    def test_cycle_is_reported(self):
+        """Test that a dependency cycle raises with the tasks on it"""
+        tasks = [task('A'), task('B', ['A', 'D']), task('C', ['B']), task('D', ['C'])]
+        with pytest.raises(CycleError) as error:
+            TaskGraph(tasks, [1, 1, 1, 1])
+
+        cycle = error.value.cycle
+        assert cycle[0] == cycle[-1]
+        assert sorted(cycle[:-1]) == ['B', 'C', 'D']
+        assert isinstance(error.value, ValueError)
+
+    def test_large_graph(self):
+        """Test a wide, deep graph of twenty thousand tasks"""
+        width, depth = 100, 200
+        tasks = []
+        for row in range(depth):
+            for column in range(width):
+                depends_on = [f"{row - 1}-{column}", f"{row - 1}-{(column + 1) % width}"] if row else []
+                tasks.append(task(f"{row}-{column}", depends_on))
+
+        graph = TaskGraph(tasks, [1.0] * len(tasks))
+
+        assert graph.makespan == depth
+        assert len(graph.levels()) == depth
+        assert len(graph.critical_path()) == depth
+
+
+class TestTaskBreakdown:
+    """Test that TaskGenerator schedules its breakdown on the graph"""
+
+    def test_duration_follows_critical_path(self, tmp_path):
+        """Test that the estimate is the critical path, not the sum of all tasks"""
+        generator = TaskGenerator(tmp_path)
+        tasks = [task('001-T-001')] + [task(f"001-T-{i:03d}", ['001-T-001']) for i in range(2, 32)]
+        for item in tasks:
+            item['estimated'] = '8 hours'
+
+        graph = generator.build_task_graph(tasks)
+        generator._annotate_schedule(tasks, graph)
+
+        assert generator._calculate_total_duration(graph) == 2
+        assert len(graph.parallel_groups()[0]) == 30
+        assert tasks[5]['level'] == 1
+        assert tasks[5]['slack'] == 0
+
+    def test_progress_and_abort(self, tmp_path):
+        """Test that progress is reported per phase and an abort writes no tasks.md"""
+        plan_dir = tmp_path / "02-planning" / "features" / "001-login"
+        plan_dir.mkdir(parents=True)
+        (plan_dir / "plan.md").write_text("# Implementation Plan\n")
+        generator = TaskGenerator(tmp_path)
+        calls = []
+
+        def abort(done, total, message):
+            calls.append(message)
+            if message == "Scheduling tasks":
+                raise KeyboardInterrupt()
+
+        with pytest.raises(KeyboardInterrupt):
+            generator.generate_tasks_for_feature("001-login", progress=abort)
+        assert calls[:3] == ["Analyzing implementation plan", "Generating setup tasks",
+                             "Generating tdd_red tasks"]
+        assert not (plan_dir / "tasks.md").exists()
+
+    def test_progress_never_decreases(self, tmp_path):
+        """Test that the breakdown reports one total and a done count that only grows"""
+        plan_dir = tmp_path / "02-planning" / "features" / "001-login"
+        plan_dir.mkdir(parents=True)
+        (plan_dir / "plan.md").write_text("# Implementation Plan\n")
+        calls = []
+
+        TaskGenerator(tmp_path).generate_tasks_for_feature(
+            "001-login", progress=lambda done, total, message: calls.append((done, total)))
+
+        totals = {total for _, total in calls}
+        assert len(totals) == 1
+        done = [d for d, _ in calls]
+        assert done == sorted(done)
+        assert done[-1] < totals.pop()
+
+
+class TestSimulation:
+    """Test resource-constrained list scheduling"""
+
+    def test_workers_bound_makespan(self):
+        """Test that the makespan lies between the critical path and the total work"""
+        tasks = [task('A')] + [task(f"B{i}", ['A']) for i in range(6)] + [task('C', [f"B{i}" for i in range(6)])]
+        graph = TaskGraph(tasks, [1] + [2] * 6 + [1])
+
+        assert graph.simulate(1)['makespan'] == 14
+        assert graph.simulate(3)['makespan'] == 6
+        unlimited = graph.simulate(6)
+        assert unlimited['makespan'] == graph.makespan == 4
+        assert unlimited['utilization'] == pytest.approx(14 / 24)
+
+    def test_longest_path_first(self):
+        """Test that the default rule starts the long chain before short independent tasks"""
+        tasks = [task('short1'), task('short2'), task('long1'), task('long2', ['long1'])]
+        graph = TaskGraph(tasks, [1, 1, 2, 2])
+
+        best = graph.simulate(1, priority="longest_path")
+        assert best['timelines'][0][0]['id'] == 'long1'
+
+        two = graph.simulate(2)
+        assert two['makespan'] == 4
+        assert graph.simulate(2, priority="task_order")['makespan'] == 5
+
+    def test_timelines_respect_dependencies(self):
+        """Test that no task starts before its dependencies finish"""
+        tasks = [task('A'), task('B', ['A']), task('C', ['A']), task('D', ['B', 'C'])]
+        schedule = TaskGraph(tasks, [1, 5, 2, 1]).simulate(2)
+
+        finish = {item['id']: item['finish'] for timeline in schedule['timelines'] for item in timeline}
+        start = {item['id']: item['start'] for timeline in schedule['timelines'] for item in timeline}
+        assert start['B'] >= finish['A'] and start['C'] >= finish['A']
+        assert start['D'] >= max(finish['B'], finish['C'])
+        assert schedule['makespan'] == 7
+
+    def test_invalid_arguments(self):
+        """Test that worker counts and priority rules are validated"""
+        graph = TaskGraph([task('A')], [1])
+        with pytest.raises(ValueError):
+            graph.simulate(0)
+        with pytest.raises(ValueError):
+            graph.simulate(2, priority="random")
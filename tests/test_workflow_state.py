@@ -0,0 +1,245 @@
+"""
+Tests for the journaled WorkflowState
+"""
+
+import json
+import multiprocessing
+import pytest
+from pathlib import Path
+import tempfile
+import shutil
+
+from specmap.config import WorkflowConflict, WorkflowState
+
+
+@pytest.fixture
+def project():
+    """Create a project folder with a .specmap directory"""
+    temp_dir = Path(tempfile.mkdtemp())
+    (temp_dir / ".specmap").mkdir()
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+class TestWorkflowJournal:
+    """Test WorkflowState journal and compaction"""
+
+    def test_mutations_append_to_journal(self, project):
+        """Test that updates after the first snapshot only append deltas"""
+        workflow = WorkflowState(project)
+        workflow.load()
+        workflow.update_phase('specification')
+        snapshot = workflow.state_file.read_text()
+
+        workflow.add_feature('001-login', {'status': 'specification'})
+        workflow.add_feature('002-search', {'status': 'planning'})
+
+        assert workflow.state_file.read_text() == snapshot
+        assert len(workflow.journal_file.read_text().splitlines()) == 3  # header + 2 entries
+
+        reloaded = WorkflowState(project)
+        reloaded.load()
+        assert reloaded.state['features'] == workflow.state['features']
+        assert reloaded.state['current_phase'] == 'specification'
+        assert reloaded.revision == workflow.revision
+
+    def test_compaction(self, project, monkeypatch):
+        """Test that a long journal is folded into a new snapshot"""
+        monkeypatch.setattr(WorkflowState, 'JOURNAL_COMPACT_ENTRIES', 3)
+        workflow = WorkflowState(project)
+        workflow.load()
+        for i in range(10):
+            workflow.add_feature(f'{i:03d}-feature', {'status': 'specification'})
+
+        assert len(workflow.journal_file.read_text().splitlines()) <= 4
+        snapshot = json.loads(workflow.state_file.read_text())
+        assert '_revision' in snapshot
+
+        reloaded = WorkflowState(project)
+        reloaded.load()
+        assert len(reloaded.state['features']) == 10
+        assert '_revision' not in reloaded.state
+
+    def test_torn_and_stale_journals_are_ignored(self, project):
+        """Test recovery from an interrupted append and an interrupted compaction"""
+        workflow = WorkflowState(project)
+        workflow.load()
+        workflow.update_phase('planning')
+        workflow.add_feature('001-login', {'status': 'planning'})
+
+        with open(workflow.journal_file, 'a') as f:
+            f.write('{"rev": 99, "path": ["current_phase"], "val')
+
+        reloaded = WorkflowState(project)
+        reloaded.load()
+        assert reloaded.state['current_phase'] == 'planning'
+        assert '001-login' in reloaded.state['features']
+
+        # A journal written against an older snapshot must not be replayed
+        workflow.journal_file.write_text(
+            json.dumps({'base': 0}) + '\n' +
+            json.dumps({'rev': 1, 'path': ['current_phase'], 'value': 'stale', 'at': ''}) + '\n'
+        )
+        reloaded = WorkflowState(project)
+        reloaded.load()
+        assert reloaded.state['current_phase'] == 'planning'
+        assert '001-login' not in reloaded.state['features']
+
+
+def _add_features(project_path, worker, count):
+    # Compact often so writers also race against snapshot rewrites
+    WorkflowState.JOURNAL_COMPACT_ENTRIES = 16
+    workflow = WorkflowState(Path(project_path))
+    workflow.load()
+    for i in range(count):
+        workflow.add_feature(f'{worker}-{i:03d}', {'status': 'specification'})
+
+
+def _count_clarifications(project_path, count):
+    """Worker process: increment a shared counter with modify_feature"""
+    workflow = WorkflowState(Path(project_path))
+    workflow.load()
+
+    def increment(feature_data):
+        feature_data['clarifications_count'] = feature_data.get('clarifications_count', 0) + 1
+
+    for _ in range(count):
+        workflow.modify_feature('001-login', increment)
+
+
+class TestWorkflowConcurrency:
+    """Test WorkflowState shared between processes"""
+
+    def test_stale_instances_merge(self, project):
+        """Test that writers holding outdated state keep each other's updates"""
+        first = WorkflowState(project)
+        first.load()
+        second = WorkflowState(project)
+        second.load()
+
+        first.add_feature('001-login', {'status': 'specification'})
+        second.add_feature('002-search', {'status': 'planning'})
+        first.update_phase('planning')
+        second.save()
+
+        assert set(second.state['features']) == {'001-login', '002-search'}
+        assert second.state['current_phase'] == 'planning'
+
+        first.add_feature('003-export', {'status': 'specification'})
+        assert set(first.state['features']) == {'001-login', '002-search', '003-export'}
+        assert first.revision == second.revision + 1
+
+    def test_torn_journal_is_compacted_before_append(self, project):
+        """Test that a write never lands behind a torn line"""
+        workflow = WorkflowState(project)
+        workflow.load()
+        workflow.update_phase('planning')
+        with open(workflow.journal_file, 'a') as f:
+            f.write('{"rev": 99, "pa')
+
+        other = WorkflowState(project)
+        other.load()
+        other.add_feature('001-login', {'status': 'planning'})
+
+        reloaded = WorkflowState(project)
+        reloaded.load()
+        assert '001-login' in reloaded.state['features']
+
+    def test_concurrent_processes(self, project):
+        """Test that add_feature calls from several processes all persist"""
+        WorkflowState(project).save()
+
+        ctx = multiprocessing.get_context('spawn')
+        workers = [
+            ctx.Process(target=_add_features, args=(str(project), w, 40))
+            for w in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(60)
+            assert worker.exitcode == 0
+
+        reloaded = WorkflowState(project)
+        reloaded.load()
+        assert len(reloaded.state['features']) == 160
+        assert '_revision' not in reloaded.state
+
+    def test_different_fields_merge(self, project):
+        """Test that modify_feature calls changing different fields of one feature keep both"""
+        WorkflowState(project).add_feature('001-login', {'status': 'specification', 'notes': ''})
+        first = WorkflowState(project)
+        first.load()
+        second = WorkflowState(project)
+        second.load()
+
+        first.modify_feature('001-login', {'status': 'planning'})
+        second.modify_feature('001-login', {'notes': 'reviewed'})
+
+        reloaded = WorkflowState(project)
+        reloaded.load()
+        assert reloaded.get_feature('001-login') == {'status': 'planning', 'notes': 'reviewed'}
+
+    def test_add_feature_detects_lost_updates(self, project):
+        """Test that add_feature after get_feature refuses to overwrite another writer's change"""
+        WorkflowState(project).add_feature('001-login', {'status': 'specification', 'notes': ''})
+        first = WorkflowState(project)
+        first.load()
+        second = WorkflowState(project)
+        second.load()
+
+        feature = first.get_feature('001-login')
+        feature['status'] = 'planning'
+        assert second.get_feature('002-search') is None
+        second.modify_feature('001-login', {'notes': 'reviewed'})
+        first.add_feature('002-search', {'status': 'specification'})
+
+        with pytest.raises(WorkflowConflict) as conflict:
+            first.add_feature('001-login', feature)
+        assert conflict.value.keys == ['notes']
+        with pytest.raises(WorkflowConflict) as conflict:
+            second.add_feature('002-search', {'status': 'planning'})
+        assert conflict.value.keys == ['status']
+
+        feature = first.get_feature('001-login')
+        feature['status'] = 'planning'
+        assert first.add_feature('001-login', feature) == ['status']
+        assert first.get_feature('001-login') == {'status': 'planning', 'notes': 'reviewed'}
+
+    def test_add_feature_replaces_the_record(self, project):
+        """Test that re-adding a feature drops fields the new record does not have"""
+        WorkflowState(project).add_feature('001-login', {'status': 'planning', 'total_tasks': 12})
+
+        workflow = WorkflowState(project)
+        workflow.load()
+        assert workflow.add_feature('001-login', {'status': 'specification'}) == ['status', 'total_tasks']
+        assert workflow.get_feature('001-login') == {'status': 'specification'}
+
+    def test_get_feature_returns_a_copy(self, project):
+        """Test that editing a read feature changes nothing until add_feature"""
+        workflow = WorkflowState(project)
+        workflow.add_feature('001-login', {'status': 'specification', 'draft': True})
+
+        feature = workflow.get_feature('001-login')
+        feature['status'] = 'planning'
+        assert workflow.get_feature('001-login')['status'] == 'specification'
+
+        del feature['draft']
+        workflow.add_feature('001-login', feature)
+        assert workflow.get_feature('001-login') == {'status': 'planning'}
+
+    def test_modify_feature_across_processes(self, project):
+        """Test that concurrent read-modify-write updates are never lost"""
+        WorkflowState(project).save()
+
+        ctx = multiprocessing.get_context('spawn')
+        workers = [ctx.Process(target=_count_clarifications, args=(str(project), 25)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(60)
+            assert worker.exitcode == 0
+
+        reloaded = WorkflowState(project)
+        reloaded.load()
+        assert reloaded.get_feature('001-login') == {'clarifications_count': 100}